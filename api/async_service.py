@@ -0,0 +1,348 @@
+"""
+naver_service의 asyncio 버전.
+
+요청 생성과 응답 파싱은 naver_service의 헬퍼를 그대로 사용하고, 전송만
+비동기 클라이언트(http_client.open_async_client)로 처리합니다.
+gather_* 헬퍼는 스레드 수 제한 없이 수백 개의 요청을 동시에 진행시킵니다.
+
+동기 코드(Flask 라우트)에서 부르는 run_async는 프로세스마다 하나씩 띄운 이벤트 루프
+스레드에서 코루틴을 실행하고, 그 루프에 묶인 AsyncClient 하나를 계속 재사용하므로
+요청이 바뀌어도 keep-alive 커넥션이 유지됩니다.
+"""
+
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+
+from http_client import open_async_client, async_http_get, async_coalesced
+from credentials import get_open_api_pool, get_ad_api_pool
+from naver_service import (
+    MISSING_API_KEY_ERROR, AD_API_BASE_URL, AD_API_KEYWORDS_URI, AUTOCOMPLETE_URL,
+    build_search_api_url, build_search_api_request, build_ad_api_headers, build_keywordstool_params,
+    find_exact_volume, parse_related_ad_keywords, build_autocomplete_params, parse_autocomplete,
+    finalize_related_keywords, VOLUME_FIELDS, harvest_volume_rows, keywordstool_parallelism
+)
+from volume_planner import VolumePlan, clean_hint_keyword, mark_absent, is_complete_volume
+from doc_count_cache import lookup_doc_counts, store_doc_counts
+from serp import fetch_serp, get_cached_serp
+from keyword_cache import volume_cache, related_ad_cache, normalize_keyword
+
+# gather 헬퍼의 기본 동시 요청 수
+DEFAULT_CONCURRENCY = 100
+
+
+_loop = None
+_loop_lock = threading.Lock()
+_shared_client = None
+
+
+def _get_loop():
+    """
+    프로세스 공유 이벤트 루프를 (처음 호출 시) 데몬 스레드에서 띄우고 반환합니다.
+    """
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="async-service-loop", daemon=True).start()
+                _loop = loop
+    return _loop
+
+
+def _get_shared_client():
+    # 공유 루프 안에서만 호출됩니다. (httpx 클라이언트는 처음 사용한 루프에 묶임)
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = open_async_client()
+    return _shared_client
+
+
+@asynccontextmanager
+async def client_scope(client=None):
+    """
+    client가 주어지면 그대로 쓰고, 공유 루프에서 실행 중이면 공유 클라이언트를,
+    그 밖의 루프(asyncio.run 등)에서는 임시 클라이언트를 만들어 끝나면 닫습니다.
+    """
+    if client is not None:
+        yield client
+        return
+    if _loop is not None and asyncio.get_running_loop() is _loop:
+        yield _get_shared_client()
+        return
+    client = open_async_client()
+    try:
+        yield client
+    finally:
+        if client is not None:
+            await client.aclose()
+
+
+async def async_search_general(service_type, keyword, display=10, sort='sim', client=None, timeout=None):
+    pool = get_open_api_pool()
+    if not pool:
+        return dict(MISSING_API_KEY_ERROR)
+
+    kwargs = {}
+    if timeout is not None:
+        kwargs["timeout"] = timeout
+    try:
+        async with client_scope(client) as c:
+            async def send(cred, retry):
+                url, headers = build_search_api_request(service_type, keyword, display, sort, cred)
+                return await async_http_get(c, url, headers=headers, retry=retry, coalesce=False, **kwargs)
+
+            url = build_search_api_url(service_type, keyword, display, sort)
+            response = await async_coalesced("GET", url, None, lambda: pool.async_call(send))
+        if response.status_code == 200:
+            return response.json()
+        else:
+            return {"error": f"Error Code: {response.status_code}", "details": response.text}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+async def async_search_blog(keyword, display=10, sort='sim', client=None):
+    return await async_search_general('blog', keyword, display, sort, client=client, timeout=5)
+
+
+async def async_search_news(keyword, display=10, sort='sim', client=None):
+    return await async_search_general('news', keyword, display, sort, client=client)
+
+
+async def async_search_shop(keyword, display=10, sort='sim', client=None):
+    return await async_search_general('shop', keyword, display, sort, client=client)
+
+
+async def async_search_kin(keyword, display=10, sort='sim', client=None):
+    return await async_search_general('kin', keyword, display, sort, client=client)
+
+
+async def async_get_keyword_info(keyword, client=None):
+    """
+    get_keyword_info의 비동기 버전.
+    """
+    cached, _ = lookup_doc_counts([keyword])
+    if keyword in cached:
+        return {'total': cached[keyword]}
+
+    result = await async_search_blog(keyword, display=1, client=client)
+    if result and 'error' not in result:
+        total = result.get('total', 0)
+        store_doc_counts({keyword: total})
+        return {'total': total}
+
+    err_msg = result.get('error', 'Unknown') if result else 'Empty'
+    print(f"DEBUG: async_get_keyword_info failed for '{keyword}': {err_msg}")
+    return {'total': 0, 'error': err_msg}
+
+
+async def _async_keywordstool(hint_keywords, client):
+    pool = get_ad_api_pool()
+    if not pool:
+        return None
+
+    url = AD_API_BASE_URL + AD_API_KEYWORDS_URI
+    params = build_keywordstool_params(hint_keywords)
+
+    async def send(cred, retry):
+        return await async_http_get(client, url, params=params, headers=build_ad_api_headers(cred),
+                                    retry=retry, coalesce=False)
+
+    return await async_coalesced("GET", url, params, lambda: pool.async_call(send))
+
+
+async def async_get_search_volume(keyword, client=None):
+    """
+    get_search_volume의 비동기 버전.
+    """
+    cached = volume_cache.get(normalize_keyword(keyword))
+    if is_complete_volume(cached):
+        return {field: cached[field] for field in VOLUME_FIELDS}
+    if cached is not None and cached.get('absent'):
+        return {'pc': 0, 'mobile': 0, 'total': 0}
+    try:
+        async with client_scope(client) as c:
+            res = await _async_keywordstool(keyword.replace(" ", ""), c)
+        if res is None:
+            print("DEBUG: Missing AD API keys")
+            return None
+        if res.status_code == 200:
+            keyword_list = res.json().get('keywordList', [])
+            if normalize_keyword(keyword) not in {normalize_keyword(k) for k in harvest_volume_rows(keyword_list)}:
+                mark_absent([normalize_keyword(keyword)])
+            return find_exact_volume(keyword_list, keyword)
+        print(f"Ad API Error: {res.status_code} {res.text}")
+        return None
+    except Exception as e:
+        print(f"Search volume error: {e}")
+        return None
+
+
+async def async_get_search_volumes_for_keywords(keyword_list, client=None):
+    """
+    get_search_volumes_for_keywords의 비동기 버전. 계획된 호출을 속도 제한이 허용하는 만큼 동시에 보내고,
+    각 웨이브의 응답으로 채워진 키워드는 다음 웨이브에서 뺍니다.
+    """
+    plan = VolumePlan(keyword_list)
+    if not plan.pending or not get_ad_api_pool():
+        return plan.result
+
+    async def fetch_chunk(c, hint_str, keys):
+        try:
+            res = await _async_keywordstool(hint_str, c)
+            if res.status_code == 200:
+                plan.record(keys, harvest_volume_rows(res.json().get('keywordList', [])))
+                return
+            print(f"Batch Ad API Error: {res.status_code} {res.text}")
+        except Exception as e:
+            print(f"Bulk search volume error: {e}")
+        plan.record_failure(keys)
+
+    async with client_scope(client) as c:
+        while plan.pending:
+            await asyncio.gather(*(fetch_chunk(c, h, keys) for h, keys in plan.next_wave(keywordstool_parallelism())))
+    print(f"Volume plan: {plan.summary()}")
+    return plan.result
+
+
+async def async_get_related_keywords_from_ad_api(seed_keyword, client=None):
+    """
+    get_related_keywords_from_ad_api의 비동기 버전.
+    """
+    cache_key = normalize_keyword(seed_keyword)
+    cached = related_ad_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    try:
+        async with client_scope(client) as c:
+            res = await _async_keywordstool(clean_hint_keyword(seed_keyword), c)
+        if res is None:
+            return []
+        if res.status_code == 200:
+            keyword_list = res.json().get('keywordList', [])
+            harvest_volume_rows(keyword_list)
+            results = parse_related_ad_keywords(keyword_list)
+            related_ad_cache.put(cache_key, results)
+            return results
+        print(f"Ad API Error: {res.status_code}")
+        return []
+    except Exception as e:
+        print(f"Discovery error: {e}")
+        return []
+
+
+async def async_fetch_serp(keyword, device='pc', client=None):
+    """
+    serp.fetch_serp의 비동기 버전.
+    SERP는 스트리밍으로 필요한 만큼만 받고 호스트당 초당 5회로 제한되므로, 동기 경로
+    (캐시/병합/조기 종료 포함)를 스레드에서 실행합니다. client는 호환을 위해 받기만 합니다.
+    """
+    cached = get_cached_serp(keyword, device)
+    if cached is not None:
+        return cached
+    return await asyncio.to_thread(fetch_serp, keyword, device)
+
+
+async def async_get_blog_rank(keyword, client=None):
+    """
+    get_blog_rank의 비동기 버전.
+    """
+    try:
+        return (await async_fetch_serp(keyword, 'pc', client)).blog_ranks
+    except Exception as e:
+        print(f"Blog rank error: {e}")
+        return []
+
+
+async def async_get_naver_section_order(keyword, client=None):
+    """
+    get_naver_section_order의 비동기 버전. PC/모바일 페이지를 동시에 가져옵니다.
+    """
+    async def device_sections(c, device):
+        try:
+            return (await async_fetch_serp(keyword, device, c)).sections
+        except Exception as e:
+            print(f"{device} parsing error: {e}")
+            return ["오류 발생"]
+
+    async with client_scope(client) as c:
+        pc, mobile = await asyncio.gather(device_sections(c, 'pc'), device_sections(c, 'mobile'))
+    return {'pc': pc, 'mobile': mobile}
+
+
+async def async_get_related_keywords(keyword, client=None):
+    """
+    get_related_keywords의 비동기 버전. 자동완성과 PC/모바일 페이지를 동시에 가져옵니다.
+    """
+    async def autocomplete(c):
+        try:
+            res_ac = await async_http_get(c, AUTOCOMPLETE_URL, params=build_autocomplete_params(keyword), timeout=5)
+            if res_ac.status_code == 200:
+                return parse_autocomplete(res_ac.json())
+        except Exception as e:
+            print(f"Autocomplete Error: {e}")
+        return set()
+
+    async def serp(c, device):
+        try:
+            document = await async_fetch_serp(keyword, device, c)
+            if document.ok:
+                return set(document.related)
+        except Exception as e:
+            print(f"Search Page Error ({device}): {e}")
+        return set()
+
+    async with client_scope(client) as c:
+        parts = await asyncio.gather(autocomplete(c), serp(c, 'pc'), serp(c, 'mobile'))
+    keywords = set()
+    for part in parts:
+        keywords |= part
+    return finalize_related_keywords(keywords, keyword)
+
+
+async def gather_limited(func, items, concurrency=DEFAULT_CONCURRENCY, client=None):
+    """
+    items 각각에 대해 func(item, client=...)를 최대 concurrency개까지 동시에 실행하고
+    { item: 결과 } 딕셔너리를 반환합니다. 예외가 난 항목은 결과에서 제외됩니다.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(c, item):
+        async with semaphore:
+            try:
+                return item, await func(item, client=c)
+            except Exception as e:
+                print(f"gather error for {item}: {e}")
+                return item, None
+
+    async with client_scope(client) as c:
+        pairs = await asyncio.gather(*(run_one(c, item) for item in items))
+    return {item: result for item, result in pairs if result is not None}
+
+
+async def gather_keyword_infos(keywords, concurrency=DEFAULT_CONCURRENCY, client=None):
+    cached, misses = lookup_doc_counts(keywords)
+    infos = {kwd: {'total': total} for kwd, total in cached.items()}
+    if misses:
+        infos.update(await gather_limited(async_get_keyword_info, misses, concurrency, client))
+    return infos
+
+
+async def gather_search_volumes(keywords, concurrency=DEFAULT_CONCURRENCY, client=None):
+    return await gather_limited(async_get_search_volume, keywords, concurrency, client)
+
+
+async def gather_related_keywords_from_ad_api(seeds, concurrency=DEFAULT_CONCURRENCY, client=None):
+    return await gather_limited(async_get_related_keywords_from_ad_api, seeds, concurrency, client)
+
+
+async def gather_section_orders(keywords, concurrency=DEFAULT_CONCURRENCY, client=None):
+    return await gather_limited(async_get_naver_section_order, keywords, concurrency, client)
+
+
+def run_async(coro):
+    """
+    Flask 라우트 같은 동기 코드에서 코루틴을 공유 루프에 넘겨 실행하고 결과를 기다립니다.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
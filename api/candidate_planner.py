@@ -0,0 +1,126 @@
+"""
+황금 키워드 후보 선별 계획기.
+
+후보(실시간/트렌드 키워드 + 인기 시드의 연관 키워드)를 해시 순서로 100개 자르는 대신,
+1. 정규화한 형태(공백 제거 + 소문자)로 중복을 합치고,
+2. 이미 알고 있는 정보(시드 응답의 검색량, 볼륨 캐시, 문서수 캐시, 트렌드 여부)로
+   확실히 탈락할 후보는 빼고,
+3. 남은 후보를 '기대 가치 / 업스트림 호출 비용' 순으로 정렬해 호출 예산(GOLD_CALL_BUDGET)
+   안에서 가장 유망한 것부터 고릅니다.
+검색량과 문서수가 모두 캐시에 있는 후보는 호출 비용이 0이므로 예산과 관계없이 포함합니다.
+
+설정 (.env):
+    GOLD_CALL_BUDGET   후보 분석에 쓸 업스트림 호출 수 (기본 120)
+"""
+
+import os
+
+from keyword_cache import normalize_keyword
+from volume_planner import lookup_cached_volumes, HINT_KEYWORD_LIMIT
+from doc_count_cache import lookup_doc_counts
+
+GOLD_CALL_BUDGET = float(os.getenv("GOLD_CALL_BUDGET", "120"))
+# keywordstool은 한 번에 HINT_KEYWORD_LIMIT개를 묻고, 문서수는 키워드마다 1회
+VOLUME_CALL_COST = 1.0 / HINT_KEYWORD_LIMIT
+DOC_CALL_COST = 1.0
+# 검색량을 모르는 후보(트렌드 키워드 등)에 가정하는 검색량
+UNKNOWN_VOLUME_PRIOR = 1000
+# 실시간/트렌드 키워드는 문서가 아직 적을 가능성이 높아 가중치를 줍니다.
+TRENDING_BOOST = 2.0
+
+
+def merge_candidates(candidates):
+    """
+    candidates: { keyword: {'volume': int | None, 'trending': bool} }
+    정규화 키로 합칩니다. 표시 형태는 검색량을 아는(광고 API) 형태를 우선합니다.
+    Returns: { key: {'keyword', 'volume', 'trending'} }
+    """
+    merged = {}
+    for kwd, info in candidates.items():
+        key = normalize_keyword(kwd)
+        if not key:
+            continue
+        volume = info.get('volume')
+        entry = merged.get(key)
+        if entry is None:
+            merged[key] = {'keyword': kwd, 'volume': volume, 'trending': bool(info.get('trending'))}
+            continue
+        if volume is not None and (entry['volume'] is None or volume > entry['volume']):
+            if entry['volume'] is None:
+                entry['keyword'] = kwd
+            entry['volume'] = volume
+        entry['trending'] = entry['trending'] or bool(info.get('trending'))
+    return merged
+
+
+class CandidatePlan:
+    def __init__(self, candidates, budget=GOLD_CALL_BUDGET, min_volume=1000,
+                 min_score=0.1, max_docs=50000):
+        merged = merge_candidates(candidates)
+        keywords = [entry['keyword'] for entry in merged.values()]
+        vol_hits, vol_misses = lookup_cached_volumes(keywords)
+        vol_misses = set(vol_misses)
+        doc_hits, _ = lookup_doc_counts(keywords)
+
+        self.stats = {
+            'collected': len(candidates),
+            'unique': len(merged),
+            'known_absent': 0,
+            'low_volume': 0,
+            'known_filtered': 0,
+            'free': 0,
+            'selected': 0,
+            'over_budget': 0,
+            'budget': budget,
+            'planned_calls': 0.0
+        }
+
+        free, paid = [], []
+        for entry in merged.values():
+            kwd = entry['keyword']
+            cached = vol_hits.get(kwd.replace(" ", ""))
+            if cached is None and kwd not in vol_misses:
+                # keywordstool이 모른다고 기록된 키워드
+                self.stats['known_absent'] += 1
+                continue
+            volume = cached.get('total', 0) if cached else entry['volume']
+            if volume is not None and volume < min_volume:
+                self.stats['low_volume'] += 1
+                continue
+            docs = doc_hits.get(kwd)
+            if cached and docs is not None:
+                score = volume / (docs + 1)
+                if score < min_score or docs > max_docs:
+                    self.stats['known_filtered'] += 1
+                    continue
+                free.append((score, kwd))
+                continue
+            cost = (0 if cached else VOLUME_CALL_COST) + (0 if docs is not None else DOC_CALL_COST)
+            value = (volume if volume is not None else UNKNOWN_VOLUME_PRIOR)
+            if entry['trending']:
+                value *= TRENDING_BOOST
+            paid.append((value / cost, cost, kwd))
+
+        free.sort(reverse=True)
+        paid.sort(key=lambda item: item[0], reverse=True)
+        selected = []
+        spent = 0.0
+        for _, cost, kwd in paid:
+            if spent + cost > budget:
+                self.stats['over_budget'] += 1
+                continue
+            spent += cost
+            selected.append(kwd)
+
+        self.keywords = [kwd for _, kwd in free] + selected
+        self.trending = [entry['keyword'] for entry in merged.values() if entry['trending']]
+        self.stats['free'] = len(free)
+        self.stats['selected'] = len(selected)
+        self.stats['planned_calls'] = round(spent, 1)
+
+    def summary(self):
+        s = self.stats
+        return (f"{s['collected']} collected -> {s['unique']} unique, "
+                f"dropped {s['known_absent']} absent / {s['low_volume']} low volume / "
+                f"{s['known_filtered']} known non-gold, {s['free']} free + {s['selected']} selected "
+                f"({s['planned_calls']}/{s['budget']} calls, {s['over_budget']} over budget)")
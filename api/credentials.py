@@ -0,0 +1,256 @@
+"""
+네이버 Open API / 검색광고 API 자격증명 풀.
+
+여러 애플리케이션 키를 등록해 두면 호출을 가장 한가한 키(least-loaded) 또는
+순번(round-robin)으로 분산하고, 키별 일일 사용량과 스로틀링을 추적합니다.
+401/429를 받은 키는 잠시 로테이션에서 빠지고, 그동안 다른 키로 다시 시도합니다.
+
+설정 (.env):
+    NAVER_CLIENT_ID / NAVER_CLIENT_SECRET            첫 번째 Open API 키
+    NAVER_CLIENT_ID_2 / NAVER_CLIENT_SECRET_2 ...    추가 키 (번호를 이어서)
+    NAVER_AD_ACCESS_LICENSE / NAVER_AD_SECRET_KEY / NAVER_AD_CUSTOMER_ID (+ _2, _3 ...)
+    NAVER_CREDENTIALS_FILE   위 대신/추가로 읽을 JSON 파일
+        {"open_api": [{"client_id": "...", "client_secret": "...", "daily_quota": 25000}],
+         "ad_api": [{"license": "...", "secret": "...", "customer_id": "..."}]}
+    NAVER_CREDENTIAL_STRATEGY   least_loaded(기본) | round_robin
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from resilience import DEFAULT_RETRY_POLICY, RETRYABLE_STATUS, RetryPolicy, parse_retry_after
+
+KST = timezone(timedelta(hours=9))
+
+# Open API 검색은 애플리케이션당 하루 25,000회
+OPEN_API_DAILY_QUOTA = int(os.getenv("NAVER_OPEN_API_DAILY_QUOTA", "25000"))
+# 429를 받은 키를 쉬게 하는 기본 시간, 401/403(키 오류)은 더 길게
+THROTTLE_COOLDOWN = 60.0
+AUTH_COOLDOWN = 600.0
+
+# 다른 키로 넘길 수 있을 때는 429를 같은 키로 재시도하지 않습니다.
+ROTATING_RETRY_POLICY = RetryPolicy(retry_statuses=RETRYABLE_STATUS - {429})
+
+
+class Credential:
+    def __init__(self, key_id, secret, customer_id=None, daily_quota=None):
+        self.key_id = key_id
+        self.secret = secret
+        self.customer_id = customer_id
+        self.daily_quota = daily_quota
+        self.in_flight = 0
+        self.used_today = 0
+        self.throttled = 0
+        self.cooldown_until = 0.0
+        self._day = None
+
+    def _roll_day(self):
+        today = datetime.now(KST).date()
+        if self._day != today:
+            self._day = today
+            self.used_today = 0
+
+    def available(self, now):
+        self._roll_day()
+        if now < self.cooldown_until:
+            return False
+        return self.daily_quota is None or self.used_today < self.daily_quota
+
+    def masked_id(self):
+        return self.key_id[:4] + "***"
+
+
+class CredentialPool:
+    def __init__(self, name, credentials, strategy="least_loaded"):
+        self.name = name
+        self.credentials = list(credentials)
+        self.strategy = strategy
+        self._rr = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.credentials)
+
+    def acquire(self, exclude=()):
+        """
+        사용할 키를 하나 골라 in_flight/사용량을 올립니다. 키가 하나도 없으면 None.
+        모든 키가 쉬는 중이면 가장 먼저 풀리는 키를 반환합니다. (요청을 굶기지 않음)
+        """
+        with self._lock:
+            candidates = [c for c in self.credentials if c.key_id not in exclude] or self.credentials
+            if not candidates:
+                return None
+            now = time.monotonic()
+            ready = [c for c in candidates if c.available(now)]
+            if not ready:
+                chosen = min(candidates, key=lambda c: c.cooldown_until)
+            elif self.strategy == "round_robin":
+                chosen = ready[self._rr % len(ready)]
+                self._rr += 1
+            else:
+                chosen = min(ready, key=lambda c: (c.in_flight, c.used_today))
+            chosen.in_flight += 1
+            chosen.used_today += 1
+            return chosen
+
+    def release(self, credential, response=None):
+        with self._lock:
+            credential.in_flight -= 1
+            if response is None:
+                return
+            status = response.status_code
+            if status == 429:
+                credential.throttled += 1
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                credential.cooldown_until = time.monotonic() + (retry_after or THROTTLE_COOLDOWN)
+            elif status in (401, 403):
+                credential.cooldown_until = time.monotonic() + AUTH_COOLDOWN
+        if response.status_code in (401, 403, 429):
+            print(f"{self.name} key {credential.masked_id()} rested after {response.status_code}")
+
+    def _retry_policy(self):
+        return ROTATING_RETRY_POLICY if len(self.credentials) > 1 else DEFAULT_RETRY_POLICY
+
+    def call(self, send):
+        """
+        send(credential, retry_policy) -> response 를 실행합니다.
+        401/429를 받으면 그 키를 쉬게 하고, 아직 시도하지 않은 다른 키가 있으면 그 키로 다시 보냅니다.
+        """
+        tried = set()
+        while True:
+            credential = self.acquire(exclude=tried)
+            if credential is None:
+                return None
+            try:
+                response = send(credential, self._retry_policy())
+            except Exception:
+                self.release(credential)
+                raise
+            self.release(credential, response)
+            tried.add(credential.key_id)
+            if response.status_code in (401, 403, 429) and len(tried) < len(self.credentials):
+                continue
+            return response
+
+    async def async_call(self, send):
+        """
+        call()의 비동기 버전. send는 코루틴 함수입니다.
+        """
+        tried = set()
+        while True:
+            credential = self.acquire(exclude=tried)
+            if credential is None:
+                return None
+            try:
+                response = await send(credential, self._retry_policy())
+            except Exception:
+                self.release(credential)
+                raise
+            self.release(credential, response)
+            tried.add(credential.key_id)
+            if response.status_code in (401, 403, 429) and len(tried) < len(self.credentials):
+                continue
+            return response
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            return [{
+                "key": c.masked_id(),
+                "in_flight": c.in_flight,
+                "used_today": c.used_today,
+                "daily_quota": c.daily_quota,
+                "throttled": c.throttled,
+                "cooling_down": now < c.cooldown_until
+            } for c in self.credentials]
+
+
+def _numbered_env(*names):
+    """
+    NAME, NAME_2, NAME_3 ... 형식의 환경변수 묶음을 차례로 읽습니다.
+    """
+    rows = []
+    suffixes = [""] + [f"_{i}" for i in range(2, 100)]
+    for suffix in suffixes:
+        values = [os.getenv(name + suffix, "").strip() for name in names]
+        if not all(values):
+            if suffix:
+                break
+            continue
+        rows.append(values)
+    return rows
+
+
+def _credentials_file():
+    path = os.getenv("NAVER_CREDENTIALS_FILE", "").strip()
+    if not path:
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Credentials file error: {e}")
+        return {}
+
+
+def load_open_api_credentials():
+    creds = [Credential(cid, secret, daily_quota=OPEN_API_DAILY_QUOTA)
+             for cid, secret in _numbered_env("NAVER_CLIENT_ID", "NAVER_CLIENT_SECRET")]
+    for row in _credentials_file().get("open_api", []):
+        creds.append(Credential(row["client_id"], row["client_secret"],
+                                daily_quota=row.get("daily_quota", OPEN_API_DAILY_QUOTA)))
+    return _dedupe(creds)
+
+
+def load_ad_api_credentials():
+    creds = [Credential(license_key, secret, customer_id)
+             for license_key, secret, customer_id in
+             _numbered_env("NAVER_AD_ACCESS_LICENSE", "NAVER_AD_SECRET_KEY", "NAVER_AD_CUSTOMER_ID")]
+    for row in _credentials_file().get("ad_api", []):
+        creds.append(Credential(row["license"], row["secret"], str(row["customer_id"]),
+                                daily_quota=row.get("daily_quota")))
+    return _dedupe(creds)
+
+
+def _dedupe(creds):
+    seen = set()
+    unique = []
+    for c in creds:
+        if c.key_id not in seen:
+            seen.add(c.key_id)
+            unique.append(c)
+    return unique
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(name, loader):
+    pool = _pools.get(name)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(name)
+            if pool is None:
+                strategy = os.getenv("NAVER_CREDENTIAL_STRATEGY", "least_loaded").strip()
+                pool = _pools[name] = CredentialPool(name, loader(), strategy)
+    return pool
+
+
+def get_open_api_pool():
+    return _get_pool("open_api", load_open_api_credentials)
+
+
+def get_ad_api_pool():
+    return _get_pool("ad_api", load_ad_api_credentials)
+
+
+def reset_pools():
+    """
+    환경변수가 바뀐 뒤 풀을 다시 읽어야 할 때 사용합니다.
+    """
+    with _pools_lock:
+        _pools.clear()
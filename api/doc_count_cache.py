@@ -0,0 +1,82 @@
+"""
+블로그 문서수(get_keyword_info) 캐시.
+
+문서수는 키워드마다 늘어나는 속도가 크게 다릅니다. (신조어/이슈 키워드는 시간 단위로,
+일반 키워드는 몇 주 동안 거의 그대로) 그래서 고정 TTL 대신, 같은 키워드를 이전에
+관측한 값과 비교해 변화 속도를 구하고, 허용 오차(DOC_COUNT_TOLERANCE)에 도달할 때까지
+걸릴 시간을 TTL로 씁니다.
+
+관측 이력을 남기기 위해 SQLite 계층에는 HISTORY_TTL 동안 보관하고,
+'신선한지'는 값에 저장된 fresh_until로 따로 판단합니다.
+
+설정 (.env):
+    DOC_COUNT_TOLERANCE   허용 상대 오차 (기본 0.02 = 2%)
+"""
+
+import os
+import time
+
+from keyword_cache import TieredCache
+
+DOC_COUNT_TOLERANCE = float(os.getenv("DOC_COUNT_TOLERANCE", "0.02"))
+DOC_COUNT_DEFAULT_TTL = 3600.0
+DOC_COUNT_MIN_TTL = 600.0
+DOC_COUNT_MAX_TTL = 24 * 3600.0
+HISTORY_TTL = 14 * 24 * 3600.0
+
+doc_count_cache = TieredCache("doc_counts", HISTORY_TTL, max_memory_items=20000)
+
+
+def doc_count_key(keyword):
+    # 문서수는 띄어쓰기에 따라 달라지므로 공백은 정리만 하고 지우지 않습니다.
+    return " ".join(keyword.split()).lower()
+
+
+def adaptive_ttl(previous, total, now):
+    """
+    이전 관측(previous)과 현재 값(total)으로 다음 갱신까지의 시간(초)을 계산합니다.
+    """
+    if not previous:
+        return DOC_COUNT_DEFAULT_TTL
+    elapsed = now - previous['observed_at']
+    if elapsed <= 0:
+        return DOC_COUNT_DEFAULT_TTL
+    change = abs(total - previous['total']) / max(total, previous['total'], 1)
+    if change == 0:
+        return DOC_COUNT_MAX_TTL
+    ttl = DOC_COUNT_TOLERANCE / (change / elapsed)
+    return max(DOC_COUNT_MIN_TTL, min(DOC_COUNT_MAX_TTL, ttl))
+
+
+def lookup_doc_counts(keywords):
+    """
+    { keyword: total } (신선한 항목만), [미스 키워드] 를 반환합니다.
+    """
+    keys = {kwd: doc_count_key(kwd) for kwd in keywords}
+    cached = doc_count_cache.get_many(list(keys.values()))
+    now = time.time()
+    hits, misses = {}, []
+    for kwd, key in keys.items():
+        entry = cached.get(key)
+        if entry is not None and entry['fresh_until'] > now:
+            hits[kwd] = entry['total']
+        else:
+            misses.append(kwd)
+    return hits, misses
+
+
+def store_doc_counts(counts):
+    """
+    counts: { keyword: total }. 이전 관측과 비교해 키워드별 TTL을 정해 저장합니다.
+    """
+    if not counts:
+        return
+    keys = {kwd: doc_count_key(kwd) for kwd in counts}
+    previous = doc_count_cache.get_many(list(keys.values()))
+    now = time.time()
+    entries = {}
+    for kwd, total in counts.items():
+        key = keys[kwd]
+        ttl = adaptive_ttl(previous.get(key), total, now)
+        entries[key] = {'total': total, 'observed_at': now, 'fresh_until': now + ttl}
+    doc_count_cache.put_many(entries)
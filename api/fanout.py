@@ -0,0 +1,109 @@
+"""
+서로 독립적인 업스트림 호출을 동시에 보내고 공유 마감 시간(deadline)까지 기다리는 헬퍼.
+
+마감까지 끝나지 않은 작업은 'timeout'으로 표시하고 기다리지 않습니다. 그래서 한 업스트림이
+느려도 나머지 결과는 제때 돌려줄 수 있습니다. 작업 스레드에는 그 작업의 마감 시각이
+기록되어, http_client가 HTTP 타임아웃을 남은 시간으로 줄이고 마감이 지나면 재시도하지
+않습니다. 버려진 작업이 워커를 오래 붙잡지 않도록 하기 위해서입니다.
+
+fan_out은 중첩해서 부를 수 있습니다. (예: 리포트 → 섹션 순서 → PC/모바일)
+중첩 단계마다 스레드 풀을 따로 쓰므로, 바깥 작업이 모든 워커를 잡고 안쪽 작업을
+기다리며 막히는 일이 없습니다.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# 중첩 단계별 풀의 워커 수
+FANOUT_WORKERS = 32
+
+_executors = {}
+_executor_lock = threading.Lock()
+# 작업 스레드의 중첩 단계(depth)와 마감 시각(deadline, perf_counter 기준)
+_context = threading.local()
+
+
+def _get_executor(depth):
+    executor = _executors.get(depth)
+    if executor is None:
+        with _executor_lock:
+            executor = _executors.get(depth)
+            if executor is None:
+                executor = _executors[depth] = ThreadPoolExecutor(
+                    max_workers=FANOUT_WORKERS, thread_name_prefix=f"fanout{depth}")
+    return executor
+
+
+def time_left():
+    """
+    현재 스레드가 fan_out 작업 안이면 그 작업의 남은 시간(초), 아니면 None.
+    """
+    deadline = getattr(_context, 'deadline', None)
+    return None if deadline is None else deadline - time.perf_counter()
+
+
+class Outcome:
+    def __init__(self, status, value=None, error=None, elapsed_ms=None):
+        self.status = status            # ok | error | timeout
+        self.value = value
+        self.error = error
+        self.elapsed_ms = elapsed_ms
+
+    @property
+    def ok(self):
+        return self.status == "ok"
+
+    def meta(self):
+        meta = {"status": self.status, "elapsed_ms": self.elapsed_ms}
+        if self.error:
+            meta["error"] = self.error
+        return meta
+
+
+def _timed(func, depth, deadline):
+    start = time.perf_counter()
+    _context.depth, _context.deadline = depth, deadline
+    try:
+        return Outcome("ok", func(), elapsed_ms=round((time.perf_counter() - start) * 1000))
+    except Exception as e:
+        return Outcome("error", error=str(e) or type(e).__name__,
+                       elapsed_ms=round((time.perf_counter() - start) * 1000))
+    finally:
+        # 풀 스레드는 재사용되므로 다음 작업에 남기지 않습니다.
+        _context.depth, _context.deadline = None, None
+
+
+def fan_out(tasks, deadline, timeouts=None):
+    """
+    tasks: { 이름: 인자 없는 함수 }
+    deadline: 전체 마감(초). timeouts로 작업별 더 짧은 마감을 줄 수 있습니다.
+    Returns: { 이름: Outcome }
+    """
+    timeouts = timeouts or {}
+    start = time.perf_counter()
+    # 다른 fan_out 작업 안에서 불렸으면 바깥 작업의 마감을 넘기지 않습니다.
+    outer_left = time_left()
+    if outer_left is not None:
+        deadline = max(0.0, min(deadline, outer_left))
+    depth = getattr(_context, 'depth', None) or 0
+    executor = _get_executor(depth)
+
+    # 작업별 마감이 짧은 것부터 기다리고, 나머지는 전체 마감까지
+    limits = {name: min(timeouts.get(name, deadline), deadline) for name in tasks}
+    futures = {name: executor.submit(_timed, func, depth + 1, start + limits[name])
+               for name, func in tasks.items()}
+    for name in sorted(futures, key=limits.get):
+        remaining = limits[name] - (time.perf_counter() - start)
+        if remaining > 0:
+            wait([futures[name]], timeout=remaining)
+
+    outcomes = {}
+    for name, future in futures.items():
+        if not future.done():
+            future.cancel()
+            outcomes[name] = Outcome("timeout", error=f"no response within {limits[name]:.1f}s",
+                                     elapsed_ms=round(limits[name] * 1000))
+            continue
+        outcomes[name] = future.result()
+    return outcomes
@@ -0,0 +1,300 @@
+"""
+분석이 끝난 황금 키워드 후보의 영구 인덱스 (SQLite).
+
+gold_pipeline이 키워드마다 계산한 지표(검색량, 문서수, 경쟁도, 모바일 1순위 섹션, 점수, 등급)를
+fetched_at과 함께 저장합니다. 인기 시드의 후보와 지표는 하루 안에는 거의 바뀌지 않으므로
+/api/gold/discover 는 이 인덱스에서 바로 답하고, 오래된 행은 작업 큐(gold_jobs)에 갱신 작업을
+등록해 다시 분석합니다. 다시 분석할 때는 신선한 행을 파이프라인 체크포인트(state['scored'])로 넘겨,
+오래됐거나 새로 등장한 후보만 업스트림을 호출합니다.
+
+콜드 스타트: 인덱스가 비어 있으면 전체 분석(후보 수백 개의 검색량/문서수 조회와 상위 키워드의
+SERP 스크래핑, 수십 초)이 필요합니다. 기본으로는 예전처럼 그 요청 안에서 분석해 결과를 돌려주고
+인덱스에 저장합니다. /api/gold/discover?async=1 이면 분석하지 않고 갱신 작업을 등록해 202와
+작업 주소(Location)로 응답합니다. 갱신 작업은 작업 큐의 워커가 실행하는데, 요청이 끝나면 멈추는
+서버리스 인스턴스에서는 프로세스 안의 워커 스레드가 끝까지 돈다는 보장이 없으므로
+GOLD_JOB_REDIS_URL과 별도 워커(python api/gold_jobs.py)를 쓰거나, 배포 직후와 주기적으로
+python api/gold_index.py (refresh_gold_index)를 실행해 인덱스를 미리 채워 두세요.
+
+설정 (.env):
+    KEYWORD_CACHE_DB      SQLite 파일 경로 (keyword_cache와 같은 파일, "off"면 메모리 DB)
+    GOLD_INDEX_MAX_AGE    이보다 오래된(초) 행은 갱신 대상 (기본 1일)
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+from keyword_cache import _db_path
+from gold_pipeline import discover_gold_events, is_gold, GOLD_MIN_SCORE, GOLD_MAX_DOCS, GOLD_RESULT_LIMIT
+
+GOLD_INDEX_MAX_AGE = float(os.getenv("GOLD_INDEX_MAX_AGE", str(24 * 3600)))
+GOLD_INDEX_QUERY_LIMIT = 100
+
+# fetch_full_info 결과 필드 → 컬럼
+GOLD_INDEX_COLUMNS = (
+    'keyword', 'pc_vol', 'mo_vol', 'volume', 'docs', 'comp_idx', 'platform',
+    'score', 'tier', 'label', 'trend', 'fetched_at'
+)
+
+
+def row_from_result(res, fetched_at):
+    return (res['keyword'], res['pc_vol'], res['mo_vol'], res['volume'], res['docs'],
+            res['comp'], res['platform'], res['score'], res['tier'], res['label'],
+            res['trend'], fetched_at)
+
+
+def result_from_row(row):
+    # fetch_full_info와 같은 모양으로 돌려줍니다.
+    values = dict(zip(GOLD_INDEX_COLUMNS, row))
+    return {
+        "rank": "-",
+        "keyword": values['keyword'],
+        "volume": values['volume'],
+        "pc_vol": values['pc_vol'],
+        "mo_vol": values['mo_vol'],
+        "docs": values['docs'],
+        "score": values['score'],
+        "label": values['label'],
+        "tier": values['tier'],
+        "comp": values['comp_idx'],
+        "platform": values['platform'],
+        "trend": values['trend'],
+        "fetched_at": values['fetched_at']
+    }
+
+
+class GoldIndex:
+    def __init__(self, db_path=None):
+        self._lock = threading.Lock()
+        path = db_path or _db_path()
+        if not path or path.lower() == "off":
+            path = ":memory:"
+        try:
+            self._db = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        except sqlite3.Error as e:
+            print(f"Gold index DB unavailable ({path}), using memory: {e}")
+            self._db = sqlite3.connect(":memory:", check_same_thread=False)
+        if path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS gold_keywords ("
+            "keyword TEXT PRIMARY KEY, pc_vol INTEGER, mo_vol INTEGER, volume INTEGER, "
+            "docs INTEGER, comp_idx TEXT, platform TEXT, score REAL, tier TEXT, label TEXT, "
+            "trend TEXT, fetched_at REAL NOT NULL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS gold_keywords_score ON gold_keywords(score DESC)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS gold_keywords_fetched ON gold_keywords(fetched_at)")
+        self._db.commit()
+
+    def upsert_many(self, results, fetched_at=None):
+        """
+        results: fetch_full_info 결과 리스트 (None은 건너뜀)
+        """
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        rows = [row_from_result(res, fetched_at) for res in results if res]
+        if not rows:
+            return 0
+        with self._lock:
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO gold_keywords ({', '.join(GOLD_INDEX_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(GOLD_INDEX_COLUMNS))})", rows)
+            self._db.commit()
+        return len(rows)
+
+    def query(self, tiers=None, min_volume=None, max_docs=None, platform=None,
+              min_score=None, max_age=None, limit=GOLD_RESULT_LIMIT):
+        """
+        조건에 맞는 키워드를 점수 내림차순으로 반환합니다.
+        tiers: 등급 리스트 (예: ['ultra', 'golden']), max_age: 이보다 오래된 행 제외(초)
+        """
+        clauses, params = [], []
+        if tiers:
+            clauses.append(f"tier IN ({','.join('?' * len(tiers))})")
+            params.extend(tiers)
+        if min_volume is not None:
+            clauses.append("volume >= ?")
+            params.append(min_volume)
+        if max_docs is not None:
+            clauses.append("docs <= ?")
+            params.append(max_docs)
+        if platform:
+            clauses.append("platform = ?")
+            params.append(platform)
+        if min_score is not None:
+            clauses.append("score >= ?")
+            params.append(min_score)
+        if max_age is not None:
+            clauses.append("fetched_at >= ?")
+            params.append(time.time() - max_age)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {', '.join(GOLD_INDEX_COLUMNS)} FROM gold_keywords {where} "
+                f"ORDER BY score DESC LIMIT ?", (*params, limit)).fetchall()
+        return [result_from_row(row) for row in rows]
+
+    def fresh_results(self, max_age=GOLD_INDEX_MAX_AGE):
+        """
+        { keyword: 결과 } - max_age 안에 분석된 행 전체 (재분석 시 체크포인트로 사용)
+        """
+        cutoff = time.time() - max_age
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {', '.join(GOLD_INDEX_COLUMNS)} FROM gold_keywords WHERE fetched_at >= ?",
+                (cutoff,)).fetchall()
+        return {row[0]: result_from_row(row) for row in rows}
+
+    def stats(self, max_age=GOLD_INDEX_MAX_AGE):
+        cutoff = time.time() - max_age
+        with self._lock:
+            total, stale, newest = self._db.execute(
+                "SELECT COUNT(*), SUM(fetched_at < ?), MAX(fetched_at) FROM gold_keywords",
+                (cutoff,)).fetchone()
+        return {"rows": total, "stale_rows": stale or 0, "refreshed_at": newest}
+
+    def prune(self, before):
+        """
+        fetched_at이 before(타임스탬프)보다 이전인 행을 지웁니다.
+        갱신 직후에 남은 오래된 행은 더 이상 후보가 아닌 키워드입니다.
+        """
+        with self._lock:
+            deleted = self._db.execute("DELETE FROM gold_keywords WHERE fetched_at < ?",
+                                       (before,)).rowcount
+            self._db.commit()
+        return deleted
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM gold_keywords")
+            self._db.commit()
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_gold_index():
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = GoldIndex()
+    return _index
+
+
+def checkpoint_from_index(index=None, max_age=GOLD_INDEX_MAX_AGE):
+    """
+    max_age 안에 분석된 행으로 파이프라인 체크포인트를 만듭니다.
+    Returns: (state, reused) - reused는 재사용한 행의 {키워드: platform}
+    """
+    fresh = (index or get_gold_index()).fresh_results(max_age)
+    # 파이프라인이 enrich하며 행을 고치므로 복사본을 넘깁니다.
+    state = {'scored': {kwd: dict(res) for kwd, res in fresh.items()}}
+    return state, {kwd: res['platform'] for kwd, res in fresh.items()}
+
+
+def index_scored_rows(state, index=None, skip=None):
+    """
+    파이프라인 state['scored']의 분석 결과를 인덱스에 저장합니다.
+    skip: checkpoint_from_index의 reused. 인덱스에서 가져와 바뀌지 않은(enrich되지 않은) 행은
+    fetched_at이 바뀌지 않도록 제외합니다.
+    """
+    index = index or get_gold_index()
+    skip = skip or {}
+    return index.upsert_many(res for kwd, res in state.get('scored', {}).items()
+                             if res is None or kwd not in skip or skip[kwd] != res['platform'])
+
+
+def finish_index_refresh(state, reused, started_at, max_age=GOLD_INDEX_MAX_AGE, index=None):
+    """
+    갱신이 끝난 파이프라인 결과를 저장하고, started_at 기준으로 오래된 행(더는 후보가 아닌 키워드)을 지웁니다.
+    """
+    index = index or get_gold_index()
+    stored = index_scored_rows(state, index, skip=reused)
+    pruned = index.prune(started_at - max_age)
+    print(f"Gold index refreshed: {stored} rows re-scored, {len(reused)} reused, {pruned} dropped")
+
+
+def refresh_gold_index(seed='', index=None, max_age=GOLD_INDEX_MAX_AGE):
+    """
+    지금 이 프로세스에서 파이프라인을 실행해 인덱스를 갱신합니다. (cron, refresh=1 용)
+    max_age 안에 분석된 키워드는 다시 부르지 않습니다.
+    Returns: 최종 순위 (discover_gold_keywords와 같은 형식)
+    """
+    index = index or get_gold_index()
+    started_at = time.time()
+    state, reused = checkpoint_from_index(index, max_age)
+    results = []
+    for event in discover_gold_events(seed, state):
+        if event['event'] == 'done':
+            results = event['results']
+    finish_index_refresh(state, reused, started_at, max_age, index)
+    return results
+
+
+_refresh_job_id = None
+_refresh_lock = threading.Lock()
+
+
+def request_index_refresh(seed='', max_age=GOLD_INDEX_MAX_AGE):
+    """
+    공유 인덱스 갱신 작업을 작업 큐에 등록합니다.
+    이 프로세스가 등록한 갱신 작업이 아직 대기/진행 중이면 새로 등록하지 않고 그 작업을 돌려줍니다.
+    Returns: 작업 dict (공개용)
+    """
+    global _refresh_job_id
+    # gold_jobs가 이 모듈을 import하므로 호출할 때 가져옵니다.
+    from gold_jobs import submit_gold_job, get_gold_job
+    with _refresh_lock:
+        job = get_gold_job(_refresh_job_id) if _refresh_job_id else None
+        if job is None or job['status'] not in ('queued', 'running'):
+            job = submit_gold_job(seed, refresh_max_age=max_age)
+            _refresh_job_id = job['id']
+    return job
+
+
+def indexed_gold_keywords(seed='', index=None, max_age=None):
+    """
+    인덱스에서 황금 키워드 기준(is_gold)을 통과한 행을 점수순으로 돌려줍니다.
+    max_age를 주면 그 안에 분석된 행만.
+    """
+    index = index or get_gold_index()
+    candidates = index.query(limit=GOLD_INDEX_QUERY_LIMIT, min_score=GOLD_MIN_SCORE,
+                             max_docs=GOLD_MAX_DOCS, max_age=max_age)
+    return [res for res in candidates if is_gold(res, seed)][:GOLD_RESULT_LIMIT]
+
+
+def discover_from_index(seed='', max_age=GOLD_INDEX_MAX_AGE, wait=True):
+    """
+    공유 인덱스에서 황금 키워드 순위를 바로 돌려줍니다. 오래된 행이 있으면 갱신 작업을 등록합니다.
+    인덱스가 비어 있으면(콜드 스타트) 지금 분석해 채우고, wait=False면 갱신 작업만 등록하므로
+    결과는 작업이 끝날 때까지 빈 리스트입니다.
+    Returns: (결과 리스트, 등록한 갱신 작업 또는 None)
+    """
+    index = get_gold_index()
+    stats = index.stats(max_age)
+    if not stats['rows'] and wait:
+        refresh_gold_index(seed, index, max_age)
+        return indexed_gold_keywords(seed, index), None
+    job = request_index_refresh(seed, max_age) if not stats['rows'] or stats['stale_rows'] else None
+    return indexed_gold_keywords(seed, index), job
+
+
+def refresher_loop(interval=3600.0, max_age=GOLD_INDEX_MAX_AGE):
+    """
+    interval초마다 오래된 행이 있거나 인덱스가 비어 있으면 갱신합니다.
+    """
+    index = get_gold_index()
+    while True:
+        stats = index.stats(max_age)
+        if not stats['rows'] or stats['stale_rows']:
+            try:
+                refresh_gold_index(index=index, max_age=max_age)
+            except Exception as e:
+                print(f"Gold index refresh failed: {e}")
+        time.sleep(interval)
+
+
+if __name__ == '__main__':
+    # 주기적 갱신 프로세스 (cron 등으로 한 번만 돌리려면 refresh_gold_index()를 호출)
+    refresher_loop()
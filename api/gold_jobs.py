@@ -0,0 +1,383 @@
+"""
+황금 키워드 발굴 백그라운드 작업(job) 큐.
+
+POST /api/gold/jobs 로 작업을 등록하면 작업 ID를 바로 돌려주고, 워커가 gold_pipeline의
+단계를 실행합니다. 단계/키워드가 끝날 때마다 중간 결과(state: 후보, 검색량, 분석 결과)를
+저장소에 체크포인트로 남기므로, 워커가 죽어도 다른 워커가 남은 부분만 이어서 실행합니다.
+GET /api/gold/jobs/<id> 는 진행 상황과 지금까지 찾은 키워드를 반환합니다.
+gold_index가 등록하는 인덱스 갱신 작업도 같은 큐로 실행되어, 끝나면 인덱스에 결과를 저장합니다.
+
+작업을 맡은 워커는 작업에 자기 ID(owner)와 임대 토큰(lease)을 기록하고, 체크포인트를 쓸 때마다
+저장된 토큰이 그대로인지 확인합니다. 하트비트가 끊겨 다시 큐에 들어간 작업은 토큰이 지워지므로,
+느렸을 뿐 살아 있던 이전 워커는 다음 저장에서 LeaseLost로 멈추고 새 실행을 덮어쓰지 않습니다.
+
+저장소:
+    - MemoryJobStore: 프로세스 내 dict + queue. 같은 프로세스의 워커 스레드가 처리합니다.
+    - RedisJobStore: GOLD_JOB_REDIS_URL이 있으면 사용 (pip install redis, Redis 6.2+). 여러 프로세스/서버의
+      워커가 같은 큐를 나눠 처리합니다. 워커만 따로 띄우려면: python api/gold_jobs.py
+      꺼낸 작업은 BLMOVE로 처리 중 목록에 옮겨 두고, 워커가 작업을 맡은 뒤에 확인(ack)합니다.
+      그 사이에 워커가 죽으면 requeue_stale_jobs가 처리 중 목록에서 다시 큐로 돌려놓습니다.
+
+설정 (.env):
+    GOLD_JOB_REDIS_URL   Redis 주소 (예: redis://localhost:6379/0, 없으면 메모리 저장소)
+    GOLD_JOB_WORKERS     이 프로세스에서 돌릴 워커 스레드 수 (기본 2, 0이면 등록만 함)
+    GOLD_JOB_STALE       하트비트가 이 시간(초) 이상 끊긴 running 작업은 다시 큐에 넣습니다 (기본 120)
+"""
+
+import json
+import os
+import queue
+import socket
+import threading
+import time
+import uuid
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+from gold_pipeline import discover_gold_events, GOLD_RESULT_LIMIT
+from gold_index import checkpoint_from_index, finish_index_refresh, index_scored_rows
+
+GOLD_JOB_WORKERS = int(os.getenv("GOLD_JOB_WORKERS", "2"))
+GOLD_JOB_STALE = float(os.getenv("GOLD_JOB_STALE", "120"))
+# 완료된 작업을 보관하는 시간(초)
+GOLD_JOB_TTL = 24 * 3600
+# 큐가 비었을 때 한 번에 기다리는 시간(초). 이 간격으로 멈춘 작업도 확인합니다.
+POLL_INTERVAL = 5.0
+# save()에서 임대 토큰을 확인하지 않을 때의 기본값
+UNCHECKED = object()
+WATCH_ERRORS = (redis.WatchError,) if redis is not None else ()
+
+
+class LeaseLost(Exception):
+    """
+    작업의 임대 토큰이 바뀌어(다른 워커가 맡음) 이 워커가 더 이상 쓰면 안 될 때.
+    """
+
+
+def _check_lease(stored, job_id, expected_lease):
+    if expected_lease is UNCHECKED:
+        return
+    if stored is None or stored.get('lease') != expected_lease:
+        raise LeaseLost(f"Gold job {job_id} is no longer leased by this worker")
+
+
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}"
+
+
+def new_job(seed='', refresh_max_age=None):
+    now = time.time()
+    state, reused = {}, {}
+    if refresh_max_age is not None:
+        # 인덱스 갱신: 신선한 행을 체크포인트로 넘겨 오래된/새 후보만 분석
+        state, reused = checkpoint_from_index(max_age=refresh_max_age)
+    return {
+        'id': uuid.uuid4().hex,
+        'seed': seed,
+        'status': 'queued',        # queued | running | done | failed
+        'stage': None,
+        'progress': {'stage': None, 'done': 0, 'total': 0},
+        'counters': None,          # 완료 시 단계별 처리 수
+        'partial': [],             # 지금까지 찾은 키워드 (점수순)
+        'results': None,           # 완료 시 최종 순위
+        'error': None,
+        'attempts': 0,
+        'owner': None,             # 작업을 맡은 워커
+        'lease': None,             # 맡은 실행의 임대 토큰
+        'state': state,            # 파이프라인 체크포인트
+        'reused': reused,          # 인덱스에서 재사용한 행 {키워드: platform}
+        'refresh_max_age': refresh_max_age,  # 인덱스 갱신 작업이면 오래된 행 기준(초)
+        'created_at': now,
+        'updated_at': now,
+        'heartbeat': None
+    }
+
+
+def public_view(job):
+    # 체크포인트(state, reused)와 임대 토큰은 내부용이라 응답에서 뺍니다.
+    return {key: value for key, value in job.items() if key not in ('state', 'reused', 'lease')}
+
+
+class MemoryJobStore:
+    def __init__(self):
+        self._jobs = {}
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+
+    def create(self, job):
+        with self._lock:
+            self._jobs[job['id']] = json.loads(json.dumps(job))
+        self._queue.put(job['id'])
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            # 호출자가 고쳐도 저장본이 바뀌지 않도록 복사본을 돌려줍니다.
+            return json.loads(json.dumps(job)) if job else None
+
+    def save(self, job, expected_lease=UNCHECKED):
+        """
+        expected_lease를 주면 저장된 작업의 임대 토큰이 같을 때만 씁니다. (아니면 LeaseLost)
+        """
+        job['updated_at'] = time.time()
+        with self._lock:
+            _check_lease(self._jobs.get(job['id']), job['id'], expected_lease)
+            self._jobs[job['id']] = json.loads(json.dumps(job))
+
+    def dequeue(self, timeout):
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def ack(self, job_id):
+        # 메모리 큐는 꺼낸 작업을 따로 보관하지 않습니다.
+        pass
+
+    def requeue(self, job_id):
+        self._queue.put(job_id)
+
+    def running_jobs(self):
+        with self._lock:
+            return [job_id for job_id, job in self._jobs.items() if job['status'] == 'running']
+
+    def unacked_jobs(self):
+        return []
+
+    def purge_expired(self):
+        cutoff = time.time() - GOLD_JOB_TTL
+        with self._lock:
+            for job_id in [job_id for job_id, job in self._jobs.items()
+                           if job['status'] in ('done', 'failed') and job['updated_at'] < cutoff]:
+                del self._jobs[job_id]
+
+
+class RedisJobStore:
+    """
+    작업은 gold:job:<id> 키에 JSON으로, 대기열은 gold:jobs:queue 리스트로 저장합니다.
+    꺼낸 작업은 워커가 ack할 때까지 gold:jobs:processing 리스트에 남습니다.
+    """
+    QUEUE_KEY = "gold:jobs:queue"
+    PROCESSING_KEY = "gold:jobs:processing"
+    RUNNING_KEY = "gold:jobs:running"
+
+    def __init__(self, url=None, client=None):
+        self._redis = client if client is not None else redis.Redis.from_url(url)
+
+    def _key(self, job_id):
+        return f"gold:job:{job_id}"
+
+    def create(self, job):
+        self._redis.set(self._key(job['id']), json.dumps(job, ensure_ascii=False), ex=GOLD_JOB_TTL)
+        self._redis.lpush(self.QUEUE_KEY, job['id'])
+
+    def get(self, job_id):
+        raw = self._redis.get(self._key(job_id))
+        return json.loads(raw) if raw else None
+
+    def save(self, job, expected_lease=UNCHECKED):
+        """
+        expected_lease를 주면 WATCH로 저장된 임대 토큰을 확인한 뒤 트랜잭션으로 씁니다.
+        확인과 쓰기 사이에 다른 쪽이 작업을 바꿨으면 LeaseLost.
+        """
+        job['updated_at'] = time.time()
+        key = self._key(job['id'])
+        with self._redis.pipeline() as pipe:
+            try:
+                if expected_lease is not UNCHECKED:
+                    pipe.watch(key)
+                    raw = pipe.get(key)
+                    _check_lease(json.loads(raw) if raw else None, job['id'], expected_lease)
+                    pipe.multi()
+                pipe.set(key, json.dumps(job, ensure_ascii=False), ex=GOLD_JOB_TTL)
+                if job['status'] == 'running':
+                    pipe.sadd(self.RUNNING_KEY, job['id'])
+                else:
+                    pipe.srem(self.RUNNING_KEY, job['id'])
+                pipe.execute()
+            except WATCH_ERRORS:
+                raise LeaseLost(f"Gold job {job['id']} changed while saving")
+
+    def dequeue(self, timeout):
+        item = self._redis.blmove(self.QUEUE_KEY, self.PROCESSING_KEY, max(1, int(timeout)), "RIGHT", "LEFT")
+        return item.decode() if item else None
+
+    def ack(self, job_id):
+        self._redis.lrem(self.PROCESSING_KEY, 1, job_id)
+
+    def requeue(self, job_id):
+        self._redis.lpush(self.QUEUE_KEY, job_id)
+
+    def running_jobs(self):
+        return [job_id.decode() for job_id in self._redis.smembers(self.RUNNING_KEY)]
+
+    def unacked_jobs(self):
+        return [job_id.decode() for job_id in self._redis.lrange(self.PROCESSING_KEY, 0, -1)]
+
+    def purge_expired(self):
+        # 작업 키는 Redis TTL로 만료됩니다.
+        pass
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_job_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                url = os.getenv("GOLD_JOB_REDIS_URL", "").strip()
+                if url and redis is not None:
+                    _store = RedisJobStore(url)
+                else:
+                    if url:
+                        print("GOLD_JOB_REDIS_URL is set but redis is not installed, using in-memory job store")
+                    _store = MemoryJobStore()
+    return _store
+
+
+def run_gold_job(job_id, store=None):
+    """
+    작업 하나를 실행합니다. 저장된 체크포인트가 있으면 그 다음 단계부터 이어서 진행합니다.
+    """
+    store = store or get_job_store()
+    job = store.get(job_id)
+    if job is None or job['status'] != 'queued':
+        # 끝났거나 다른 워커가 이미 맡은 작업
+        store.ack(job_id)
+        return
+    # 작업 맡기: 읽은 뒤 다른 워커가 먼저 맡았으면 (토큰이 생겼으면) 저장이 실패합니다.
+    lease = uuid.uuid4().hex
+    job.update(status='running', owner=worker_id(), lease=lease, heartbeat=time.time())
+    job['attempts'] += 1
+    try:
+        store.save(job, expected_lease=None)
+    except LeaseLost:
+        print(f"Gold job {job_id} was claimed by another worker")
+        return
+    finally:
+        store.ack(job_id)
+
+    try:
+        for event in discover_gold_events(job['seed'], job['state']):
+            kind = event['event']
+            if kind == 'stage':
+                job['stage'] = event['stage']
+            elif kind == 'progress':
+                job['progress'] = {'stage': event['stage'], 'done': event['done'], 'total': event['total']}
+            elif kind == 'keyword':
+                if event['item']['keyword'] not in {item['keyword'] for item in job['partial']}:
+                    job['partial'].append(event['item'])
+                    job['partial'].sort(key=lambda x: x['score'], reverse=True)
+                    del job['partial'][GOLD_RESULT_LIMIT:]
+            elif kind == 'done':
+                if job['refresh_max_age'] is None:
+                    index_scored_rows(job['state'], skip=job['reused'])
+                else:
+                    finish_index_refresh(job['state'], job['reused'], job['created_at'], job['refresh_max_age'])
+                job['results'] = event['results']
+                job['counters'] = event['counters']
+                job['status'] = 'done'
+                job['stage'] = 'done'
+            job['heartbeat'] = time.time()
+            store.save(job, expected_lease=lease)
+    except LeaseLost as e:
+        # 멈춘 것으로 보고 다시 큐에 넣은 작업. 새 실행이 이어받으므로 여기서 그만둡니다.
+        print(f"{e}, stopping this run")
+    except Exception as e:
+        print(f"Gold job {job_id} failed: {e}")
+        job['status'] = 'failed'
+        job['error'] = str(e)
+        try:
+            store.save(job, expected_lease=lease)
+        except LeaseLost:
+            pass
+
+
+def requeue_stale_jobs(store=None):
+    """
+    하트비트가 GOLD_JOB_STALE초 이상 끊긴 running 작업(워커가 죽은 작업)과, 꺼낸 뒤 맡기 전에
+    워커가 죽어 처리 중 목록에 남은 작업을 다시 큐에 넣습니다.
+    다시 넣는 작업은 임대 토큰을 지우므로 이전 워커가 살아 있어도 더는 쓰지 못합니다.
+    """
+    store = store or get_job_store()
+    now = time.time()
+    requeued = []
+    for job_id in store.running_jobs():
+        job = store.get(job_id)
+        if job and job['status'] == 'running' and now - (job['heartbeat'] or 0) > GOLD_JOB_STALE:
+            lease = job.get('lease')
+            job.update(status='queued', owner=None, lease=None)
+            try:
+                store.save(job, expected_lease=lease)
+            except LeaseLost:
+                continue
+            print(f"Gold job {job_id} stalled at stage {job['stage']}, requeueing")
+            store.requeue(job_id)
+            requeued.append(job_id)
+    for job_id in store.unacked_jobs():
+        job = store.get(job_id)
+        if job is None or job['status'] != 'queued':
+            # 이미 맡겨졌거나 끝난 작업 (맡은 워커의 ack만 늦은 경우)
+            store.ack(job_id)
+        elif now - job['updated_at'] > GOLD_JOB_STALE:
+            print(f"Gold job {job_id} was dequeued but never started, requeueing")
+            store.ack(job_id)
+            store.requeue(job_id)
+            requeued.append(job_id)
+    return requeued
+
+
+def worker_loop(store=None, stop_event=None):
+    store = store or get_job_store()
+    while stop_event is None or not stop_event.is_set():
+        job_id = store.dequeue(POLL_INTERVAL)
+        if job_id is None:
+            requeue_stale_jobs(store)
+            store.purge_expired()
+            continue
+        run_gold_job(job_id, store)
+
+
+_workers = []
+_workers_lock = threading.Lock()
+
+
+def ensure_workers(count=None):
+    """
+    이 프로세스의 워커 스레드를 (아직 없으면) 띄웁니다.
+    """
+    count = GOLD_JOB_WORKERS if count is None else count
+    with _workers_lock:
+        _workers[:] = [worker for worker in _workers if worker.is_alive()]
+        while len(_workers) < count:
+            worker = threading.Thread(target=worker_loop, name=f"gold-job-{len(_workers)}", daemon=True)
+            worker.start()
+            _workers.append(worker)
+
+
+def submit_gold_job(seed='', refresh_max_age=None):
+    """
+    작업을 등록하고 작업 dict(공개용)를 반환합니다.
+    refresh_max_age를 주면 공유 인덱스 갱신 작업 (gold_index.request_index_refresh 참고)
+    """
+    job = new_job(seed, refresh_max_age)
+    get_job_store().create(job)
+    ensure_workers()
+    return public_view(job)
+
+
+def get_gold_job(job_id):
+    job = get_job_store().get(job_id)
+    return public_view(job) if job else None
+
+
+if __name__ == '__main__':
+    # 독립 워커 프로세스 (GOLD_JOB_REDIS_URL과 함께 사용)
+    print(f"Gold job worker started ({type(get_job_store()).__name__})")
+    worker_loop()
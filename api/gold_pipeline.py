@@ -0,0 +1,312 @@
+"""
+황금 키워드 발굴(/api/gold/discover) 파이프라인.
+
+후보 수집 → 검색량 조회/1차 필터 → 문서수 → 점수 필터 → 상위 키워드 섹션 조회 → 순위 순서로 진행하며,
+각 단계를 이벤트(dict)로 내보내는 제너레이터(discover_gold_events)로 구현되어 있습니다.
+스트리밍 응답은 이벤트를 그대로 흘려보내고, 일반 응답은 마지막 'done' 이벤트의
+결과만 사용합니다.
+
+이벤트 형식:
+    {'event': 'stage', 'stage': 'candidates' | 'volumes' | 'docs' | 'filter' | 'enrich', ...}
+    {'event': 'progress', 'stage': 'docs' | 'enrich', 'done': int, 'total': int}
+    {'event': 'keyword', 'item': {...}}       # 필터를 통과해 플랫폼까지 조회된 키워드, 끝나는 대로
+    {'event': 'done', 'results': [...], 'counters': {...}}  # 점수순 최종 순위와 단계별 처리 수
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from naver_service import (
+    get_realtime_keywords, get_google_trending_keywords, get_search_volumes_for_keywords,
+    get_keyword_info, get_naver_section_order
+)
+from async_service import run_async, gather_related_keywords_from_ad_api
+from candidate_planner import CandidatePlan, GOLD_CALL_BUDGET
+from scoring import score_keywords
+
+# Broad Popular Seeds (The "Big Net" Strategy)
+POPULAR_SEEDS = [
+    "인기검색어", "베스트셀러", "요즘뜨는것", "선물추천",
+    "가볼만한곳", "데이트코스", "축제", "전시회", "캠핑",
+    "점심메뉴", "반찬", "간식", "야식",
+    "편의점신상", "다이소꿀템", "올리브영추천"
+]
+MIN_GOLD_VOLUME = 1000
+GOLD_MIN_SCORE = 0.1
+GOLD_MAX_DOCS = 50000
+GOLD_RESULT_LIMIT = 20
+GOLD_SCORING_WORKERS = 10
+# 섹션(플랫폼) 조회는 필터를 통과한 점수 상위 K개에만
+GOLD_ENRICH_TOP_K = GOLD_RESULT_LIMIT
+# 아직 플랫폼을 조회하지 않은 행
+NOT_ENRICHED = "-"
+
+
+def collect_gold_candidates():
+    """
+    실시간/트렌드 키워드와 인기 시드의 연관 키워드를 모읍니다.
+    Returns: { keyword: {'volume': 시드 응답의 검색량 또는 None, 'trending': bool} }
+    """
+    candidates = {}
+
+    def add(kwd, volume=None, trending=False):
+        info = candidates.setdefault(kwd, {'volume': None, 'trending': False})
+        if volume is not None:
+            info['volume'] = volume
+        info['trending'] = info['trending'] or trending
+
+    # 1. Realtime/Trending Keywords
+    try:
+        realtime = get_realtime_keywords()
+        if realtime:
+            print(f"Source: Naver Realtime ({len(realtime)})")
+            for kw in realtime:
+                add(kw['keyword'], trending=True)  # Mark as trending
+    except Exception as e:
+        print(f"Realtime fetch error: {e}")
+
+    try:
+        google_trends = get_google_trending_keywords(limit=20)
+        if google_trends:
+            print(f"Source: Google Trends ({len(google_trends)})")
+            for kw in google_trends:
+                add(kw['keyword'], trending=True)  # Mark as trending
+    except Exception as e:
+        print(f"Google trends fetch error: {e}")
+
+    # 2. Fetch related keywords for each broad seed (all seeds in flight at once)
+    seed_results = run_async(gather_related_keywords_from_ad_api(POPULAR_SEEDS))
+    for popular_seed in POPULAR_SEEDS:
+        items = seed_results.get(popular_seed)
+        if items:
+            # Take top 20 by volume from each seed
+            # Filter: Volume >= 1000 to ensure quality candidates
+            sorted_items = sorted(items, key=lambda x: x.get('total', 0), reverse=True)
+            for item in sorted_items[:20]:
+                if item.get('total', 0) >= MIN_GOLD_VOLUME:
+                    add(item['keyword'], volume=item['total'])
+
+    print(f"Total unique candidates collected: {len(candidates)}")
+    return candidates
+
+
+def qualify_candidates(candidate_list, vol_map):
+    """
+    검색량이 충분한(MIN_GOLD_VOLUME 이상) 후보만 (keyword, vol_info)로 남깁니다.
+    """
+    qualified_candidates = []
+    for kwd in candidate_list:
+        kwd_key = kwd.replace(" ", "")
+        vol_info = vol_map.get(kwd_key, {})
+        total_vol = vol_info.get('total', 0)
+        pc_vol = vol_info.get('pc', 0)
+        mo_vol = vol_info.get('mobile', 0)
+
+        # STRICT: Only include keywords with HIGH search volume (1000+)
+        if total_vol >= MIN_GOLD_VOLUME and (pc_vol > 0 or mo_vol > 0):
+            qualified_candidates.append((kwd, vol_info))
+            print(f"  ✓ Qualified: {kwd} (PC:{pc_vol}, Mobile:{mo_vol}, Total:{total_vol})")
+        else:
+            print(f"  ✗ Skipped (low vol): {kwd} -> Total:{total_vol}")
+    return qualified_candidates
+
+
+def score_candidates(doc_counts, vol_infos, realtime_set):
+    """
+    문서수를 구한 키워드들을 한 번에 점수/등급을 매깁니다. (플랫폼은 enrich 단계에서 채움)
+    doc_counts: { keyword: 문서수 또는 None(실패) }
+    Returns: { keyword: 점수 행 또는 None }
+    """
+    found = [kwd for kwd, doc_count in doc_counts.items() if doc_count is not None]
+    infos = [vol_infos[kwd] for kwd in found]
+    scored = score_keywords([info.get('total', 0) for info in infos],
+                            [doc_counts[kwd] for kwd in found],
+                            [info.get('comp_idx', 0) for info in infos])
+    scores = scored['score'].tolist()
+    labels = scored['label'].tolist()
+    tiers = scored['tier'].tolist()
+    comps = scored['comp'].tolist()
+
+    rows = dict.fromkeys(doc_counts)
+    for i, kwd in enumerate(found):
+        vol_info = infos[i]
+        rows[kwd] = {
+            "rank": "-",
+            "keyword": kwd,
+            "volume": vol_info.get('total', 0),
+            "pc_vol": vol_info.get('pc', 0),
+            "mo_vol": vol_info.get('mobile', 0),
+            "docs": doc_counts[kwd],
+            "score": round(scores[i], 2),
+            "label": labels[i],
+            "tier": tiers[i],
+            "comp": comps[i],
+            "platform": NOT_ENRICHED,
+            # Determine trend signal based on realtime membership
+            "trend": "🚀 급상승" if kwd in realtime_set else "➡️ 안정"
+        }
+    return rows
+
+
+def fetch_doc_count(kwd):
+    """
+    문서수. 조회에 실패하면 None (0으로 두면 점수가 부풀려져 필터를 잘못 통과합니다)
+    """
+    info = get_keyword_info(kwd)
+    if 'error' in info:
+        return None
+    return info.get('total', 0)
+
+
+def fetch_primary_platform(kwd):
+    """
+    모바일 검색 결과의 첫 번째 섹션. SERP 두 장을 받아 파싱하므로 파이프라인에서 가장 비싼 단계입니다.
+    """
+    try:
+        sections = get_naver_section_order(kwd)
+        # Correctly access the first section from mobile preferences
+        mo_sections = sections.get('mobile', [])
+        if mo_sections:
+            return mo_sections[0]
+    except Exception as ex:
+        print(f"Platform analysis failed for {kwd}: {ex}")
+    return NOT_ENRICHED
+
+
+def is_gold(res, seed):
+    # STRICT FILTERS: Only truly golden keywords pass through
+    # 1. Not the seed keyword
+    # 2. Score >= 0.1 (high volume / docs ratio)
+    # 3. Docs <= 50,000 (low competition market)
+    return res['keyword'] != seed and res['score'] >= GOLD_MIN_SCORE and res['docs'] <= GOLD_MAX_DOCS
+
+
+def _run_concurrently(func, keywords):
+    """
+    func(keyword)를 GOLD_SCORING_WORKERS개씩 동시에 실행하고 끝나는 순서대로 (keyword, 결과)를 내보냅니다.
+    소비자가 중간에 멈추면(스트리밍 클라이언트 연결 끊김 등) 아직 시작하지 않은 조회는 취소합니다.
+    """
+    if not keywords:
+        return
+    executor = ThreadPoolExecutor(max_workers=GOLD_SCORING_WORKERS)
+    try:
+        futures = {executor.submit(func, kwd): kwd for kwd in keywords}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except Exception as e:
+                print(f"Error in {func.__name__} for {futures[future]}: {e}")
+                yield futures[future], None
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def discover_gold_events(seed='', state=None):
+    """
+    황금 키워드 발굴을 단계별로 진행하면서 단계/진행/결과 이벤트를 차례로 내보냅니다.
+
+    candidates → volumes → docs → filter → enrich → rank
+    싼 단계(검색량, 문서수)로 먼저 거르고, 비싼 섹션 스크래핑(enrich)은 필터를 통과한
+    키워드 중 점수 상위 GOLD_ENRICH_TOP_K개에만 실행합니다. 'keyword' 이벤트는
+    enrich가 끝난 키워드부터 보내며, 단계별 처리 수는 state['counters']에 남습니다.
+
+    state: 중간 결과를 담는 dict (JSON 직렬화 가능). 단계가 끝날 때마다 채워지며
+    (candidates/realtime, qualified, doc_counts → scored), 이미 채워진 단계는 건너뜁니다.
+    검색량 응답 전체(수확한 모든 행)는 볼륨 캐시에 있으므로 state에는 통과한 후보만 남깁니다.
+    scored의 행은 platform이 NOT_ENRICHED가 아니면 enrich까지 끝난 것으로 봅니다.
+    이벤트를 받을 때마다 state를 저장해 두면 중단된 작업을 이어서 실행할 수 있습니다.
+    """
+    state = {} if state is None else state
+    counters = state.setdefault('counters', {})
+
+    # 1. collect + plan - 이미 아는 정보로 후보를 고르고 호출 예산 안에서 유망한 순으로 정렬
+    if 'candidates' not in state:
+        plan = CandidatePlan(collect_gold_candidates(), budget=GOLD_CALL_BUDGET,
+                             min_volume=MIN_GOLD_VOLUME, min_score=GOLD_MIN_SCORE, max_docs=GOLD_MAX_DOCS)
+        print(f"Candidate plan: {plan.summary()}")
+        state['candidates'] = plan.keywords
+        state['realtime'] = plan.trending
+        counters['plan'] = plan.stats
+    realtime_set = set(state['realtime'])
+    counters['candidates'] = len(state['candidates'])
+    yield {'event': 'stage', 'stage': 'candidates', 'count': len(state['candidates'])}
+    if not state['candidates']:
+        yield {'event': 'done', 'results': [], 'counters': counters}
+        return
+
+    # 2. volume
+    candidate_list = state['candidates']
+    if 'qualified' not in state:
+        print(f"Total unique candidates to analyze: {len(candidate_list)}")
+        vol_map = get_search_volumes_for_keywords(candidate_list)
+        print(f"Volume map received for {len(vol_map)} keywords")
+        state['qualified'] = qualify_candidates(candidate_list, vol_map)
+    qualified_candidates = state['qualified']
+    counters['volume_checked'] = len(candidate_list)
+    counters['qualified'] = len(qualified_candidates)
+    yield {'event': 'stage', 'stage': 'volumes', 'count': len(qualified_candidates),
+           'checked': len(candidate_list)}
+
+    # 3. doc count
+    # scored: { keyword: 점수 행 또는 None(실패) } - 이미 구한 키워드는 다시 부르지 않습니다.
+    # doc_counts: 이번 실행에서 받은 문서수. 다 받은 뒤 한 번에 점수를 매기고 scored로 옮깁니다.
+    scored = state.setdefault('scored', {})
+    doc_counts = state.setdefault('doc_counts', {})
+    vol_infos = dict((kwd, vol_info) for kwd, vol_info in qualified_candidates)
+    pending = [kwd for kwd in vol_infos if kwd not in scored and kwd not in doc_counts]
+    done = len(vol_infos) - len(pending)
+    yield {'event': 'stage', 'stage': 'docs', 'count': len(pending)}
+    for kwd, doc_count in _run_concurrently(fetch_doc_count, pending):
+        doc_counts[kwd] = doc_count
+        done += 1
+        yield {'event': 'progress', 'stage': 'docs', 'done': done, 'total': len(vol_infos)}
+    scored.update(score_candidates(doc_counts, vol_infos, realtime_set))
+    del state['doc_counts']
+    counters['doc_lookups'] = len(pending)
+    counters['doc_failed'] = sum(1 for kwd in vol_infos if scored.get(kwd) is None)
+
+    # 4. filter - 점수/문서수 기준을 통과한 키워드만, 점수순
+    survivors = []
+    for kwd in vol_infos:
+        res = scored.get(kwd)
+        if res and is_gold(res, seed):
+            survivors.append(res)
+        elif res:
+            print(f"  ✗ Filtered out: {res['keyword']} (Score:{res['score']}, Docs:{res['docs']})")
+    survivors.sort(key=lambda x: x['score'], reverse=True)
+    top = survivors[:GOLD_ENRICH_TOP_K]
+    counters['survivors'] = len(survivors)
+    yield {'event': 'stage', 'stage': 'filter', 'count': len(survivors), 'enrich': len(top)}
+
+    # 5. enrich platform (top-K only)
+    to_enrich = [res['keyword'] for res in top if res['platform'] == NOT_ENRICHED]
+    yield {'event': 'stage', 'stage': 'enrich', 'count': len(to_enrich)}
+    for res in top:
+        if res['platform'] != NOT_ENRICHED:
+            yield {'event': 'keyword', 'item': res}
+    done = len(top) - len(to_enrich)
+    for kwd, platform in _run_concurrently(fetch_primary_platform, to_enrich):
+        res = scored[kwd]
+        res['platform'] = platform or NOT_ENRICHED
+        done += 1
+        print(f"  ★ Golden Found: {res['keyword']} (Score:{res['score']}, Docs:{res['docs']})")
+        yield {'event': 'keyword', 'item': res}
+        yield {'event': 'progress', 'stage': 'enrich', 'done': done, 'total': len(top)}
+    counters['enriched'] = len(to_enrich)
+    # 필터 전에 섹션을 조회하던 방식과 비교해 아낀 SERP 조회(키워드당 PC+모바일 2회)
+    counters['serp_fetches_saved'] = 2 * (len(vol_infos) - len(top))
+
+    # 6. rank - GOLD_ENRICH_TOP_K를 결과 수보다 작게 잡으면 나머지는 플랫폼 없이("-") 포함됩니다.
+    results = survivors[:GOLD_RESULT_LIMIT]
+    print(f"Discovery complete. Found {len(survivors)} items, enriched {len(to_enrich)}. {counters}")
+    yield {'event': 'done', 'results': results, 'counters': counters}
+
+
+def discover_gold_keywords(seed=''):
+    """
+    스트리밍 없이 최종 순위만 필요할 때. Returns: list (최대 GOLD_RESULT_LIMIT개)
+    """
+    results = []
+    for event in discover_gold_events(seed):
+        if event['event'] == 'done':
+            results = event['results']
+    return results
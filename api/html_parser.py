@@ -0,0 +1,60 @@
+"""
+BeautifulSoup 파서 백엔드 선택.
+
+기본값은 표준 라이브러리 html.parser입니다. lxml(pip install lxml)은 HTML_PARSER로 켤 수
+있지만, 합성 SERP 픽스처의 파싱+추출 시간에서 차이가 크지 않았고(benchmark_parsers.py)
+실제 페이지로 측정한 이득이 아직 없어 기본값으로 쓰지 않습니다. 어느 쪽이든 결과는
+BeautifulSoup 객체이므로 CSS 선택자(select/select_one)와 추출 코드는 그대로 사용할 수 있습니다.
+
+설정 (.env):
+    HTML_PARSER   html.parser | lxml  (설치되어 있지 않으면 html.parser)
+"""
+
+import os
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+DEFAULT_PARSER = "html.parser"
+# 벤치마크/테스트에서 비교하는 백엔드
+KNOWN_PARSERS = ("html.parser", "lxml")
+
+_selected = None
+
+
+def parser_available(name):
+    try:
+        BeautifulSoup("<p></p>", name)
+        return True
+    except FeatureNotFound:
+        return False
+
+
+def available_parsers():
+    return [name for name in KNOWN_PARSERS if parser_available(name)]
+
+
+def default_parser():
+    """
+    HTML_PARSER 설정 또는 DEFAULT_PARSER. 한 번 고른 값은 재사용합니다.
+    """
+    global _selected
+    if _selected is None:
+        forced = os.getenv("HTML_PARSER", "").strip()
+        if forced and parser_available(forced):
+            _selected = forced
+        else:
+            if forced:
+                print(f"HTML_PARSER={forced} is not installed, falling back")
+            _selected = DEFAULT_PARSER
+    return _selected
+
+
+def parse_html(markup, parser=None):
+    return BeautifulSoup(markup, parser or default_parser())
+
+
+def html_to_text(markup):
+    """
+    API 응답의 <b> 태그 등을 걷어낸 텍스트. 짧은 조각은 html.parser가 더 가볍습니다.
+    """
+    return BeautifulSoup(markup, 'html.parser').get_text()
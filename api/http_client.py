@@ -0,0 +1,338 @@
+"""
+naver_service의 모든 업스트림 호출이 공유하는 HTTP 전송 계층.
+
+호스트별로 keep-alive 커넥션 풀을 유지하여 매 호출마다 TCP+TLS 핸드셰이크를
+반복하지 않도록 합니다. 기본 타임아웃도 여기서 일괄 적용합니다.
+"""
+
+import asyncio
+import copy
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from rate_limiter import get_limiter
+from resilience import (
+    DEFAULT_RETRY_POLICY, AUTH_FAILURE_STATUS, CircuitOpenError, get_breaker
+)
+from single_flight import SingleFlight, AsyncSingleFlight, request_key
+from fanout import time_left
+
+# (connect, read) 초 단위 기본 타임아웃
+DEFAULT_TIMEOUT = (3.05, 10)
+
+# 호스트별 커넥션 풀 크기
+# /api/related, /api/gold/discover 는 ThreadPoolExecutor(max_workers=10)로 팬아웃하고,
+# 동시에 여러 요청이 들어올 수 있으므로 주요 호스트는 여유 있게 잡습니다.
+POOL_SIZES = {
+    "openapi.naver.com": 32,
+    "api.naver.com": 32,
+    "search.naver.com": 32,
+    "m.search.naver.com": 32,
+    "ac.search.naver.com": 8,
+    "datalab.naver.com": 4,
+    "www.nate.com": 4,
+}
+DEFAULT_POOL_SIZE = 10
+
+# 비동기 클라이언트는 스레드 수와 무관하게 많은 요청을 동시에 유지할 수 있습니다.
+ASYNC_MAX_CONNECTIONS = 200
+ASYNC_MAX_KEEPALIVE = 64
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _build_session():
+    session = requests.Session()
+    # 기존 bare requests.get 과 동일하게 요청 간 쿠키를 공유하지 않습니다.
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    default_adapter = HTTPAdapter(pool_connections=len(POOL_SIZES), pool_maxsize=DEFAULT_POOL_SIZE)
+    session.mount("https://", default_adapter)
+    session.mount("http://", default_adapter)
+
+    for host, size in POOL_SIZES.items():
+        # pool_block=False: 풀이 가득 차면 대기하지 않고 임시 커넥션을 엽니다.
+        session.mount(f"https://{host}/", HTTPAdapter(pool_connections=1, pool_maxsize=size))
+
+    return session
+
+
+def get_session():
+    """
+    프로세스 전역 공유 세션을 반환합니다. (최초 호출 시 생성)
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+# 속도 제한 버킷을 자격증명별로 나누기 위해 참조하는 헤더
+CREDENTIAL_HEADERS = ("X-Naver-Client-Id", "X-API-KEY")
+
+
+def credential_id(headers):
+    for name in CREDENTIAL_HEADERS:
+        if headers and headers.get(name):
+            return headers[name]
+    return None
+
+
+def _record_outcome(breaker, status_code):
+    # 429/4xx는 업스트림이 살아있다는 뜻이므로 실패로 세지 않습니다.
+    if status_code >= 500:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+
+
+def _retry_delay(policy, attempt, response=None):
+    """
+    재시도해야 하면 대기 시간(초)을, 아니면 None을 반환합니다.
+    """
+    if attempt >= policy.max_retries:
+        return None
+    if response is not None and not policy.should_retry(response.status_code):
+        return None
+    return policy.delay(attempt, response)
+
+
+def _deadline_timeout(timeout):
+    """
+    fan_out 작업 안에서 보내는 요청이면 (connect, read) 타임아웃을 작업의 남은 시간으로 줄입니다.
+    마감이 이미 지났으면 보내지 않고 Timeout을 올립니다.
+    """
+    left = time_left()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise requests.exceptions.Timeout("fan-out deadline passed")
+    if isinstance(timeout, tuple):
+        return tuple(min(part, left) for part in timeout)
+    return left if timeout is None else min(timeout, left)
+
+
+def _past_deadline(delay=0):
+    left = time_left()
+    return left is not None and left <= delay
+
+
+def _log_auth_failure(url, response):
+    if response.status_code in AUTH_FAILURE_STATUS:
+        print(f"Auth failure {response.status_code} from {url.split('?')[0]} (not retried)")
+
+
+# 동일한 GET 요청이 동시에 진행 중이면 응답을 공유합니다.
+_flight = SingleFlight()
+_async_flight = AsyncSingleFlight()
+
+
+def _should_coalesce(method, coalesce, kwargs):
+    if coalesce is not None:
+        return coalesce
+    return method.upper() == "GET" and not kwargs.get("stream")
+
+
+def _flight_key(method, url, kwargs):
+    # 헤더에 자격증명을 직접 넣어 보낸 요청은 같은 자격증명끼리만 병합합니다.
+    # 키 풀을 거치는 호출은 키를 고르기 전에 coalesced()로 병합합니다.
+    return request_key(method, url, kwargs.get("params"), credential_id(kwargs.get("headers")))
+
+
+def _response_copy(res):
+    """
+    병합된 응답을 호출자마다 별도 객체로 돌려줍니다.
+    본문(bytes)은 공유하고, 호출자가 바꾸는 encoding/headers는 서로 영향을 주지 않습니다.
+    """
+    clone = copy.copy(res)
+    clone.headers = res.headers.copy()
+    return clone
+
+
+def coalesced(method, url, params, send):
+    """
+    키 풀 위에서 병합합니다. (메서드, URL, 파라미터)가 같은 호출이 진행 중이면 그 응답을 공유하고,
+    아니면 send()가 키를 골라 보냅니다. send 안의 요청은 coalesce=False로 보내야 합니다.
+    키를 고르기 전에 합치므로 대기하는 호출은 키를 잡지도, 사용량을 올리지도 않습니다.
+    """
+    res = _flight.do(request_key(method, url, params), send)
+    return res if res is None else _response_copy(res)
+
+
+async def async_coalesced(method, url, params, send):
+    """
+    coalesced()의 비동기 버전. send는 코루틴 함수입니다.
+    """
+    res = await _async_flight.do(request_key(method, url, params), send)
+    return res if res is None else _response_copy(res)
+
+
+def coalescing_stats():
+    return {"sync": _flight.stats(), "async": _async_flight.stats()}
+
+
+def request(method, url, retry=None, coalesce=None, **kwargs):
+    """
+    공유 세션으로 요청을 보냅니다. timeout을 지정하지 않으면 DEFAULT_TIMEOUT이 적용됩니다.
+    업스트림에 속도 제한이 설정되어 있으면 토큰을 얻을 때까지 기다린 뒤 전송하고,
+    429/5xx/연결 오류는 retry 정책(기본 DEFAULT_RETRY_POLICY)에 따라 재시도합니다.
+    서킷이 열린 업스트림은 CircuitOpenError로 즉시 실패합니다.
+    GET 요청은 기본적으로 single-flight로 병합됩니다. (coalesce=False로 끌 수 있음)
+    """
+    if _should_coalesce(method, coalesce, kwargs):
+        return _response_copy(_flight.do(_flight_key(method, url, kwargs), lambda: _send(method, url, retry, kwargs)))
+    return _send(method, url, retry, kwargs)
+
+
+def _send(method, url, retry, kwargs):
+    timeout = kwargs.pop("timeout", DEFAULT_TIMEOUT)
+    policy = retry or DEFAULT_RETRY_POLICY
+    limiter = get_limiter(url, credential_id(kwargs.get("headers")))
+    breaker = get_breaker(url)
+
+    attempt = 0
+    while True:
+        # 마감이 지났으면 half-open 시험 자리를 차지하기 전에 실패합니다.
+        if _past_deadline():
+            raise requests.exceptions.Timeout("fan-out deadline passed")
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {breaker.name}")
+        recorded = False
+        try:
+            if limiter is not None:
+                limiter.acquire()
+            res = get_session().request(method, url, timeout=_deadline_timeout(timeout), **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if _past_deadline():
+                # 호출한 쪽의 마감이 지난 것이지 업스트림 장애는 아닙니다.
+                raise
+            breaker.record_failure()
+            recorded = True
+            delay = _retry_delay(policy, attempt)
+            if delay is None or _past_deadline(delay):
+                raise
+        except Exception:
+            breaker.record_failure()
+            recorded = True
+            raise
+        else:
+            _record_outcome(breaker, res.status_code)
+            recorded = True
+            delay = _retry_delay(policy, attempt, res)
+            if delay is None or _past_deadline(delay):
+                _log_auth_failure(url, res)
+                return res
+            res.close()
+        finally:
+            if not recorded:
+                # 업스트림 결과 없이 끝난 요청(마감, 중단)은 시험 자리만 돌려줍니다.
+                breaker.release_probe()
+        time.sleep(delay)
+        attempt += 1
+
+
+def http_get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def http_post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+def _to_httpx_timeout(timeout):
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+def open_async_client():
+    """
+    비동기 요청용 httpx.AsyncClient를 생성합니다.
+    httpx가 설치되어 있지 않으면 None을 반환하며, 이 경우 async_request는
+    동기 세션을 스레드에서 실행하는 방식으로 동작합니다.
+    """
+    if httpx is None:
+        return None
+    return httpx.AsyncClient(
+        timeout=_to_httpx_timeout(DEFAULT_TIMEOUT),
+        limits=httpx.Limits(max_connections=ASYNC_MAX_CONNECTIONS, max_keepalive_connections=ASYNC_MAX_KEEPALIVE),
+        follow_redirects=True,
+    )
+
+
+async def async_request(client, method, url, retry=None, coalesce=None, **kwargs):
+    """
+    request()의 비동기 버전. requests와 같은 키워드 인자(params, headers, data, timeout)를 받습니다.
+    """
+    if client is None:
+        return await asyncio.to_thread(request, method, url, retry=retry, coalesce=coalesce, **kwargs)
+    if _should_coalesce(method, coalesce, kwargs):
+        return _response_copy(await _async_flight.do(_flight_key(method, url, kwargs),
+                                                     lambda: _async_send(client, method, url, retry, kwargs)))
+    return await _async_send(client, method, url, retry, kwargs)
+
+
+async def _async_send(client, method, url, retry, kwargs):
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    policy = retry or DEFAULT_RETRY_POLICY
+    limiter = get_limiter(url, credential_id(kwargs.get("headers")))
+    breaker = get_breaker(url)
+    kwargs["timeout"] = _to_httpx_timeout(kwargs["timeout"])
+    kwargs.pop("allow_redirects", None)
+
+    attempt = 0
+    while True:
+        if _past_deadline():
+            raise httpx.TimeoutException("fan-out deadline passed")
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {breaker.name}")
+        recorded = False
+        try:
+            if limiter is not None:
+                await limiter.acquire_async()
+            res = await client.request(method, url, **kwargs)
+        except httpx.TransportError:
+            breaker.record_failure()
+            recorded = True
+            delay = _retry_delay(policy, attempt)
+            if delay is None:
+                raise
+        except Exception:
+            breaker.record_failure()
+            recorded = True
+            raise
+        else:
+            _record_outcome(breaker, res.status_code)
+            recorded = True
+            delay = _retry_delay(policy, attempt, res)
+            if delay is None:
+                _log_auth_failure(url, res)
+                return res
+            await res.aclose()
+        finally:
+            if not recorded:
+                # 취소(CancelledError) 등 결과 없이 끝난 요청은 시험 자리만 돌려줍니다.
+                breaker.release_probe()
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+async def async_http_get(client, url, **kwargs):
+    return await async_request(client, "GET", url, **kwargs)
+
+
+async def async_http_post(client, url, **kwargs):
+    return await async_request(client, "POST", url, **kwargs)
@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 import sys
 import os
@@ -10,20 +10,34 @@ sys.path.append(os.path.dirname(__file__))
 try:
     from naver_service import (
         search_blog, get_api_keys, get_naver_section_order, 
-        get_related_keywords, get_keyword_info, get_blog_rank, 
+        get_related_keywords, get_keyword_infos, get_blog_rank, 
         get_search_volume, get_search_volumes_for_keywords, 
         get_realtime_keywords, search_news, search_shop, 
         search_kin, get_datalab_shopping_trends,
-        get_related_keywords_from_ad_api, get_google_trending_keywords,
+        get_related_keywords_from_ad_api,
         analyze_top_blogs
     )
+    from async_service import (
+        run_async, gather_keyword_infos
+    )
+    from credentials import get_open_api_pool, get_ad_api_pool
+    from fanout import fan_out
+    from doc_count_cache import store_doc_counts
+    from gold_pipeline import discover_gold_events
+    from gold_index import (
+        GOLD_INDEX_QUERY_LIMIT, get_gold_index, discover_from_index, refresh_gold_index,
+        checkpoint_from_index, indexed_gold_keywords, index_scored_rows, GOLD_INDEX_MAX_AGE
+    )
+    from gold_jobs import submit_gold_job, get_gold_job
+    from scoring import competition_rates, shopping_insights
 except ImportError as e:
     print(f"Import Error: {e}")
     # We will handle this in the routes if needed
 
 import re
+import json
+import time
 import email.utils
-from concurrent.futures import ThreadPoolExecutor
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for frontend interaction
@@ -64,13 +78,15 @@ def get_config():
         "search_api": {
             "configured": bool(client_id and client_secret),
             "client_id_exists": bool(client_id),
-            "client_secret_exists": bool(client_secret)
+            "client_secret_exists": bool(client_secret),
+            "key_count": len(get_open_api_pool())
         },
         "ad_api": {
             "configured": bool(ad_license and ad_secret and ad_customer),
             "license_exists": bool(ad_license),
             "secret_exists": bool(ad_secret),
-            "customer_exists": bool(ad_customer)
+            "customer_exists": bool(ad_customer),
+            "key_count": len(get_ad_api_pool())
         },
         "overall_ready": bool(client_id and client_secret and ad_license and ad_secret and ad_customer)
     })
@@ -80,57 +96,102 @@ def realtime():
     keywords = get_realtime_keywords()
     return jsonify(keywords)
 
-@app.route('/api/analyze', methods=['GET'])
-def analyze():
-    keyword = request.args.get('q', '')
-    if not keyword:
-        return jsonify({"error": "Keyword is required"}), 400
-    
-    # 1. Basic Blog Search & Summary
-    blog_result = search_blog(keyword)
-    total_count = blog_result.get('total', 0)
-    
-    vol_data = get_search_volume(keyword)
-    
-    # 2. Section Order
-    section_orders = get_naver_section_order(keyword)
-    
-    # 3. Blog Rank
-    ranks = get_blog_rank(keyword)
-    
+# /api/analyze: 업스트림 호출을 동시에 보내고 전체 마감까지 기다립니다.
+# 섹션 순서는 내부에서 PC/모바일을 SECTION_ORDER_DEADLINE(8초)까지 기다리므로 그보다 조금 길게
+ANALYZE_DEADLINE = 9.0
+ANALYZE_TIMEOUTS = {'blog': 5.0, 'volume': 6.0}
+
+def _require_no_error(result):
+    # search_blog 등은 실패를 {"error": ...}로 돌려주므로 fan_out에서 오류로 집계되도록 예외로 바꿉니다.
+    if isinstance(result, dict) and 'error' in result:
+        raise RuntimeError(result['error'])
+    return result
+
+def build_api_status():
     client_id, client_secret = get_api_keys()
-    
-    return jsonify({
+    return {
+        "naver_search": bool(client_id and client_secret),
+        "naver_ad": bool(os.getenv("NAVER_AD_ACCESS_LICENSE"))
+    }
+
+def build_summary(blog_result, vol_data):
+    total_count = blog_result.get('total', 0)
+    return {
+        "pc": vol_data['pc'] if vol_data else 0,
+        "mobile": vol_data['mobile'] if vol_data else 0,
+        "total_vol": vol_data['total'] if vol_data else 0,
+        "doc_count": total_count,
+        "ratio": (total_count / vol_data['total']) if vol_data and vol_data['total'] > 0 else 0
+    }
+
+def build_difficulty(keyword, blog_outcome, sources):
+    # 블로그 검색 결과를 재사용해 난이도를 계산하고 sources에 상태를 남깁니다.
+    if not blog_outcome.ok:
+        sources['difficulty'] = {"status": "skipped", "error": "blog search unavailable"}
+        return None
+    difficulty = analyze_top_blogs(keyword, count=5, blog_result=blog_outcome.value)
+    sources['difficulty'] = {"status": "error" if 'error' in difficulty else "ok"}
+    return difficulty
+
+def sections_or_marker(outcome):
+    if outcome.ok:
+        return outcome.value
+    marker = "시간 초과" if outcome.status == 'timeout' else "오류 발생"
+    return {"pc": [marker], "mobile": [marker]}
+
+def analyze_keyword(keyword):
+    """
+    블로그 검색, 검색량, 섹션 순서, VIEW 순위를 동시에 가져와 분석 결과를 만듭니다.
+    난이도는 블로그 검색 결과를 재사용해 계산하고, 실패하거나 늦은 소스는
+    sources에 status(ok/error/timeout)로 표시한 채 나머지 결과를 돌려줍니다.
+    """
+    outcomes = fan_out({
+        'blog': lambda: _require_no_error(search_blog(keyword)),
+        'volume': lambda: get_search_volume(keyword),
+        'sections': lambda: get_naver_section_order(keyword),
+        'ranks': lambda: get_blog_rank(keyword)
+    }, ANALYZE_DEADLINE, timeouts=ANALYZE_TIMEOUTS)
+    sources = {name: outcome.meta() for name, outcome in outcomes.items()}
+
+    blog_result = outcomes['blog'].value if outcomes['blog'].ok else {}
+    vol_data = outcomes['volume'].value if outcomes['volume'].ok else None
+    difficulty = build_difficulty(keyword, outcomes['blog'], sources)
+
+    return {
         "keyword": keyword,
-        "api_status": {
-            "naver_search": bool(client_id and client_secret),
-            "naver_ad": bool(os.getenv("NAVER_AD_ACCESS_LICENSE"))
-        },
-        "summary": {
-            "pc": vol_data['pc'] if vol_data else 0,
-            "mobile": vol_data['mobile'] if vol_data else 0,
-            "total_vol": vol_data['total'] if vol_data else 0,
-            "doc_count": total_count,
-            "ratio": (total_count / vol_data['total']) if vol_data and vol_data['total'] > 0 else 0
-        },
-        "sections": section_orders,
-        "blog_ranks": ranks
-    })
+        "api_status": build_api_status(),
+        "summary": build_summary(blog_result, vol_data),
+        "sections": sections_or_marker(outcomes['sections']),
+        "blog_ranks": outcomes['ranks'].value if outcomes['ranks'].ok else [],
+        "difficulty": difficulty,
+        "sources": sources
+    }
 
-@app.route('/api/related', methods=['GET'])
-def related():
+@app.route('/api/analyze', methods=['GET'])
+def analyze():
     keyword = request.args.get('q', '')
     if not keyword:
         return jsonify({"error": "Keyword is required"}), 400
     
+    return jsonify(analyze_keyword(keyword))
+
+def build_related_keywords(keyword, ad_results=None, scraped_keywords=None):
+    """
+    연관 키워드 표(조회수/문서수/비율)를 만듭니다.
+    이미 가져온 광고 API 결과나 스크래핑 결과가 있으면 넘겨받아 다시 호출하지 않습니다.
+    """
     # Normalize keyword for comparison (lowercase, no spaces)
     norm_keyword = keyword.lower().replace(" ", "")
     
     # Use the Ad API to get related keywords and their volumes directly
-    ad_results = get_related_keywords_from_ad_api(keyword)
+    if ad_results is None:
+        ad_results = get_related_keywords_from_ad_api(keyword)
+    # 캐시에 들어 있는 리스트/행을 건드리지 않도록 복사해서 씁니다.
+    ad_results = [dict(item) for item in ad_results]
     
     # Also try scraping for additional keywords if ad api returns limited results
-    scraped_keywords = get_related_keywords(keyword)
+    if scraped_keywords is None:
+        scraped_keywords = get_related_keywords(keyword)
     
     # Merge: Prefer ad API data, add scraped ones that aren't in ad results
     ad_keywords_set = set(item['keyword'].lower().replace(" ", "") for item in ad_results)
@@ -149,7 +210,7 @@ def related():
             keywords_needing_volume.append(sk)
     
     if not ad_results:
-        return jsonify([])
+        return []
     
     # Sort by total volume and take top 30 for processing
     sorted_items = sorted(ad_results, key=lambda x: x['total'], reverse=True)[:30]
@@ -174,15 +235,16 @@ def related():
         
     stat_data = []
     
-    # Now only fetch document counts in parallel (volumes already fetched)
-    def fetch_docs(item):
+    # Now only fetch document counts concurrently (volumes already fetched)
+    doc_infos = run_async(gather_keyword_infos([item['keyword'] for item in sorted_items]))
+    
+    for item in sorted_items:
         kwd = item['keyword']
-        info = get_keyword_info(kwd)
-        docs = info.get('total', 0)
+        docs = doc_infos.get(kwd, {}).get('total', 0)
         total_vol = item['total']
         ratio = (docs / total_vol) if total_vol > 0 else 0
         
-        return {
+        res = {
             "keyword": kwd,
             "pc": item['pc'],
             "mobile": item['mobile'],
@@ -190,25 +252,125 @@ def related():
             "docs": docs,
             "ratio": round(ratio, 4)
         }
-
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        futures = [executor.submit(fetch_docs, item) for item in sorted_items]
-        for future in futures:
-            try:
-                res = future.result()
-                # Only filter exact original keyword match
-                if res['keyword'].lower().replace(" ", "") != norm_keyword:
-                    stat_data.append(res)
-                elif res['total'] > 0:  # Keep original if it has volume data
-                    stat_data.append(res)
-            except Exception as e:
-                print(f"Error fetching docs for related keyword: {e}")
+        # Only filter exact original keyword match
+        if res['keyword'].lower().replace(" ", "") != norm_keyword:
+            stat_data.append(res)
+        elif res['total'] > 0:  # Keep original if it has volume data
+            stat_data.append(res)
                 
     # Re-sort by total volume for final output
     stat_data.sort(key=lambda x: x['total'], reverse=True)
-    return jsonify(stat_data)
+    return stat_data
 
+# /api/report: 대시보드에 필요한 결과를 한 번의 요청으로 만듭니다.
+REPORT_PARTS = ('summary', 'sections', 'ranks', 'difficulty', 'related', 'blog')
+REPORT_DEADLINE = 15.0
 
+def parse_report_parts(raw):
+    """
+    parts=summary,sections,... 를 집합으로 바꿉니다. 비어 있으면 전체, 모르는 이름은 ValueError.
+    """
+    if not raw:
+        return set(REPORT_PARTS)
+    parts = {part.strip() for part in raw.split(',') if part.strip()}
+    unknown = parts - set(REPORT_PARTS)
+    if unknown:
+        raise ValueError(f"Unknown parts: {', '.join(sorted(unknown))}")
+    return parts
+
+def build_report(keyword, parts):
+    """
+    요청한 parts에 필요한 업스트림만 한 번씩 호출하고 그 결과를 여러 part가 나눠 씁니다.
+    - 블로그 검색 1회: summary의 문서수, difficulty, blog 목록, 연관 키워드 표의 원 키워드 문서수
+    - keywordstool 1회: 연관 키워드 목록과 원 키워드 검색량(볼륨 캐시에 함께 저장됨)
+    - SERP는 fetch_serp 캐시/single-flight로 섹션, 순위, 연관 검색어가 공유
+    """
+    start = time.monotonic()
+    wants_blog = bool(parts & {'summary', 'difficulty', 'blog'})
+    wants_ad = bool(parts & {'summary', 'related'})
+
+    def ad_lookup():
+        # 연관 키워드를 먼저 가져오면 원 키워드 행도 볼륨 캐시에 들어가 get_search_volume이 캐시로 끝납니다.
+        ad_results = get_related_keywords_from_ad_api(keyword) if 'related' in parts else None
+        volume = get_search_volume(keyword) if 'summary' in parts else None
+        return {'ad_results': ad_results, 'volume': volume}
+
+    tasks = {}
+    if wants_blog:
+        tasks['blog'] = lambda: _require_no_error(search_blog(keyword))
+    if wants_ad:
+        tasks['ad'] = ad_lookup
+    if 'related' in parts:
+        tasks['scraped'] = lambda: get_related_keywords(keyword)
+    if 'sections' in parts:
+        tasks['sections'] = lambda: get_naver_section_order(keyword)
+    if 'ranks' in parts:
+        tasks['ranks'] = lambda: get_blog_rank(keyword)
+
+    outcomes = fan_out(tasks, REPORT_DEADLINE)
+    sources = {name: outcome.meta() for name, outcome in outcomes.items()}
+
+    blog_outcome = outcomes.get('blog')
+    blog_result = blog_outcome.value if blog_outcome and blog_outcome.ok else {}
+    if blog_result:
+        store_doc_counts({keyword: blog_result.get('total', 0)})
+    ad = outcomes['ad'].value if 'ad' in outcomes and outcomes['ad'].ok else {}
+
+    report = {"keyword": keyword, "parts": [part for part in REPORT_PARTS if part in parts]}
+    if 'summary' in parts:
+        report['api_status'] = build_api_status()
+        report['summary'] = build_summary(blog_result, ad.get('volume'))
+    if 'sections' in parts:
+        report['sections'] = sections_or_marker(outcomes['sections'])
+    if 'ranks' in parts:
+        report['blog_ranks'] = outcomes['ranks'].value if outcomes['ranks'].ok else []
+    if 'difficulty' in parts:
+        report['difficulty'] = build_difficulty(keyword, blog_outcome, sources)
+    if 'blog' in parts:
+        report['blog'] = clean_search_items(blog_result)
+    if 'related' in parts:
+        # 조회수 보충/문서수 조회는 남은 시간 안에서만 기다립니다.
+        scraped = outcomes['scraped'].value if outcomes['scraped'].ok else []
+        remaining = max(0.0, REPORT_DEADLINE - (time.monotonic() - start))
+        related_outcome = fan_out({
+            'related': lambda: build_related_keywords(keyword, ad.get('ad_results') or [], scraped)
+        }, remaining)['related']
+        sources['related'] = related_outcome.meta()
+        report['related'] = related_outcome.value if related_outcome.ok else []
+
+    report['sources'] = sources
+    return report
+
+@app.route('/api/report', methods=['GET'])
+def report():
+    keyword = request.args.get('q', '')
+    if not keyword:
+        return jsonify({"error": "Keyword is required"}), 400
+    try:
+        parts = parse_report_parts(request.args.get('parts', ''))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    return jsonify(build_report(keyword, parts))
+
+@app.route('/api/related', methods=['GET'])
+def related():
+    keyword = request.args.get('q', '')
+    if not keyword:
+        return jsonify({"error": "Keyword is required"}), 400
+    
+    return jsonify(build_related_keywords(keyword))
+
+
+
+def clean_search_items(res):
+    # Clean data
+    items = res.get('items', [])
+    cleaned_items = []
+    for item in items:
+        cleaned_item = {k: remove_html_tags(str(v)) if isinstance(v, str) else v for k, v in item.items()}
+        cleaned_items.append(cleaned_item)
+    return cleaned_items
 
 @app.route('/api/search', methods=['GET'])
 def search():
@@ -229,14 +391,7 @@ def search():
     else:
         return jsonify({"error": "Invalid search type"}), 400
         
-    # Clean data
-    items = res.get('items', [])
-    cleaned_items = []
-    for item in items:
-        cleaned_item = {k: remove_html_tags(str(v)) if isinstance(v, str) else v for k, v in item.items()}
-        cleaned_items.append(cleaned_item)
-        
-    return jsonify(cleaned_items)
+    return jsonify(clean_search_items(res))
 
 @app.route('/api/trends/shopping', methods=['GET'])
 def shopping_trends():
@@ -248,28 +403,22 @@ def shopping_trends():
         
     keywords = [t['keyword'] for t in trends]
     vol_map = get_search_volumes_for_keywords(keywords)
+    doc_infos = get_keyword_infos(keywords)
+    
+    volumes = [vol_map.get(kwd.replace(" ", ""), {}).get('total', 0) for kwd in keywords]
+    docs = [doc_infos.get(kwd, {}).get('total', 0) for kwd in keywords]
+    ratios = competition_rates(volumes, docs)
+    insights = shopping_insights(volumes, docs)
     
     shop_trend_data = []
-    for t in trends:
-        kwd = t['keyword']
-        vol_info = vol_map.get(kwd.replace(" ", ""), {})
-        total_vol = vol_info.get('total', 0)
-        
-        info = get_keyword_info(kwd)
-        doc_count = info.get('total', 0)
-        
-        ratio = (doc_count / total_vol) if total_vol > 0 else 999
-        
-        insight = "💎 블루오션" if doc_count < 1000 and total_vol > 10000 else \
-                  "✨ 해볼만함" if doc_count < 5000 and total_vol > 5000 else "🔥 레드오션"
-            
+    for i, t in enumerate(trends):
         shop_trend_data.append({
             "rank": t['rank'],
-            "keyword": kwd,
-            "volume": total_vol,
-            "docs": doc_count,
-            "ratio": round(ratio, 4),
-            "insight": insight
+            "keyword": t['keyword'],
+            "volume": volumes[i],
+            "docs": docs[i],
+            "ratio": round(float(ratios[i]), 4),
+            "insight": str(insights[i])
         })
         
     return jsonify(shop_trend_data)
@@ -287,197 +436,96 @@ def get_difficulty():
     result = analyze_top_blogs(keyword, count=5)
     return jsonify(result)
 
+# stream=sse|ndjson 이면 진행 상황과 키워드를 분석되는 대로 흘려보냅니다.
+GOLD_STREAM_FORMATS = {
+    'sse': 'text/event-stream',
+    'ndjson': 'application/x-ndjson'
+}
+
+def format_gold_event(event, fmt):
+    data = json.dumps(event, ensure_ascii=False)
+    if fmt == 'sse':
+        return f"event: {event['event']}\ndata: {data}\n\n"
+    return data + "\n"
+
+def stream_gold_events(seed, fmt):
+    try:
+        # 인덱스의 신선한 황금 키워드를 먼저 보내고, 파이프라인은 그 행을 체크포인트로 재사용해
+        # 오래됐거나 새로 등장한 후보만 분석합니다.
+        sent = {}
+        for res in indexed_gold_keywords(seed, max_age=GOLD_INDEX_MAX_AGE):
+            sent[res['keyword']] = res['platform']
+            yield format_gold_event({'event': 'keyword', 'item': res}, fmt)
+        state, reused = checkpoint_from_index()
+        for event in discover_gold_events(seed, state):
+            if event['event'] == 'keyword' and sent.get(event['item']['keyword']) == event['item']['platform']:
+                continue  # 이미 보낸 행 그대로
+            if event['event'] == 'done':
+                index_scored_rows(state, skip=reused)
+            yield format_gold_event(event, fmt)
+    except Exception as e:
+        print(f"ERROR in gold_discover stream: {e}")
+        traceback.print_exc()
+        yield format_gold_event({'event': 'error', 'error': str(e)}, fmt)
+
 @app.route('/api/gold/discover', methods=['GET'])
 def gold_discover():
-    try:
-        # Ignore user input, strictly use Popular/Trending sources
-        user_seed = request.args.get('q', '')
-        seed = user_seed # For compatibility with existing logic
-        print(f"Popular Discovery requested. (User input '{seed}' ignored)")
-        
-        candidates = set()
-        realtime_set = set()  # Track which keywords are from realtime/trending sources
-        
-        # 1. Realtime/Trending Keywords
-        try:
-            realtime = get_realtime_keywords()
-            if realtime:
-                print(f"Source: Naver Realtime ({len(realtime)})")
-                for kw in realtime:
-                    candidates.add(kw['keyword'])
-                    realtime_set.add(kw['keyword'])  # Mark as trending
-        except Exception as e:
-            print(f"Realtime fetch error: {e}")
-
-        try:
-            google_trends = get_google_trending_keywords(limit=20)
-            if google_trends:
-                print(f"Source: Google Trends ({len(google_trends)})")
-                for kw in google_trends:
-                    candidates.add(kw['keyword'])
-                    realtime_set.add(kw['keyword'])  # Mark as trending
-        except Exception as e:
-            print(f"Google trends fetch error: {e}")
-
-        # 2. Broad Popular Seeds (The "Big Net" Strategy)
-        POPULAR_SEEDS = [
-            "인기검색어", "베스트셀러", "요즘뜨는것", "선물추천", 
-            "가볼만한곳", "데이트코스", "축제", "전시회", "캠핑",
-            "점심메뉴", "반찬", "간식", "야식",
-            "편의점신상", "다이소꿀템", "올리브영추천" 
-        ]
-        
-        # Fetch related keywords for each broad seed
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            # Helper to fetch ad keywords
-            def fetch_ad_candidates(seed):
-                try:
-                    return get_related_keywords_from_ad_api(seed)
-                except:
-                    return []
-
-            futures = [executor.submit(fetch_ad_candidates, s) for s in POPULAR_SEEDS]
-            for future in futures:
-                items = future.result()
-                if items:
-                    # Take top 20 by volume from each seed
-                    # Filter: Volume >= 1000 to ensure quality candidates
-                    sorted_items = sorted(items, key=lambda x: x.get('total', 0), reverse=True)
-                    for item in sorted_items[:20]:
-                        if item.get('total', 0) >= 1000:
-                            candidates.add(item['keyword'])
-                            
-        print(f"Total unique candidates collected: {len(candidates)}")
-        
-        if not candidates:
-            return jsonify([])
-
-        # 3. Analyze Candidates (Limit to top 100 for performance)
-        candidate_list = list(candidates)[:100]
-        print(f"Total unique candidates to analyze: {len(candidate_list)}")
-        vol_map = get_search_volumes_for_keywords(candidate_list)
-        print(f"Volume map received for {len(vol_map)} keywords")
-        
-        # 3. Filter candidates with HIGH volume (1000+ total) - First stage filter
-        qualified_candidates = []
-        for kwd in candidate_list:
-            kwd_key = kwd.replace(" ", "")
-            vol_info = vol_map.get(kwd_key, {})
-            total_vol = vol_info.get('total', 0)
-            pc_vol = vol_info.get('pc', 0)
-            mo_vol = vol_info.get('mobile', 0)
-            
-            # STRICT: Only include keywords with HIGH search volume (1000+)
-            if total_vol >= 1000 and (pc_vol > 0 or mo_vol > 0):
-                qualified_candidates.append((kwd, vol_info))
-                print(f"  ✓ Qualified: {kwd} (PC:{pc_vol}, Mobile:{mo_vol}, Total:{total_vol})")
-            else:
-                print(f"  ✗ Skipped (low vol): {kwd} -> Total:{total_vol}")
-
-        # 4. Fetch documentation counts in parallel
-        def fetch_full_info(kwd, vol_info):
-            try:
-                vol = vol_info.get('total', 0)
-                pc_vol = vol_info.get('pc', 0)
-                mo_vol = vol_info.get('mobile', 0)
-                comp_idx = vol_info.get('comp_idx', 0)
-                
-                info = get_keyword_info(kwd)
-                doc_count = info.get('total', 0)
-                score = vol / (doc_count + 1)
-                
-                # Identify Primary Platform (Try to get it, but don't fail if it hangs)
-                primary_platform = "-"
-                try:
-                    sections = get_naver_section_order(kwd)
-                    # Correctly access the first section from mobile preferences
-                    mo_sections = sections.get('mobile', [])
-                    if mo_sections:
-                        primary_platform = mo_sections[0]
-                except Exception as ex:
-                    print(f"Platform analysis failed for {kwd}: {ex}")
-                
-                # Map Competition Index to Label
-                if isinstance(comp_idx, (int, float)):
-                    if comp_idx < 30: comp_label = "낮음"
-                    elif comp_idx < 70: comp_label = "중간"
-                    else: comp_label = "높음"
-                else:
-                    comp_label = str(comp_idx)
-
-                # STRICT Tier Definitions - Only truly golden keywords get good labels
-                if doc_count < 1000 and score >= 5.0:
-                    label, tier = "💎 종결", "ultra"
-                elif doc_count < 5000 and score >= 1.0:
-                    label, tier = "🏆 황금", "golden"
-                elif doc_count < 20000 and score >= 0.3:
-                    label, tier = "✅ 추천", "good"
-                else:
-                    label, tier = "평범", "normal"
-                    
-                # Determine trend signal based on realtime membership
-                if kwd in realtime_set:
-                    trend_signal = "🚀 급상승"
-                else:
-                    trend_signal = "➡️ 안정"
-                    
-                return {
-                    "rank": "-",
-                    "keyword": kwd,
-                    "volume": vol,
-                    "pc_vol": pc_vol,
-                    "mo_vol": mo_vol,
-                    "docs": doc_count,
-                    "score": round(score, 2),
-                    "label": label,
-                    "tier": tier,
-                    "comp": comp_label,
-                    "platform": primary_platform,
-                    "trend": trend_signal
-                }
-            except Exception as e:
-                print(f"Error in fetch_full_info for {kwd}: {e}")
-                return None
-
-        results = []
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            # Use vol_info directly from qualified_candidates tuple
-            future_to_kwd = [executor.submit(fetch_full_info, kwd, vol_info) 
-                             for kwd, vol_info in qualified_candidates]
-            for future in future_to_kwd:
-                try:
-                    res = future.result()
-                    # STRICT FILTERS: Only truly golden keywords pass through
-                    # 1. Not the seed keyword
-                    # 2. Score >= 0.1 (high volume / docs ratio)
-                    # 3. Docs <= 50,000 (low competition market)
-                    if res and res['keyword'] != seed and res['score'] >= 0.1 and res['docs'] <= 50000: 
-                        results.append(res)
-                        print(f"  ★ Golden Found: {res['keyword']} (Score:{res['score']}, Docs:{res['docs']})")
-                    elif res:
-                        print(f"  ✗ Filtered out: {res['keyword']} (Score:{res['score']}, Docs:{res['docs']})")
-                except Exception as e:
-                    print(f"Error fetching docs: {e}")
-        
-        # Sort by score descending before checking count
-        results.sort(key=lambda x: x['score'], reverse=True)
-        print(f"Discovery complete. Found {len(results)} TRUE golden keywords.")
-        
-        if len(results) < 5:
-            print("Results < 5, but fallback logic is deprecated for Popular Discovery mode.")
-            
+    # Ignore user input, strictly use Popular/Trending sources
+    user_seed = request.args.get('q', '')
+    seed = user_seed # For compatibility with existing logic
+    print(f"Popular Discovery requested. (User input '{seed}' ignored)")
 
+    fmt = request.args.get('stream', '')
+    if fmt:
+        if fmt not in GOLD_STREAM_FORMATS:
+            return jsonify({"error": "Invalid stream format"}), 400
+        return Response(stream_with_context(stream_gold_events(seed, fmt)),
+                        mimetype=GOLD_STREAM_FORMATS[fmt],
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
-        # 5. Final Sort by Score (Volume/Docs) Descending
-        results.sort(key=lambda x: x['score'], reverse=True)
-        
-        print(f"Discovery complete. Found {len(results)} items.")
-        return jsonify(results[:20]) # Return top 20
+    try:
+        # 기본은 인덱스에서 바로 응답 (오래된 행은 갱신 작업 등록), refresh=1이면 지금 다시 분석
+        if request.args.get('refresh') == '1':
+            return jsonify(refresh_gold_index(seed)) # Return top 20
+        # 인덱스가 비어 있으면 기본은 지금 분석, async=1이면 갱신 작업만 등록하고 바로 응답
+        results, refresh_job = discover_from_index(seed, wait=request.args.get('async') != '1')
+        if refresh_job and not results:
+            # 콜드 스타트(async=1): 인덱스를 채우는 작업의 진행 상황은 Location에서 확인
+            return jsonify(results), 202, {'Location': f"/api/gold/jobs/{refresh_job['id']}"}
+        return jsonify(results) # Return top 20
     except Exception as e:
         print(f"ERROR in gold_discover: {e}")
-        import traceback
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/gold/index', methods=['GET'])
+def gold_index_query():
+    """
+    인덱스 조회. tier=ultra,golden & min_volume & max_docs & platform & limit (점수 내림차순)
+    """
+    tiers = [tier for tier in request.args.get('tier', '').split(',') if tier]
+    min_volume = request.args.get('min_volume', type=int)
+    max_docs = request.args.get('max_docs', type=int)
+    # 음수 limit은 SQLite에서 LIMIT -1(전체)이 되므로 1 이상으로 맞춥니다.
+    limit = max(1, min(request.args.get('limit', 20, type=int), GOLD_INDEX_QUERY_LIMIT))
+    index = get_gold_index()
+    items = index.query(tiers=tiers, min_volume=min_volume, max_docs=max_docs,
+                        platform=request.args.get('platform') or None, limit=limit)
+    return jsonify({"items": items, **index.stats()})
+
+@app.route('/api/gold/jobs', methods=['POST'])
+def create_gold_job():
+    payload = request.get_json(silent=True) or {}
+    seed = payload.get('q', request.args.get('q', ''))
+    job = submit_gold_job(seed)
+    return jsonify({"job_id": job['id'], "status": job['status']}), 202
+
+@app.route('/api/gold/jobs/<job_id>', methods=['GET'])
+def gold_job_status(job_id):
+    job = get_gold_job(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
+
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
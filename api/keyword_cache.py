@@ -0,0 +1,195 @@
+"""
+키워드 단위 2단 캐시: 프로세스 내 LRU(hot) + SQLite 영구 저장소.
+
+검색광고 API의 월간 조회수처럼 자주 바뀌지 않는 값을 저장합니다.
+키는 normalize_keyword()로 정규화(공백 제거 + 소문자)하며, get_many/put_many로
+100개 키워드 조회를 캐시 1회 스캔 + 미스분만 업스트림 호출로 바꿀 수 있습니다.
+
+설정 (.env):
+    KEYWORD_CACHE_DB   SQLite 파일 경로 (기본: 임시 디렉터리/keyword_cache.sqlite3, "off"면 메모리만 사용)
+    VOLUME_CACHE_TTL   검색량 캐시 유효 시간(초, 기본 7일)
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_DB_PATH = os.path.join(tempfile.gettempdir(), "keyword_cache.sqlite3")
+# SQLite IN (...) 절 하나에 넣을 키 개수
+_SQL_BATCH = 500
+
+
+def normalize_keyword(keyword):
+    return keyword.replace(" ", "").lower()
+
+
+def _db_path():
+    return os.getenv("KEYWORD_CACHE_DB", DEFAULT_DB_PATH).strip()
+
+
+class TieredCache:
+    def __init__(self, name, ttl, max_memory_items=5000, max_disk_items=200000, db_path=None):
+        self.name = name
+        self.ttl = ttl
+        self.max_memory_items = max_memory_items
+        self.max_disk_items = max_disk_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._db_lock = threading.Lock()
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+        self._open_db(db_path or _db_path())
+
+    # --- SQLite tier -------------------------------------------------------
+
+    def _open_db(self, path):
+        if not path or path.lower() == "off":
+            return
+        try:
+            db = sqlite3.connect(path, check_same_thread=False, timeout=5)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(f"CREATE TABLE IF NOT EXISTS {self.name} ("
+                       "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                       "expires_at REAL NOT NULL, updated_at REAL NOT NULL)")
+            db.execute(f"CREATE INDEX IF NOT EXISTS {self.name}_updated ON {self.name}(updated_at)")
+            db.commit()
+            self._db = db
+        except sqlite3.Error as e:
+            print(f"Cache DB unavailable ({path}), using memory only: {e}")
+
+    def _disk_get_many(self, keys, now):
+        found = {}
+        if self._db is None or not keys:
+            return found
+        with self._db_lock:
+            for i in range(0, len(keys), _SQL_BATCH):
+                batch = keys[i:i + _SQL_BATCH]
+                rows = self._db.execute(
+                    f"SELECT key, value, expires_at FROM {self.name} "
+                    f"WHERE key IN ({','.join('?' * len(batch))}) AND expires_at > ?",
+                    (*batch, now)).fetchall()
+                for key, value, expires_at in rows:
+                    found[key] = (expires_at, json.loads(value))
+        return found
+
+    def _disk_put_many(self, entries, now):
+        if self._db is None or not entries:
+            return
+        with self._db_lock:
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO {self.name} (key, value, expires_at, updated_at) VALUES (?, ?, ?, ?)",
+                [(key, json.dumps(value, ensure_ascii=False), expires_at, now)
+                 for key, (expires_at, value) in entries.items()])
+            self._evict_disk(now)
+            self._db.commit()
+
+    def _evict_disk(self, now):
+        self._db.execute(f"DELETE FROM {self.name} WHERE expires_at <= ?", (now,))
+        count = self._db.execute(f"SELECT COUNT(*) FROM {self.name}").fetchone()[0]
+        overflow = count - self.max_disk_items
+        if overflow > 0:
+            self._db.execute(
+                f"DELETE FROM {self.name} WHERE key IN "
+                f"(SELECT key FROM {self.name} ORDER BY updated_at LIMIT ?)", (overflow,))
+
+    # --- memory tier -------------------------------------------------------
+
+    def _memory_put(self, key, expires_at, value):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    # --- public API --------------------------------------------------------
+
+    def get(self, key):
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys):
+        """
+        { key: value } 형태로 캐시에 있는(만료되지 않은) 항목만 반환합니다.
+        """
+        now = time.time()
+        found = {}
+        missing = []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                entry = self._memory.get(key)
+                if entry is not None and entry[0] > now:
+                    self._memory.move_to_end(key)
+                    found[key] = entry[1]
+                    self.hits["memory"] += 1
+                else:
+                    if entry is not None:
+                        del self._memory[key]
+                    missing.append(key)
+
+        disk = self._disk_get_many(missing, now)
+        with self._lock:
+            for key, (expires_at, value) in disk.items():
+                self._memory_put(key, expires_at, value)
+                found[key] = value
+            self.hits["disk"] += len(disk)
+            self.misses += len(missing) - len(disk)
+        return found
+
+    def put(self, key, value, ttl=None):
+        self.put_many({key: value}, ttl)
+
+    def put_many(self, items, ttl=None):
+        """
+        items: { key: value }. ttl을 생략하면 캐시 기본 TTL을 사용합니다.
+        """
+        if not items:
+            return
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        entries = {key: (expires_at, value) for key, value in items.items()}
+        with self._lock:
+            for key, (exp, value) in entries.items():
+                self._memory_put(key, exp, value)
+        try:
+            self._disk_put_many(entries, now)
+        except sqlite3.Error as e:
+            print(f"Cache write error ({self.name}): {e}")
+
+    def delete(self, key):
+        with self._lock:
+            self._memory.pop(key, None)
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute(f"DELETE FROM {self.name} WHERE key = ?", (key,))
+                self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute(f"DELETE FROM {self.name}")
+                self._db.commit()
+
+    def stats(self):
+        disk_items = None
+        if self._db is not None:
+            with self._db_lock:
+                disk_items = self._db.execute(f"SELECT COUNT(*) FROM {self.name}").fetchone()[0]
+        return {
+            "name": self.name,
+            "memory_items": len(self._memory),
+            "disk_items": disk_items,
+            "hits": dict(self.hits),
+            "misses": self.misses
+        }
+
+
+# 검색광고 API 결과 캐시 (월 단위로 갱신되는 값이므로 기본 7일)
+VOLUME_CACHE_TTL = float(os.getenv("VOLUME_CACHE_TTL", str(7 * 24 * 3600)))
+
+volume_cache = TieredCache("keyword_volumes", VOLUME_CACHE_TTL)
+related_ad_cache = TieredCache("related_ad_keywords", VOLUME_CACHE_TTL, max_memory_items=500, max_disk_items=20000)
@@ -2,7 +2,6 @@ import os
 import requests
 import json
 from dotenv import load_dotenv, find_dotenv
-from bs4 import BeautifulSoup
 import time
 import hmac
 import hashlib
@@ -11,6 +10,19 @@ import re
 from datetime import datetime, timedelta
 import xml.etree.ElementTree as ET
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from http_client import http_get, http_post, coalesced
+from rate_limiter import burst_size
+from credentials import get_open_api_pool, get_ad_api_pool
+from keyword_cache import volume_cache, related_ad_cache, normalize_keyword
+from volume_planner import VolumePlan, VOLUME_FIELDS, clean_hint_keyword, mark_absent, is_complete_volume
+from doc_count_cache import lookup_doc_counts, store_doc_counts
+from serp import RELATED_STOP_WORDS, fetch_serp
+from html_parser import html_to_text
+from fanout import fan_out
+from scoring import competition_rates
+
 load_dotenv()
 
 def get_realtime_keywords():
@@ -22,7 +34,7 @@ def get_realtime_keywords():
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
-        res = requests.get(url, headers=headers)
+        res = http_get(url, headers=headers)
         res.encoding = 'euc-kr'
         
         data = json.loads(res.text)
@@ -39,100 +51,99 @@ def get_realtime_keywords():
         print(f"Realtime keywords error: {e}")
         return []
 
-def get_related_keywords(keyword):
-    """
-    네이버 통합검색(PC/모바일) 및 자동완성 API를 종합하여 관련 키워드를 추출합니다.
-    """
-    keywords = set()
-    
-    # 1. 네이버 자동완성 API (기본 성능 보장)
-    try:
-        ac_url = "https://ac.search.naver.com/nx/ac"
-        ac_params = {
-            "q": keyword, "con": "0", "frm": "nv", "ans": "2",
-            "r_format": "json", "r_enc": "UTF-8", "rev": "4",
-            "q_enc": "UTF-8", "st": "100"
-        }
-        res_ac = requests.get(ac_url, params=ac_params, timeout=5)
-        if res_ac.status_code == 200:
-            ac_data = res_ac.json()
-            for group in ac_data.get('items', []):
-                for item in group:
-                    keywords.add(item[0])
-    except Exception as e:
-        print(f"Autocomplete Error: {e}")
-
-    # 2. 통합검색 페이지 분석 (연관검색어 + 스마트블록 제목)
-    search_urls = [
-        # PC
-        (f"https://search.naver.com/search.naver?query={keyword}", 
-         {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}),
-        # Mobile (스마트블록 노출이 더 많음)
-        (f"https://m.search.naver.com/search.naver?query={keyword}",
-         {'User-Agent': 'Mozilla/5.0 (Linux; Android 10; SM-G981B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/80.0.3987.162 Mobile Safari/537.36'})
-    ]
-
-    stop_words = ["뉴스", "이미지", "인기글", "더보기", "전체", "카페", "블로그", "지식iN", "인플루언서", "동영상", "쇼핑", "지도", "기타"]
-
-    for url, headers in search_urls:
-        try:
-            res = requests.get(url, headers=headers, timeout=5)
-            if res.status_code != 200: continue
-            
-            soup = BeautifulSoup(res.text, 'html.parser')
-            
-            # 전통적 연관검색어 selector
-            tags = soup.select('.lst_related_srch .tit, .related_srch .tit, .keyword_box .tit, .related_srch .name')
-            for tag in tags:
-                keywords.add(tag.get_text(strip=True))
-
-            # 스마트블록 제목 (subjectTitle) - HTML 내 JSON 데이터 파싱
-            json_matches = re.findall(r'"subjectTitle"\s*:\s*"([^"]+)"', res.text)
-            for m in json_matches:
-                # 불필요한 노이즈 제거
-                if m and m not in stop_words and len(m) < 40:
-                    keywords.add(m)
-
-            # 모바일 스마트블록 타이틀 selector
-            sb_titles = soup.select('.api_title_area .tit_main, .fds-comps-header-title')
-            for sb in sb_titles:
-                txt = sb.get_text(strip=True)
-                if txt and txt not in stop_words and len(txt) < 40:
-                    keywords.add(txt)
+AUTOCOMPLETE_URL = "https://ac.search.naver.com/nx/ac"
+def build_autocomplete_params(keyword):
+    return {
+        "q": keyword, "con": "0", "frm": "nv", "ans": "2",
+        "r_format": "json", "r_enc": "UTF-8", "rev": "4",
+        "q_enc": "UTF-8", "st": "100"
+    }
 
-        except Exception as e:
-            print(f"Search Page Error ({url[:30]}...): {e}")
+def parse_autocomplete(ac_data):
+    keywords = set()
+    for group in ac_data.get('items', []):
+        for item in group:
+            keywords.add(item[0])
+    return keywords
 
+def finalize_related_keywords(keywords, keyword):
     # 최종 결과 정제
     final_list = []
     for k in keywords:
         # 검색어 자신 제외 및 불용어 필터링
         if k == keyword: continue
-        if any(sw == k for sw in stop_words): continue
+        if any(sw == k for sw in RELATED_STOP_WORDS): continue
         if len(k) < 2: continue # 너무 짧은 키워드 제외
         final_list.append(k)
         
     # 중복 제거 및 가나다 순 정렬
-    final_list = sorted(list(set(final_list)))
-    
-    return final_list
+    return sorted(list(set(final_list)))
+
+# 연관 키워드/섹션 순서 조회에서 하위 요청들이 공유하는 마감 시간(초)
+RELATED_DEADLINE = 6.0
+SECTION_ORDER_DEADLINE = 8.0
+
+def get_related_keywords(keyword, deadline=RELATED_DEADLINE):
+    """
+    네이버 통합검색(PC/모바일) 및 자동완성 API를 종합하여 관련 키워드를 추출합니다.
+    세 요청은 동시에 보내고, 마감까지 온 결과만으로도 목록을 만듭니다.
+    """
+    def autocomplete():
+        # 1. 네이버 자동완성 API (기본 성능 보장)
+        res_ac = http_get(AUTOCOMPLETE_URL, params=build_autocomplete_params(keyword), timeout=5)
+        return parse_autocomplete(res_ac.json()) if res_ac.status_code == 200 else set()
+
+    def serp_related(device):
+        # 2. 통합검색 페이지 분석 (연관검색어 + 스마트블록 제목)
+        # PC는 기본, 모바일은 스마트블록 노출이 더 많음. 페이지는 섹션/순위 분석과 공유됩니다.
+        document = fetch_serp(keyword, device)
+        return set(document.related) if document.ok else set()
+
+    outcomes = fan_out({
+        'autocomplete': autocomplete,
+        'pc': lambda: serp_related('pc'),
+        'mobile': lambda: serp_related('mobile')
+    }, deadline)
+
+    keywords = set()
+    for name, outcome in outcomes.items():
+        if outcome.ok:
+            keywords |= outcome.value
+        else:
+            print(f"Related keywords {name} {outcome.status}: {outcome.error}")
+    return finalize_related_keywords(keywords, keyword)
 
 def get_keyword_info(keyword):
     """
-    단일 키워드에 대한 기본 정보(문서수 등)를 가져옵니다. (재시도 로직 포함)
+    단일 키워드에 대한 기본 정보(문서수 등)를 가져옵니다.
+    (429/5xx 재시도는 http_client의 재시도 정책이 처리합니다)
+    문서수는 doc_count_cache에 변화 속도에 맞춘 TTL로 캐시됩니다.
     """
-    max_retries = 2
-    for i in range(max_retries + 1):
-        result = search_blog(keyword, display=1)
-        if result and 'error' not in result:
-            return {'total': result.get('total', 0)}
-        
-        err_msg = result.get('error', 'Unknown') if result else 'Empty'
-        print(f"DEBUG: get_keyword_info retry {i+1} for '{keyword}': {err_msg}")
-        if i < max_retries:
-            time.sleep(0.5) # Wait before retry
-            
-    return {'total': 0, 'error': f"Failed after {max_retries} retries"}
+    cached, _ = lookup_doc_counts([keyword])
+    if keyword in cached:
+        return {'total': cached[keyword]}
+    
+    result = search_blog(keyword, display=1)
+    if result and 'error' not in result:
+        total = result.get('total', 0)
+        store_doc_counts({keyword: total})
+        return {'total': total}
+    
+    err_msg = result.get('error', 'Unknown') if result else 'Empty'
+    print(f"DEBUG: get_keyword_info failed for '{keyword}': {err_msg}")
+    return {'total': 0, 'error': err_msg}
+
+def get_keyword_infos(keywords, max_workers=10):
+    """
+    여러 키워드의 문서수를 한 번에 조회합니다. 캐시를 한 번 훑고 미스만 동시에 요청합니다.
+    Returns: dict { keyword: {'total': int} }
+    """
+    cached, misses = lookup_doc_counts(keywords)
+    infos = {kwd: {'total': total} for kwd, total in cached.items()}
+    if misses:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            infos.update(zip(misses, executor.map(get_keyword_info, misses)))
+    return infos
 
 
 def generate_signature(timestamp, method, uri, secret_key):
@@ -140,79 +151,119 @@ def generate_signature(timestamp, method, uri, secret_key):
     signature = hmac.new(bytes(secret_key, "utf-8"), bytes(message, "utf-8"), hashlib.sha256).digest()
     return base64.b64encode(signature).decode("utf-8")
 
+AD_API_BASE_URL = "https://api.naver.com"
+AD_API_KEYWORDS_URI = "/keywordstool"
+
+def build_ad_api_headers(credential, method="GET", uri=AD_API_KEYWORDS_URI):
+    """
+    요청마다 새 타임스탬프로 서명한 검색광고 API 헤더를 만듭니다.
+    """
+    timestamp = str(int(time.time() * 1000))
+    return {
+        "Content-Type": "application/json; charset=UTF-8",
+        "X-Timestamp": timestamp,
+        "X-API-KEY": credential.key_id,
+        "X-Customer": credential.customer_id,
+        "X-Signature": generate_signature(timestamp, method, uri, credential.secret)
+    }
+
+def build_keywordstool_params(hint_keywords):
+    return {
+        "hintKeywords": hint_keywords,
+        "showDetail": "1"
+    }
+
+def call_keywordstool(hint_keywords):
+    """
+    검색광고 API 키 풀에서 키를 골라 keywordstool을 호출합니다. 등록된 키가 없으면 None.
+    """
+    pool = get_ad_api_pool()
+    if not pool:
+        return None
+    url = AD_API_BASE_URL + AD_API_KEYWORDS_URI
+    params = build_keywordstool_params(hint_keywords)
+    # 키를 고르기 전에 병합하고, 서명 헤더(타임스탬프 포함)는 실제로 보낼 때 새로 만듭니다.
+    return coalesced("GET", url, params, lambda: pool.call(lambda cred, retry: http_get(
+        url, params=params, headers=build_ad_api_headers(cred), retry=retry, coalesce=False)))
+
+def keywordstool_parallelism():
+    """
+    keywordstool을 동시에 보낼 호출 수. 속도 제한 버킷이 키마다 따로 있으므로 (버스트 × 키 개수).
+    """
+    burst = burst_size(AD_API_BASE_URL + AD_API_KEYWORDS_URI) or 5
+    return max(1, burst * len(get_ad_api_pool()))
+
+def parse_ad_volumes(item):
+    """
+    keywordstool 응답 항목에서 (PC, 모바일) 월간 조회수를 꺼냅니다.
+    API는 조회수가 적으면 '< 10' 문자열을 주므로 0으로 처리합니다.
+    """
+    pc_vol = item.get('monthlyPcQcCnt', 0)
+    mo_vol = item.get('monthlyMobileQcCnt', 0)
+    if isinstance(pc_vol, str): pc_vol = 0
+    if isinstance(mo_vol, str): mo_vol = 0
+    return pc_vol, mo_vol
+
+def find_exact_volume(keyword_list, keyword):
+    """
+    keywordList에서 입력 키워드와 정확히 일치(대소문자/공백 무시)하는 항목의 조회수를 찾습니다.
+    """
+    target = keyword.replace(" ", "").lower()
+    for item in keyword_list:
+        rel_kwd = item['relKeyword'].replace(" ", "").lower()
+        if rel_kwd == target:
+            pc_vol, mo_vol = parse_ad_volumes(item)
+            comp_idx = item.get('compIdx', 'N/A')
+            
+            return {
+                'pc': pc_vol,
+                'mobile': mo_vol,
+                'total': pc_vol + mo_vol,
+                'comp_idx': comp_idx
+            }
+    
+    # If no exact match, log what we got for debugging
+    print(f"DEBUG: No exact match for '{target}'. Got: {[k['relKeyword'] for k in keyword_list[:5]]}")
+    return {'pc': 0, 'mobile': 0, 'total': 0}
+
+def parse_related_ad_keywords(keyword_list):
+    results = []
+    for item in keyword_list:
+        pc_vol, mo_vol = parse_ad_volumes(item)
+        comp_idx = item.get('compIdx', 0)
+        
+        results.append({
+            'keyword': item['relKeyword'],
+            'pc': pc_vol,
+            'mobile': mo_vol,
+            'total': pc_vol + mo_vol,
+            'comp_idx': comp_idx
+        })
+    return results
+
 def get_search_volume(keyword):
     """
     네이버 검색광고 API (RelKwdStat)를 통해 검색어의 PC/모바일 조회수를 조회합니다.
     """
+    cached = volume_cache.get(normalize_keyword(keyword))
+    if is_complete_volume(cached):
+        return {field: cached[field] for field in VOLUME_FIELDS}
+    if cached is not None and cached.get('absent'):
+        # API가 모른다고 기록된 키워드는 다시 묻지 않고 일치 항목이 없을 때와 같은 값
+        return {'pc': 0, 'mobile': 0, 'total': 0}
     try:
-        # Load keys
-        license_key = os.getenv("NAVER_AD_ACCESS_LICENSE", "").strip()
-        secret_key = os.getenv("NAVER_AD_SECRET_KEY", "").strip()
-        customer_id = os.getenv("NAVER_AD_CUSTOMER_ID", "").strip()
-        
-        if not license_key or not secret_key or not customer_id:
-            print(f"DEBUG: Missing AD API keys: license={bool(license_key)}, secret={bool(secret_key)}, customer={bool(customer_id)}")
-            return None
-            
-        base_url = "https://api.naver.com"
-        uri = "/keywordstool"
-        method = "GET"
-        timestamp = str(int(time.time() * 1000))
-        
-        signature = generate_signature(timestamp, method, uri, secret_key)
-        
-        headers = {
-            "Content-Type": "application/json; charset=UTF-8",
-            "X-Timestamp": timestamp,
-            "X-API-KEY": license_key,
-            "X-Customer": customer_id, 
-            "X-Signature": signature
-        }
-        
         # hintKeywords allows comma separated list, but we search one by one or batch if needed.
         # Here we just search for the specific keyword.
         # Spaces in hintKeywords cause 400 error, so remove them
-        params = {
-            "hintKeywords": keyword.replace(" ", ""),
-            "showDetail": "1"
-        }
-        
-        res = requests.get(base_url + uri, params=params, headers=headers)
+        res = call_keywordstool(keyword.replace(" ", ""))
+        if res is None:
+            print("DEBUG: Missing AD API keys (NAVER_AD_ACCESS_LICENSE / NAVER_AD_SECRET_KEY / NAVER_AD_CUSTOMER_ID)")
+            return None
         if res.status_code == 200:
-            data = res.json()
-            keyword_list = data.get('keywordList', [])
-            
-            # Find exact match (case-insensitive and space-insensitive)
-            target = keyword.replace(" ", "").lower()
-            for item in keyword_list:
-                rel_kwd = item['relKeyword'].replace(" ", "").lower()
-                if rel_kwd == target:
-                    pc_vol = item.get('monthlyPcQcCnt', 0)
-                    mo_vol = item.get('monthlyMobileQcCnt', 0)
-                    
-                    # API returns '< 10' as string for low volume
-                    if isinstance(pc_vol, str): pc_vol = 0
-                    if isinstance(mo_vol, str): mo_vol = 0
-                    
-                    comp_idx = item.get('compIdx', 'N/A')
-                    
-                    return {
-                        'pc': pc_vol,
-                        'mobile': mo_vol,
-                        'total': pc_vol + mo_vol,
-                        'comp_idx': comp_idx
-                    }
-            
-            # If no exact match, log what we got for debugging
-            print(f"DEBUG: No exact match for '{target}'. Got: {[k['relKeyword'] for k in keyword_list[:5]]}")
-                    
-            # If no exact match found in list (should be there if hinted)
-            if keyword_list:
-                # Fallback to first item? No, risky. 
-                pass
-                
-            return {'pc': 0, 'mobile': 0, 'total': 0}
-            
+            keyword_list = res.json().get('keywordList', [])
+            if normalize_keyword(keyword) not in {normalize_keyword(k) for k in harvest_volume_rows(keyword_list)}:
+                mark_absent([normalize_keyword(keyword)])
+            return find_exact_volume(keyword_list, keyword)
         else:
             print(f"Ad API Error: {res.status_code} {res.text}")
             return None
@@ -221,154 +272,95 @@ def get_search_volume(keyword):
         print(f"Search volume error: {e}")
         return None
 
-        return None
-
 def get_search_volumes_for_keywords(keyword_list):
     """
     주어진 키워드 리스트에 대한 검색량을 조회합니다.
-    5개씩 끊어서 Ad API를 호출하여 정확한 데이터를 얻습니다.
+    캐시와 앞선 응답으로 알 수 있는 키워드는 건너뛰고, 남은 키워드만 5개씩 채워 Ad API를 호출합니다.
+    청크는 Ad API 속도 제한이 허용하는 만큼 동시에 보냅니다. (계획은 volume_planner.VolumePlan 참고)
     Returns: dict { 'keyword_nospace': {'original_keyword': str, 'pc': int, 'mobile': int, 'total': int} }
     """
+    plan = VolumePlan(keyword_list)
     try:
-        # Load keys
-        license_key = os.getenv("NAVER_AD_ACCESS_LICENSE")
-        secret_key = os.getenv("NAVER_AD_SECRET_KEY")
-        customer_id = os.getenv("NAVER_AD_CUSTOMER_ID")
-        
-        if not license_key or not secret_key or not customer_id:
-            return {}
-            
-        base_url = "https://api.naver.com"
-        uri = "/keywordstool"
-        method = "GET"
-        
-        headers = {
-            "Content-Type": "application/json; charset=UTF-8",
-            "X-API-KEY": license_key,
-            "X-Customer": customer_id
-        }
-        
-        final_result = {}
+        if not plan.pending or not get_ad_api_pool():
+            return plan.result
         
-        # 5개씩 배칭
-        chunk_size = 5
-        for i in range(0, len(keyword_list), chunk_size):
-            chunk = keyword_list[i:i + chunk_size]
-            
-            # Clean keywords: remove special characters that might cause 400 error
-            clean_chunk = []
-            for k in chunk:
-                # Remove non-alphanumeric except for space
-                cleaned = re.sub(r'[^a-zA-Z0-9가-힣\s]', '', k)
-                if cleaned.strip():
-                    clean_chunk.append(cleaned.replace(" ", ""))
-            
-            if not clean_chunk:
-                continue
-                
-            hint_str = ",".join(clean_chunk)
-            
-            timestamp = str(int(time.time() * 1000))
-            signature = generate_signature(timestamp, method, uri, secret_key)
-            headers.update({
-                "X-Timestamp": timestamp,
-                "X-Signature": signature
-            })
-            
-            params = {
-                "hintKeywords": hint_str,
-                "showDetail": "1"
-            }
-            
-            # API 호출
-            res = requests.get(base_url + uri, params=params, headers=headers)
-            
+        def fetch_chunk(hint_str):
+            res = call_keywordstool(hint_str)
             if res.status_code == 200:
-                data = res.json()
-                for item in data.get('keywordList', []):
-                    kwd = item['relKeyword']
-                    # API 결과가 입력한 키워드(공백제거)와 일치하는 것만 저장 (또는 전체 저장하여 hit rate 높임)
-                    # 여기서는 우리가 요청한 chunk에 있는 것들을 우선적으로 찾아서 매핑해야 함.
-                    # 하지만 API는 관련 키워드를 더 많이 줌.
-                    # 효율성을 위해 일단 다 저장하되, key는 공백제거로 통일
-                    
-                    pc_vol = item.get('monthlyPcQcCnt', 0)
-                    mo_vol = item.get('monthlyMobileQcCnt', 0)
-                    if isinstance(pc_vol, str): pc_vol = 0
-                    if isinstance(mo_vol, str): mo_vol = 0
-                    
-                    comp_idx = item.get('compIdx', 'N/A')
-                    
-                    final_result[kwd.replace(" ", "")] = {
-                        'original_keyword': kwd,
-                        'pc': pc_vol,
-                        'mobile': mo_vol,
-                        'total': pc_vol + mo_vol,
-                        'comp_idx': comp_idx
-                    }
-                # Rate limit safety (optional, but 5 keywords per call is rare)
-                time.sleep(0.1)
-            else:
-                print(f"Batch Ad API Error: {res.status_code} {res.text}")
-                
-        return final_result
+                # API는 요청한 키워드 외에 관련 키워드도 함께 주므로 hit rate를 높이기 위해 전부 저장
+                return harvest_volume_rows(res.json().get('keywordList', []))
+            print(f"Batch Ad API Error: {res.status_code} {res.text}")
+            return None
+        
+        # 웨이브 단위로 동시에 호출하고, 응답이 채운 키워드는 다음 웨이브에서 빠짐
+        parallelism = keywordstool_parallelism()
+        with ThreadPoolExecutor(max_workers=parallelism) as executor:
+            while plan.pending:
+                futures = {executor.submit(fetch_chunk, hint_str): keys
+                           for hint_str, keys in plan.next_wave(parallelism)}
+                for future in as_completed(futures):
+                    keys = futures[future]
+                    try:
+                        rows = future.result()
+                    except Exception as e:
+                        print(f"Bulk search volume error: {e}")
+                        rows = None
+                    if rows is None:
+                        plan.record_failure(keys)
+                    else:
+                        plan.record(keys, rows)
+        
+        print(f"Volume plan: {plan.summary()}")
+        return plan.result
             
     except Exception as e:
         print(f"Bulk search volume error: {e}")
-        return {}
+        return plan.result
+
+def parse_volume_rows(keyword_list):
+    """
+    keywordList 전체를 { 'keyword_nospace': {...} } 형태로 변환합니다.
+    """
+    rows = {}
+    for item in keyword_list:
+        kwd = item['relKeyword']
+        pc_vol, mo_vol = parse_ad_volumes(item)
+        rows[kwd.replace(" ", "")] = {
+            'original_keyword': kwd,
+            'pc': pc_vol,
+            'mobile': mo_vol,
+            'total': pc_vol + mo_vol,
+            'comp_idx': item.get('compIdx', 'N/A')
+        }
+    return rows
+
+def harvest_volume_rows(keyword_list):
+    """
+    keywordstool 응답의 keywordList 전체(최대 ~1000행)를 볼륨 캐시에 저장하고
+    parse_volume_rows() 결과를 반환합니다. 관련 키워드의 조회수도 함께 오므로,
+    이후 그 키워드들을 조회할 때는 API를 다시 부르지 않아도 됩니다.
+    """
+    rows = parse_volume_rows(keyword_list)
+    volume_cache.put_many({normalize_keyword(kwd): row for kwd, row in rows.items()})
+    return rows
 
 def get_related_keywords_from_ad_api(seed_keyword):
     """
     네이버 검색광고 API를 사용하여 연관 키워드 대량(최대 1000개)과 그 검색량을 가져옵니다.
     """
+    cache_key = normalize_keyword(seed_keyword)
+    cached = related_ad_cache.get(cache_key)
+    if cached is not None:
+        return cached
     try:
-        license_key = os.getenv("NAVER_AD_ACCESS_LICENSE", "").strip()
-        secret_key = os.getenv("NAVER_AD_SECRET_KEY", "").strip()
-        customer_id = os.getenv("NAVER_AD_CUSTOMER_ID", "").strip()
-        
-        if not license_key or not secret_key or not customer_id:
+        res = call_keywordstool(clean_hint_keyword(seed_keyword))
+        if res is None:
             return []
-            
-        base_url = "https://api.naver.com"
-        uri = "/keywordstool"
-        method = "GET"
-        timestamp = str(int(time.time() * 1000))
-        signature = generate_signature(timestamp, method, uri, secret_key)
-        
-        headers = {
-            "Content-Type": "application/json; charset=UTF-8",
-            "X-Timestamp": timestamp,
-            "X-API-KEY": license_key,
-            "X-Customer": customer_id, 
-            "X-Signature": signature
-        }
-        
-        params = {
-            "hintKeywords": re.sub(r'[^a-zA-Z0-9가-힣\s]', '', seed_keyword).replace(" ", ""),
-            "showDetail": "1"
-        }
-        
-        res = requests.get(base_url + uri, params=params, headers=headers)
         if res.status_code == 200:
-            data = res.json()
-            keyword_list = data.get('keywordList', [])
-            
-            results = []
-            for item in keyword_list:
-                pc_vol = item.get('monthlyPcQcCnt', 0)
-                mo_vol = item.get('monthlyMobileQcCnt', 0)
-                if isinstance(pc_vol, str): pc_vol = 0
-                if isinstance(mo_vol, str): mo_vol = 0
-                
-                comp_idx = item.get('compIdx', 0)
-                
-                results.append({
-                    'keyword': item['relKeyword'],
-                    'pc': pc_vol,
-                    'mobile': mo_vol,
-                    'total': pc_vol + mo_vol,
-                    'comp_idx': comp_idx
-                })
+            keyword_list = res.json().get('keywordList', [])
+            harvest_volume_rows(keyword_list)
+            results = parse_related_ad_keywords(keyword_list)
+            related_ad_cache.put(cache_key, results)
             return results
         else:
             print(f"Ad API Error: {res.status_code}")
@@ -383,56 +375,49 @@ def get_blog_rank(keyword):
     Returns: list of strings ("B" for Blog, "C" for Cafe, etc.)
     """
     try:
-        # PC Search URL
-        url = f"https://search.naver.com/search.naver?query={keyword}"
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        res = requests.get(url, headers=headers)
-        soup = BeautifulSoup(res.text, 'html.parser')
-        
-        ranks = []
-        
-        # 'view_wrap' usually contains the list of VIEW results
-        # Look for items in the VIEW section. New structure often has 'view_wrap'.
-        view_section = soup.select_one(".view_wrap") or soup.select_one(".api_subject_bx")
-        
-        if view_section:
-            items = view_section.select("li.bx")
-            for item in items:
-                text_content = item.get_text()
-                # Simple heuristic check based on typical labels
-                if "블로그" in text_content:
-                    ranks.append("B") 
-                elif "카페" in text_content:
-                    ranks.append("C") 
-                else:
-                    # Sometimes simpler structure
-                    ranks.append("?")
-                
-                if len(ranks) >= 10:
-                    break
-        else:
-            # Fallback for 'Smart Block' or different layouts
-            # Just grab generic 'bx' items that look like content
-            items = soup.select("li.bx")
-            for item in items:
-                txt = item.get_text()
-                if "블로그" in txt: ranks.append("B")
-                elif "카페" in txt: ranks.append("C")
-                if len(ranks) >= 10: break
-
-        return ranks
+        return fetch_serp(keyword, 'pc').blog_ranks
     except Exception as e:
         print(f"Blog rank error: {e}")
         return []
 
-
 def get_api_keys():
     client_id = os.getenv("NAVER_CLIENT_ID", "").strip()
     client_secret = os.getenv("NAVER_CLIENT_SECRET", "").strip()
     return client_id, client_secret
 
+def build_search_api_url(service_type, keyword, display=10, sort='sim'):
+    encText = requests.utils.quote(keyword)
+    return f"https://openapi.naver.com/v1/search/{service_type}?query={encText}&display={display}&sort={sort}"
+
+def build_search_api_request(service_type, keyword, display=10, sort='sim', credential=None):
+    """
+    네이버 검색 API 요청 (url, headers)를 만듭니다.
+    """
+    url = build_search_api_url(service_type, keyword, display, sort)
+    headers = {
+        "X-Naver-Client-Id": credential.key_id,
+        "X-Naver-Client-Secret": credential.secret
+    }
+    return url, headers
+
+def call_search_api(service_type, keyword, display=10, sort='sim', **kwargs):
+    """
+    Open API 키 풀에서 키를 골라 검색 API를 호출합니다. 등록된 키가 없으면 None.
+    """
+    pool = get_open_api_pool()
+    if not pool:
+        return None
+
+    def send(cred, retry):
+        url, headers = build_search_api_request(service_type, keyword, display, sort, cred)
+        return http_get(url, headers=headers, retry=retry, coalesce=False, **kwargs)
+
+    # 같은 검색은 키를 고르기 전에 병합 (키가 달라도 한 번만 보냄)
+    url = build_search_api_url(service_type, keyword, display, sort)
+    return coalesced("GET", url, None, lambda: pool.call(send))
+
+MISSING_API_KEY_ERROR = {"error": "API 키가 설정되지 않았습니다. .env 파일을 확인해주세요."}
+
 def search_blog(keyword, display=10, sort='sim'):
     """
     네이버 블로그 검색 API를 호출합니다.
@@ -441,21 +426,10 @@ def search_blog(keyword, display=10, sort='sim'):
     :param sort: 정렬 순서 (sim: 정확도순, date: 날짜순)
     :return: 결과 딕셔너리 (total, items 등) 또는 None (에러 시)
     """
-    client_id, client_secret = get_api_keys()
-    
-    if not client_id or not client_secret:
-        return {"error": "API 키가 설정되지 않았습니다. .env 파일을 확인해주세요."}
-
-    encText = requests.utils.quote(keyword)
-    url = f"https://openapi.naver.com/v1/search/blog?query={encText}&display={display}&sort={sort}"
-
-    headers = {
-        "X-Naver-Client-Id": client_id,
-        "X-Naver-Client-Secret": client_secret
-    }
-
     try:
-        response = requests.get(url, headers=headers, timeout=5)
+        response = call_search_api('blog', keyword, display, sort, timeout=5)
+        if response is None:
+            return dict(MISSING_API_KEY_ERROR)
         if response.status_code == 200:
             return response.json()
         else:
@@ -485,21 +459,10 @@ def _search_general(service_type, keyword, display=10, sort='sim'):
     """
     네이버 검색 API 공통 호출 함수
     """
-    client_id, client_secret = get_api_keys()
-    
-    if not client_id or not client_secret:
-        return {"error": "API 키가 설정되지 않았습니다. .env 파일을 확인해주세요."}
-
-    encText = requests.utils.quote(keyword)
-    url = f"https://openapi.naver.com/v1/search/{service_type}?query={encText}&display={display}&sort={sort}"
-
-    headers = {
-        "X-Naver-Client-Id": client_id,
-        "X-Naver-Client-Secret": client_secret
-    }
-
     try:
-        response = requests.get(url, headers=headers)
+        response = call_search_api(service_type, keyword, display, sort)
+        if response is None:
+            return dict(MISSING_API_KEY_ERROR)
         if response.status_code == 200:
             return response.json()
         else:
@@ -507,127 +470,26 @@ def _search_general(service_type, keyword, display=10, sort='sim'):
     except Exception as e:
         return {"error": str(e)}
 
-def get_naver_section_order(keyword):
+def get_naver_section_order(keyword, deadline=SECTION_ORDER_DEADLINE):
     """
     PC와 모바일의 네이버 검색 결과 섹션 순서를 분석합니다.
-    """
-    results = {'pc': [], 'mobile': []}
-    
-    # 알려진 섹션 이름 목록
-    known_sections = ["뉴스", "블로그", "쇼핑", "지식iN", "이미지", "어학사전", "인플루언서", "지도", "동영상", "웹문서"]
-    noise = ["문서 저장하기", "Keep에 저장", "Keep 바로가기", "AD", "도움말", "VIEW", "더보기"]
-    
-    # 섹션 추출 헬퍼 함수
-    def extract_sections(soup, device='pc'):
-        sections = []
-        seen_titles = set()
-        
-        # 방법 1: 섹션 컨테이너에서 직접 추출 (section.sc_new, div.api_subject_bx 등)
-        section_containers = soup.select('section.sc_new, div.api_subject_bx, section[class*="sc_new"]')
-        
-        for container in section_containers:
-            # 각 컨테이너 내에서 헤더 찾기
-            headers = container.select('.api_title, h2, .tit_main, .title_link, h3.title, .area_title')
-            
-            for h in headers:
-                text = h.get_text(strip=True)
-                if not text or text in seen_titles or text == keyword:
-                    continue
-                
-                # 노이즈 필터링
-                if text in noise or len(text) > 30:
-                    continue
-                
-                # 알려진 섹션이거나 짧은 텍스트면 추가
-                if text in known_sections or (len(text) < 20 and text not in noise):
-                    sections.append(text)
-                    seen_titles.add(text)
-        
-        # 방법 2: 모든 헤더 후보를 다시 검사 (더 포괄적)
-        all_headers = soup.select('.api_title, h2, .tit_main, .title_link, h3.title, .area_title')
-        
-        for h in all_headers:
-            text = h.get_text(strip=True)
-            if not text or text in seen_titles:
-                continue
-            
-            if text in noise or len(text) > 30:
-                continue
-            
-            # 부모 태그 확인하여 유효한 섹션인지 검증
-            curr = h
-            valid = False
-            for _ in range(5):
-                curr = curr.parent
-                if not curr:
-                    break
-                classes = curr.get('class', [])
-                if (curr.name == 'section' and 'sc_new' in ' '.join(classes)) or \
-                   (curr.get('class') and 'api_subject_bx' in classes):
-                    valid = True
-                    break
-            
-            if valid:
-                if text in known_sections or (len(text) < 20 and text not in noise):
-                    if text not in seen_titles:
-                        sections.append(text)
-                        seen_titles.add(text)
-        
-        # 방법 3: 알려진 섹션 이름이 HTML에 있으면 직접 검색 (뉴스 등 빠진 경우 대비)
-        for known_sec in known_sections:
-            if known_sec not in seen_titles:
-                # HTML에서 해당 텍스트를 포함하는 요소 찾기
-                elements = soup.find_all(string=lambda s: s and known_sec in s.strip())
-                for el in elements[:10]:  # 최대 10개만 확인
-                    parent = el.parent
-                    # 섹션 컨테이너 내부인지 확인
-                    for _ in range(5):
-                        if not parent:
-                            break
-                        classes = parent.get('class', [])
-                        if (parent.name == 'section' and 'sc_new' in ' '.join(classes)) or \
-                           'api_subject_bx' in classes:
-                            sections.append(known_sec)
-                            seen_titles.add(known_sec)
-                            break
-                        parent = parent.parent
-                    if known_sec in seen_titles:
-                        break
-        
-        return sections
-    
-    # 1. PC 검색 결과 분석
-    try:
-        url_pc = f"https://search.naver.com/search.naver?query={keyword}"
-        headers_pc = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        res_pc = requests.get(url_pc, headers=headers_pc)
-        soup_pc = BeautifulSoup(res_pc.text, 'html.parser')
-        
-        sections_pc = extract_sections(soup_pc, 'pc')
-        results['pc'] = sections_pc
-        
-    except Exception as e:
-        print(f"PC parsing error: {e}")
-        results['pc'] = ["오류 발생"]
-
-    # 2. 모바일 검색 결과 분석
-    try:
-        url_mo = f"https://m.search.naver.com/search.naver?query={keyword}"
-        headers_mo = {
-            'User-Agent': 'Mozilla/5.0 (Linux; Android 10; SM-G981B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/80.0.3987.162 Mobile Safari/537.36'
-        }
-        res_mo = requests.get(url_mo, headers=headers_mo)
-        soup_mo = BeautifulSoup(res_mo.text, 'html.parser')
-        
-        sections_mo = extract_sections(soup_mo, 'mobile')
-        results['mobile'] = sections_mo
-
-    except Exception as e:
-        print(f"Mobile parsing error: {e}")
-        results['mobile'] = ["오류 발생"]
-        
+    두 페이지는 동시에 가져오고, 마감 안에 오지 않은 쪽은 ["시간 초과"]로 표시합니다.
+    """
+    outcomes = fan_out({
+        'pc': lambda: fetch_serp(keyword, 'pc').sections,
+        'mobile': lambda: fetch_serp(keyword, 'mobile').sections
+    }, deadline)
+
+    results = {}
+    for device, outcome in outcomes.items():
+        if outcome.ok:
+            results[device] = outcome.value
+        elif outcome.status == 'timeout':
+            print(f"{device} section order timed out for '{keyword}'")
+            results[device] = ["시간 초과"]
+        else:
+            print(f"{device} parsing error: {outcome.error}")
+            results[device] = ["오류 발생"]
     return results
 
 def get_google_trending_keywords(country_code='KR', limit=20):
@@ -704,7 +566,7 @@ def get_google_trending_keywords(country_code='KR', limit=20):
             
             # Google Trends의 내부 JSON API 엔드포인트
             url = f"https://trends.google.com/trends/api/dailytrends?hl=ko&geo={country_code}&ns=15"
-            response = requests.get(url, headers=headers, timeout=10)
+            response = http_get(url, headers=headers, timeout=10)
             
             if response.status_code == 200 and response.text:
                 # Google Trends API는 ")]}',"로 시작하는 경우가 있음
@@ -781,7 +643,7 @@ def get_google_trending_keywords(country_code='KR', limit=20):
                     break
                     
                 try:
-                    response = requests.get(url, headers=headers, timeout=10, allow_redirects=True)
+                    response = http_get(url, headers=headers, timeout=10, allow_redirects=True)
                     
                     if response.status_code == 200 and response.content:
                         # XML/Atom 파싱 시도
@@ -889,7 +751,7 @@ def get_datalab_shopping_trends(cid):
     }
     
     try:
-        res = requests.post(url, headers=headers, data=data)
+        res = http_post(url, headers=headers, data=data)
         if res.status_code == 200:
             result = res.json()
             # ranks: [{rank, keyword, linkId}, ...]
@@ -906,37 +768,14 @@ def get_related_ad_keywords(keyword):
     네이버 검색 광고 API를 통해 관련 키워드 리스트를 가져옵니다.
     """
     try:
-        license_key = os.getenv("NAVER_AD_ACCESS_LICENSE")
-        secret_key = os.getenv("NAVER_AD_SECRET_KEY")
-        customer_id = os.getenv("NAVER_AD_CUSTOMER_ID")
-        
-        if not license_key or not secret_key or not customer_id:
+        res = call_keywordstool(keyword.replace(" ", ""))
+        if res is None:
             print("Ad API keys missing")
             return []
-            
-        base_url = "https://api.naver.com"
-        uri = "/keywordstool"
-        method = "GET"
-        timestamp = str(int(time.time() * 1000))
-        signature = generate_signature(timestamp, method, uri, secret_key)
-        
-        headers = {
-            "Content-Type": "application/json; charset=UTF-8",
-            "X-Timestamp": timestamp,
-            "X-API-KEY": license_key,
-            "X-Customer": customer_id, 
-            "X-Signature": signature
-        }
-        
-        params = {
-            "hintKeywords": keyword.replace(" ", ""),
-            "showDetail": "1"
-        }
-        
-        res = requests.get(base_url + uri, params=params, headers=headers)
         if res.status_code == 200:
-            data = res.json()
-            return data.get('keywordList', [])
+            keyword_list = res.json().get('keywordList', [])
+            harvest_volume_rows(keyword_list)
+            return keyword_list
         else:
             print(f"Ad API Error: {res.status_code} {res.text}")
             return []
@@ -984,37 +823,34 @@ def find_golden_keywords(seed_keyword, min_search_vol=500, top_n=30):
     candidates = sorted(candidates, key=lambda x: x['total_vol'], reverse=True)[:top_n]
     
     # 3. 문서 수 수집 및 황금지수 계산
+    # 블로그 검색 API로 문서수(total) 가져오기
+    doc_infos = get_keyword_infos([item['keyword'] for item in candidates])
+    doc_counts = [doc_infos.get(item['keyword'], {}).get('total', 0) for item in candidates]
+    
+    # 황금률(경쟁 강도) = (문서 수 / 월간 검색량)
+    # 낮을수록 좋음 (검색량 대비 문서가 적음)
+    rates = competition_rates([item['total_vol'] for item in candidates], doc_counts).round(2)
+    
     results = []
-    for item in candidates:
-        kw = item['keyword']
-        # 블로그 검색 API로 문서수(total) 가져오기
-        blog_info = get_keyword_info(kw)
-        doc_count = blog_info.get('total', 0)
-        
-        # 황금률(경쟁 강도) = (문서 수 / 월간 검색량)
-        # 낮을수록 좋음 (검색량 대비 문서가 적음)
-        competition_rate = round((doc_count / item['total_vol']) if item['total_vol'] > 0 else 999, 2)
-        
+    # 경쟁률 낮은 순(황금 키워드)으로 정렬
+    for i in rates.argsort(kind='stable'):
+        item = candidates[i]
         results.append({
-            'keyword': kw,
+            'keyword': item['keyword'],
             'total_vol': item['total_vol'],
             'pc_vol': item['pc_vol'],
             'mo_vol': item['mo_vol'],
-            'doc_count': doc_count,
-            'competition_rate': competition_rate
+            'doc_count': doc_counts[i],
+            'competition_rate': float(rates[i])
         })
-        # API 속도 제한 고려
-        time.sleep(0.1)
-        
-    # 경쟁률 낮은 순(황금 키워드)으로 정렬
-    results = sorted(results, key=lambda x: x['competition_rate'])
     
     return results
 
 
-def analyze_top_blogs(keyword, count=5):
+def analyze_top_blogs(keyword, count=5, blog_result=None):
     """
     키워드의 상위 블로그를 분석하여 경쟁 난이도 정보를 반환합니다.
+    이미 받아 둔 search_blog 결과(blog_result)가 있으면 API를 다시 호출하지 않습니다.
     
     Returns:
         dict: {
@@ -1028,12 +864,13 @@ def analyze_top_blogs(keyword, count=5):
     """
     try:
         # 1. 네이버 블로그 검색 API로 상위 포스트 가져오기
-        blog_result = search_blog(keyword, display=count, sort='sim')
+        if blog_result is None:
+            blog_result = search_blog(keyword, display=count, sort='sim')
         
         if 'error' in blog_result:
             return {'error': blog_result['error'], 'keyword': keyword}
         
-        items = blog_result.get('items', [])
+        items = blog_result.get('items', [])[:count]
         if not items:
             return {
                 'keyword': keyword,
@@ -1050,8 +887,8 @@ def analyze_top_blogs(keyword, count=5):
         fresh_count = 0  # 최근 30일 내 포스트 수
         
         for item in items:
-            title = BeautifulSoup(item.get('title', ''), 'html.parser').get_text()
-            description = BeautifulSoup(item.get('description', ''), 'html.parser').get_text()
+            title = html_to_text(item.get('title', ''))
+            description = html_to_text(item.get('description', ''))
             blogger_name = item.get('bloggername', '')
             post_date_str = item.get('postdate', '')
             link = item.get('link', '')
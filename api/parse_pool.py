@@ -0,0 +1,80 @@
+"""
+HTML 파싱 같은 CPU 작업을 별도 프로세스에서 실행하는 워커 풀.
+
+BeautifulSoup 파싱은 CPU 작업이라 스레드를 늘려도 GIL 때문에 한 번에 하나씩만 진행됩니다.
+gold_discover처럼 후보마다 SERP를 두 번씩 파싱하는 대량 작업에서는, 스레드/코루틴은
+다운로드만 하고 HTML을 워커 프로세스에 넘겨 작은 추출 결과(dict)만 돌려받습니다.
+
+작업마다 HTML 전체(수백 KB)를 pickle로 넘기는 비용이 있고 코어가 하나뿐인 서버리스 인스턴스에서는
+이득이 없으므로 기본으로 꺼져 있습니다. 대상 하드웨어에서 측정해 빨라질 때만 켜세요.
+워커는 forkserver(없으면 spawn)로 띄웁니다. 스레드가 도는 Flask/팬아웃 프로세스를 fork하면
+자식이 복사된 잠금을 잡은 채 멈출 수 있기 때문입니다.
+
+설정 (.env):
+    PARSE_WORKERS   워커 프로세스 수 (기본 0: 같은 프로세스에서 파싱)
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+_pool = None
+_pool_lock = threading.Lock()
+_disabled = False
+
+
+def parse_workers():
+    return max(0, int(os.getenv("PARSE_WORKERS", "0").strip() or 0))
+
+
+def _start_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def get_parse_pool():
+    """
+    공유 워커 풀. 사용할 수 없으면 None.
+    """
+    global _pool, _disabled
+    if _pool is not None or _disabled:
+        return _pool
+    with _pool_lock:
+        if _pool is None and not _disabled:
+            workers = parse_workers()
+            if workers == 0:
+                _disabled = True
+                return None
+            try:
+                _pool = ProcessPoolExecutor(max_workers=workers, mp_context=_start_context())
+            except (OSError, NotImplementedError, ValueError) as e:
+                print(f"Parse worker pool unavailable, parsing in-process: {e}")
+                _disabled = True
+    return _pool
+
+
+def shutdown_parse_pool():
+    global _pool, _disabled
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+        _disabled = False
+
+
+def run_parse(func, *args):
+    """
+    func(*args)를 워커 프로세스에서 실행합니다. func와 인자, 결과는 pickle 가능해야 합니다.
+    풀이 없거나 깨졌으면 현재 프로세스에서 실행합니다.
+    """
+    pool = get_parse_pool()
+    if pool is None:
+        return func(*args)
+    try:
+        return pool.submit(func, *args).result()
+    except BrokenProcessPool as e:
+        print(f"Parse worker pool broken, restarting: {e}")
+        shutdown_parse_pool()
+        return func(*args)
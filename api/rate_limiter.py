@@ -0,0 +1,136 @@
+"""
+업스트림(호스트/경로)과 자격증명 단위로 공유되는 토큰 버킷 속도 제한기.
+
+버킷은 '예약' 방식으로 동작합니다. 호출자는 락 안에서 토큰을 미리 차감하고
+(부족하면 음수가 됨), 필요한 만큼만 락 밖에서 기다립니다. 그래서 여러 스레드와
+코루틴이 같은 버킷을 공유해도 허용 속도를 넘지 않고, 남는 시간 없이 최대 속도로 호출합니다.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+# 업스트림별 기본 제한: (초당 토큰, 버스트 크기)
+# 키는 "호스트" 또는 "호스트/경로 접두사" 형식이며, 가장 구체적인 키가 우선합니다.
+RATE_LIMITS = {
+    "openapi.naver.com": (10.0, 10),
+    "api.naver.com/keywordstool": (5.0, 5),
+    "search.naver.com": (5.0, 10),
+    "m.search.naver.com": (5.0, 10),
+    "ac.search.naver.com": (10.0, 10),
+}
+
+
+class TokenBucket:
+    """
+    스레드 안전하고 asyncio에서도 쓸 수 있는 토큰 버킷.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.capacity = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens):
+        """
+        토큰을 예약하고, 예약한 토큰을 쓸 수 있을 때까지 기다려야 하는 시간(초)을 반환합니다.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens=1):
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens=1):
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def _load_env_overrides():
+    """
+    NAVER_RATE_LIMITS="openapi.naver.com=10:10,api.naver.com/keywordstool=5:5" 형식의 설정을 읽습니다.
+    """
+    raw = os.getenv("NAVER_RATE_LIMITS", "").strip()
+    for entry in filter(None, (e.strip() for e in raw.split(","))):
+        try:
+            key, spec = entry.split("=", 1)
+            rate, _, burst = spec.partition(":")
+            RATE_LIMITS[key.strip()] = (float(rate), int(burst or max(1, float(rate))))
+        except ValueError:
+            print(f"Invalid NAVER_RATE_LIMITS entry ignored: {entry}")
+
+
+_load_env_overrides()
+
+
+def configure_rate_limit(key, rate, burst=None):
+    """
+    업스트림 키의 제한을 변경합니다. 이미 만들어진 버킷은 폐기되어 새 설정으로 다시 만들어집니다.
+    """
+    with _buckets_lock:
+        RATE_LIMITS[key] = (float(rate), int(burst if burst is not None else max(1, rate)))
+        for bucket_key in [k for k in _buckets if k[0] == key]:
+            del _buckets[bucket_key]
+
+
+def resolve_upstream(url):
+    """
+    URL에 적용되는 RATE_LIMITS 키를 찾습니다. 해당하는 설정이 없으면 None.
+    """
+    parts = urlsplit(url)
+    host = parts.hostname or ""
+    target = host + parts.path
+    best = None
+    for key in RATE_LIMITS:
+        if target == key or target.startswith(key.rstrip("/") + "/") or key == host:
+            if best is None or len(key) > len(best):
+                best = key
+    return best
+
+
+def get_limiter(url, credential=None):
+    """
+    (업스트림, 자격증명) 단위로 공유되는 버킷을 반환합니다. 제한이 없는 업스트림은 None.
+    """
+    upstream = resolve_upstream(url)
+    if upstream is None:
+        return None
+    key = (upstream, credential)
+    bucket = _buckets.get(key)
+    if bucket is None:
+        with _buckets_lock:
+            bucket = _buckets.get(key)
+            if bucket is None:
+                rate, burst = RATE_LIMITS[upstream]
+                bucket = _buckets[key] = TokenBucket(rate, burst)
+    return bucket
+
+
+def burst_size(url):
+    """
+    URL 업스트림의 버킷 버스트 크기(= 자격증명 하나로 기다림 없이 동시에 보낼 수 있는 호출 수).
+    제한이 없는 업스트림은 None.
+    """
+    upstream = resolve_upstream(url)
+    if upstream is None:
+        return None
+    return RATE_LIMITS[upstream][1]
@@ -0,0 +1,153 @@
+"""
+전송 계층에서 쓰는 재시도 정책과 업스트림별 서킷 브레이커.
+
+- 429(스로틀링)와 5xx, 연결 오류/타임아웃은 지수 백오프(+지터)로 재시도하고,
+  Retry-After 헤더가 있으면 그 값을 따릅니다.
+- 401/403 인증 실패는 재시도해도 결과가 같으므로 바로 반환합니다.
+- 같은 업스트림에서 연속 실패가 쌓이면 서킷을 열어 일정 시간 동안 즉시 실패시킵니다.
+  (scraping이 막혔을 때 수십 개 스레드가 각자 타임아웃을 기다리지 않도록)
+"""
+
+import email.utils
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+AUTH_FAILURE_STATUS = {401, 403}
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """
+    서킷이 열려 있어 요청을 보내지 않고 즉시 실패했음을 나타냅니다.
+    """
+
+
+class RetryPolicy:
+    def __init__(self, max_retries=2, base_delay=0.5, max_delay=8.0, max_retry_after=30.0,
+                 retry_statuses=RETRYABLE_STATUS):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def should_retry(self, status_code):
+        return status_code in self.retry_statuses
+
+    def delay(self, attempt, response=None):
+        """
+        attempt번째(0부터) 재시도 전 대기 시간. Retry-After가 있으면 우선합니다.
+        """
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.max_retry_after)
+        # Full jitter: 0 ~ min(max_delay, base * 2^attempt)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+NO_RETRY = RetryPolicy(max_retries=0)
+
+
+def parse_retry_after(value):
+    """
+    Retry-After 헤더(초 또는 HTTP-date)를 대기 초로 변환합니다.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        parsed = email.utils.parsedate_to_datetime(value)
+        return max(0.0, parsed.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """
+    closed → (연속 failure_threshold회 실패) → open → (reset_timeout 경과) → half-open
+    half-open 상태에서는 시험 요청 1건만 보내고, 성공하면 closed, 실패하면 다시 open.
+    결과를 알리지 못하고 끝난 시험 요청은 release_probe()로 자리를 돌려주고, 그마저 못 한 채
+    reset_timeout보다 오래된 시험 요청(취소/스레드 중단)은 잃어버린 것으로 보고 새 시험을 허용합니다.
+    """
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started_at = None  # 진행 중인 시험 요청의 시작 시각 (없으면 None)
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open":
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self.state = "half_open"
+                self._probe_started_at = None
+            now = time.monotonic()
+            if self._probe_started_at is not None and now - self._probe_started_at < self.reset_timeout:
+                return False
+            self._probe_started_at = now
+            return True
+
+    @property
+    def probe_in_flight(self):
+        return self._probe_started_at is not None
+
+    def release_probe(self):
+        """
+        성공/실패를 기록하지 않고 끝난 요청(호출자 마감, 취소 등)이 시험 요청 자리를 돌려줍니다.
+        half-open이 아니면 아무것도 하지 않습니다.
+        """
+        with self._lock:
+            if self.state == "half_open":
+                self._probe_started_at = None
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self._failures = 0
+            self._probe_started_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                if self.state != "open":
+                    print(f"Circuit opened for {self.name} after {self._failures} failures")
+                self.state = "open"
+                self._opened_at = time.monotonic()
+                self._probe_started_at = None
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(url):
+    """
+    URL의 호스트 단위로 공유되는 서킷 브레이커를 반환합니다.
+    """
+    host = urlsplit(url).hostname or ""
+    breaker = _breakers.get(host)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(host, CircuitBreaker(host))
+    return breaker
+
+
+def breaker_states():
+    return {host: breaker.state for host, breaker in _breakers.items()}
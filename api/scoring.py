@@ -0,0 +1,149 @@
+"""
+키워드 지표 점수/등급 계산 엔진.
+
+황금 점수(검색량 / (문서수 + 1)), 등급(💎 종결 / 🏆 황금 / ✅ 추천), 경쟁도 라벨,
+쇼핑 트렌드 인사이트(블루오션 등), 경쟁률(문서수 / 검색량)을 한곳에서 계산합니다.
+모든 함수는 열 단위 배열(리스트, NumPy 배열, pandas Series)을 받아 한 번에 계산하므로
+키워드 1개든 수확한 10만 개든 같은 코드로 처리합니다.
+
+임계값은 아래 상수가 기본값이며, 함수 인자로 바꿔 넘길 수 있습니다.
+등급 표는 위에서부터 먼저 만족하는 행이 적용됩니다.
+"""
+
+import numpy as np
+
+# (문서수 미만, 점수 이상, 라벨, 등급)
+GOLD_TIERS = (
+    (1000, 5.0, "💎 종결", "ultra"),
+    (5000, 1.0, "🏆 황금", "golden"),
+    (20000, 0.3, "✅ 추천", "good"),
+)
+GOLD_DEFAULT_TIER = ("평범", "normal")
+
+# (comp_idx 미만, 라벨) - 숫자가 아닌 comp_idx("높음" 등)는 그대로 씁니다.
+COMP_BANDS = (
+    (30, "낮음"),
+    (70, "중간"),
+)
+COMP_DEFAULT_LABEL = "높음"
+
+# (문서수 미만, 검색량 초과, 인사이트)
+SHOPPING_INSIGHTS = (
+    (1000, 10000, "💎 블루오션"),
+    (5000, 5000, "✨ 해볼만함"),
+)
+SHOPPING_DEFAULT_INSIGHT = "🔥 레드오션"
+
+# 검색량이 0일 때의 경쟁률
+EMPTY_COMPETITION_RATE = 999
+
+
+def _numbers(values):
+    return np.asarray(values, dtype=np.float64)
+
+
+def gold_scores(volumes, docs):
+    """
+    검색량 / (문서수 + 1)
+    """
+    return _numbers(volumes) / (_numbers(docs) + 1)
+
+
+def competition_rates(volumes, docs, empty=EMPTY_COMPETITION_RATE):
+    """
+    문서수 / 검색량 (낮을수록 좋음). 검색량이 0이면 empty.
+    """
+    volumes = _numbers(volumes)
+    docs = _numbers(docs)
+    rates = np.full(volumes.shape, float(empty))
+    np.divide(docs, volumes, out=rates, where=volumes > 0)
+    return rates
+
+
+def _pick(conditions, choices, default):
+    # 조건별 선택지 인덱스를 먼저 구하고 라벨 배열에서 한 번에 꺼냅니다. (문자열 np.select보다 빠름)
+    index = np.select(conditions, list(range(len(choices))), default=len(choices))
+    return np.array(list(choices) + [default], dtype=object)[index]
+
+
+def gold_tiers(docs, scores, tiers=GOLD_TIERS, default=GOLD_DEFAULT_TIER):
+    """
+    Returns: (labels, tiers) 문자열 배열
+    """
+    docs = _numbers(docs)
+    scores = _numbers(scores)
+    conditions = [(docs < max_docs) & (scores >= min_score) for max_docs, min_score, _, _ in tiers]
+    labels = _pick(conditions, [label for _, _, label, _ in tiers], default[0])
+    names = _pick(conditions, [name for _, _, _, name in tiers], default[1])
+    return labels, names
+
+
+def comp_labels(comp_idx, bands=COMP_BANDS, default=COMP_DEFAULT_LABEL):
+    """
+    숫자 comp_idx(파이썬/NumPy 숫자, 숫자로 읽히는 문자열)는 구간 라벨로,
+    그 밖의 값("높음" 등)은 문자열로 그대로 반환합니다.
+    """
+    # 리스트를 그냥 asarray하면 숫자와 문자열이 섞일 때 숫자까지 문자열이 되므로 object로 받습니다.
+    raw = comp_idx if isinstance(comp_idx, np.ndarray) else np.array(comp_idx, dtype=object)
+    band_labels = [label for _, label in bands]
+    if raw.dtype.kind in 'iufb':
+        values = raw.astype(np.float64)
+        return _pick([values < limit for limit, _ in bands], band_labels, default)
+    # pandas는 import가 무거워서(서버리스 콜드 스타트) 문자열이 섞인 경우에만 불러옵니다.
+    import pandas as pd
+
+    labels = raw.astype(object)
+    # 검색광고 API는 보통 "높음"/"중간"/"낮음" 문자열. 라벨과 같은 값은 배열 비교로 먼저 빼고
+    # 나머지만 숫자로 변환합니다. (문자열이 많으면 to_numeric의 변환 실패 처리가 느림)
+    text = np.zeros(labels.shape, dtype=bool)
+    for label in (*band_labels, default):
+        text |= labels == label
+    values = np.full(labels.shape, np.nan)
+    values[~text] = pd.to_numeric(labels[~text], errors='coerce')
+    numeric = ~np.isnan(values)
+    other = ~(text | numeric)
+    labels[other] = labels[other].astype(str)
+    if numeric.any():
+        labels[numeric] = _pick([values[numeric] < limit for limit, _ in bands], band_labels, default)
+    return labels
+
+
+def shopping_insights(volumes, docs, insights=SHOPPING_INSIGHTS, default=SHOPPING_DEFAULT_INSIGHT):
+    volumes = _numbers(volumes)
+    docs = _numbers(docs)
+    conditions = [(docs < max_docs) & (volumes > min_volume) for max_docs, min_volume, _ in insights]
+    return _pick(conditions, [label for _, _, label in insights], default)
+
+
+def score_keywords(volumes, docs, comp_idx=None, tiers=GOLD_TIERS, bands=COMP_BANDS):
+    """
+    점수, 등급, 라벨, 경쟁도 라벨, 경쟁률을 한 번에 계산합니다.
+    Returns: dict of arrays { score, label, tier, comp, competition_rate }
+    """
+    scores = gold_scores(volumes, docs)
+    labels, names = gold_tiers(docs, scores, tiers)
+    result = {
+        'score': scores,
+        'label': labels,
+        'tier': names,
+        'competition_rate': competition_rates(volumes, docs)
+    }
+    if comp_idx is not None:
+        result['comp'] = comp_labels(comp_idx, bands)
+    return result
+
+
+def score_frame(frame, volume_col='volume', docs_col='docs', comp_col='comp_idx',
+                tiers=GOLD_TIERS, bands=COMP_BANDS):
+    """
+    pandas DataFrame(또는 열 dict)에 score/label/tier/comp/competition_rate 열을 붙여
+    점수 내림차순으로 정렬한 새 DataFrame을 반환합니다. 대량 재정렬(re-rank)용.
+    """
+    # pandas는 import가 무거워서(서버리스 콜드 스타트) 이 함수에서만 불러옵니다.
+    import pandas as pd
+
+    frame = pd.DataFrame(frame)
+    comp = frame[comp_col].to_numpy() if comp_col in frame else None
+    scored = score_keywords(frame[volume_col].to_numpy(), frame[docs_col].to_numpy(), comp, tiers, bands)
+    frame = frame.assign(**scored)
+    return frame.sort_values('score', ascending=False, kind='stable').reset_index(drop=True)
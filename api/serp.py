@@ -0,0 +1,365 @@
+"""
+네이버 통합검색(SERP) 페이지 가져오기와 파싱.
+
+한 페이지에서 섹션 순서, VIEW 블로그/카페 순위, 연관검색어/스마트블록 제목을 모두
+뽑을 수 있으므로, (키워드, 기기)마다 한 번만 받아 한 번만 파싱하고 결과를 잠시 캐시합니다.
+/api/analyze + /api/related 조합이 페이지 5번 다운로드/파싱하던 것을 2번으로 줄입니다.
+
+extract_serp()는 HTML 문자열만 받는 순수 함수라 parse_pool의 워커 프로세스에서 실행됩니다.
+
+페이지는 스트리밍으로 받습니다. 청크가 도착할 때마다 스마트블록 subjectTitle과 표지
+(연관검색어 블록, 메인 컬럼 끝)를 찾고, 메인 컬럼이 끝났고 연관검색어 블록까지 받았거나
+바이트 예산을 다 쓰면 나머지(사이드바, 푸터, 지연 로딩 스크립트)는 받지 않고 연결을 닫습니다.
+연관검색어 블록이 메인 컬럼 뒤에 오는 페이지는 메인 컬럼이 끝난 뒤 RELATED_AFTER_MAIN_BYTES만큼
+더 읽으며 그 블록을 찾고, 그 안에 없으면 연관검색어 블록이 없는 페이지로 보고 멈춥니다.
+
+설정 (.env):
+    SERP_STREAMING   0이면 스트리밍을 끄고 페이지 전체를 받습니다.
+"""
+
+import codecs
+import os
+import re
+import threading
+import time
+
+from bs4 import Tag
+
+from http_client import http_get
+from html_parser import parse_html
+from parse_pool import run_parse
+from single_flight import SingleFlight
+from fanout import time_left
+
+PC_SEARCH_URL = "https://search.naver.com/search.naver?query={keyword}"
+MOBILE_SEARCH_URL = "https://m.search.naver.com/search.naver?query={keyword}"
+PC_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+MOBILE_USER_AGENT = 'Mozilla/5.0 (Linux; Android 10; SM-G981B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/80.0.3987.162 Mobile Safari/537.36'
+
+SERP_DEVICES = {
+    'pc': (PC_SEARCH_URL, PC_USER_AGENT),
+    'mobile': (MOBILE_SEARCH_URL, MOBILE_USER_AGENT)
+}
+# 같은 검색 결과를 재사용하는 시간(초). 섹션 배치는 자주 바뀌지 않지만 순위는 움직이므로 짧게.
+SERP_CACHE_TTL = 120.0
+SERP_CACHE_MAX_ITEMS = 200
+
+SERP_STREAMING = os.getenv("SERP_STREAMING", "1").strip() != "0"
+STREAM_CHUNK_SIZE = 16 * 1024
+STREAM_BYTE_BUDGET = 512 * 1024
+# 이 표지가 나오면 섹션/VIEW/연관검색어가 있는 메인 컬럼은 끝난 것으로 봅니다.
+MAIN_COLUMN_END_MARKERS = ('id="sub_pack"', 'id="footer"', '<footer')
+RELATED_BLOCK_MARKERS = ('lst_related_srch', 'related_srch', 'keyword_box')
+# 메인 컬럼이 끝난 뒤 연관검색어 블록을 기다리며 더 읽는 바이트 수
+RELATED_AFTER_MAIN_BYTES = 64 * 1024
+SUBJECT_TITLE_RE = re.compile(r'"subjectTitle"\s*:\s*"([^"]+)"')
+# 청크 경계에 걸친 표지/JSON을 놓치지 않도록 이전 청크 끝을 겹쳐서 검사
+STREAM_OVERLAP = 256
+
+RELATED_STOP_WORDS = ["뉴스", "이미지", "인기글", "더보기", "전체", "카페", "블로그", "지식iN", "인플루언서", "동영상", "쇼핑", "지도", "기타"]
+
+def extract_related_from_serp(soup, html, subject_titles=None):
+    """
+    통합검색 페이지에서 연관검색어와 스마트블록 제목을 추출합니다.
+    subject_titles: 스트리밍 중 이미 찾은 subjectTitle 목록 (없으면 html에서 찾음)
+    """
+    keywords = set()
+    
+    # 전통적 연관검색어 selector
+    tags = soup.select('.lst_related_srch .tit, .related_srch .tit, .keyword_box .tit, .related_srch .name')
+    for tag in tags:
+        keywords.add(tag.get_text(strip=True))
+
+    # 스마트블록 제목 (subjectTitle) - HTML 내 JSON 데이터 파싱
+    json_matches = subject_titles if subject_titles is not None else SUBJECT_TITLE_RE.findall(html)
+    for m in json_matches:
+        # 불필요한 노이즈 제거
+        if m and m not in RELATED_STOP_WORDS and len(m) < 40:
+            keywords.add(m)
+
+    # 모바일 스마트블록 타이틀 selector
+    sb_titles = soup.select('.api_title_area .tit_main, .fds-comps-header-title')
+    for sb in sb_titles:
+        txt = sb.get_text(strip=True)
+        if txt and txt not in RELATED_STOP_WORDS and len(txt) < 40:
+            keywords.add(txt)
+
+    return keywords
+
+def extract_blog_ranks(soup):
+    """
+    파싱된 PC 검색 결과에서 VIEW 영역 상위 컨텐츠 유형(B/C/?)을 최대 10개 추출합니다.
+    """
+    ranks = []
+    
+    # 'view_wrap' usually contains the list of VIEW results
+    # Look for items in the VIEW section. New structure often has 'view_wrap'.
+    view_section = soup.select_one(".view_wrap") or soup.select_one(".api_subject_bx")
+    
+    if view_section:
+        items = view_section.select("li.bx")
+        for item in items:
+            text_content = item.get_text()
+            # Simple heuristic check based on typical labels
+            if "블로그" in text_content:
+                ranks.append("B") 
+            elif "카페" in text_content:
+                ranks.append("C") 
+            else:
+                # Sometimes simpler structure
+                ranks.append("?")
+            
+            if len(ranks) >= 10:
+                break
+    else:
+        # Fallback for 'Smart Block' or different layouts
+        # Just grab generic 'bx' items that look like content
+        items = soup.select("li.bx")
+        for item in items:
+            txt = item.get_text()
+            if "블로그" in txt: ranks.append("B")
+            elif "카페" in txt: ranks.append("C")
+            if len(ranks) >= 10: break
+
+    return ranks
+
+KNOWN_SECTIONS = ["뉴스", "블로그", "쇼핑", "지식iN", "이미지", "어학사전", "인플루언서", "지도", "동영상", "웹문서"]
+SECTION_NOISE = ["문서 저장하기", "Keep에 저장", "Keep 바로가기", "AD", "도움말", "VIEW", "더보기"]
+
+# 헤더 후보: '.api_title, h2, .tit_main, .title_link, h3.title, .area_title'
+HEADER_CLASSES = {'api_title', 'tit_main', 'title_link', 'area_title'}
+# 헤더/문자열에서 몇 단계 위 조상까지 섹션 컨테이너를 찾는지
+CONTAINER_SEARCH_DEPTH = 5
+# 알려진 섹션 이름마다 확인하는 문자열 수
+KNOWN_SECTION_MATCH_LIMIT = 10
+
+def _is_header(tag, classes):
+    return tag.name == 'h2' or (tag.name == 'h3' and 'title' in classes) or \
+        any(c in HEADER_CLASSES for c in classes)
+
+def _container_flags(tag, classes):
+    """
+    (섹션 컨테이너인지, 근처 컨테이너로 인정되는지)
+    section[class*=sc_new]와 div.api_subject_bx가 컨테이너이고,
+    근처 컨테이너 검사에서는 api_subject_bx 클래스가 있는 모든 태그를 인정합니다.
+    """
+    sc_new = tag.name == 'section' and 'sc_new' in ' '.join(classes)
+    subject_bx = 'api_subject_bx' in classes
+    return sc_new or (subject_bx and tag.name == 'div'), sc_new or subject_bx
+
+def _accept_title(text):
+    # 노이즈가 아니고, 알려진 섹션이거나 짧은 텍스트
+    return bool(text) and text not in SECTION_NOISE and len(text) <= 30 and \
+        (text in KNOWN_SECTIONS or len(text) < 20)
+
+def extract_sections(soup, keyword, device='pc'):
+    """
+    파싱된 검색 결과 페이지에서 섹션 제목을 노출 순서대로 추출합니다.
+
+    문서를 한 번만 순회하면서 헤더 후보와 알려진 섹션 이름이 들어간 문자열을 모으고,
+    조상 스택으로 섹션 컨테이너 안에 있는지를 판단합니다. 결과 순서는 기존 규칙 그대로:
+    1. 섹션 컨테이너 안의 헤더 (검색어와 같은 제목 제외)
+    2. 5단계 이내에 컨테이너가 있는 나머지 헤더
+    3. 아직 없는 알려진 섹션 중, 이름이 컨테이너 근처 문자열에 있는 것 (뉴스 등 빠진 경우 대비)
+    """
+    headers = []                    # (제목, 컨테이너 안인지, 근처에 컨테이너가 있는지)
+    known_found = set()
+    known_checked = dict.fromkeys(KNOWN_SECTIONS, 0)
+
+    near = [False]                  # 루트부터 현재 부모까지 "근처 컨테이너" 여부
+    in_container = [False]          # 방법 1 컨테이너 조상 여부 (누적)
+    iterators = [iter(soup.contents)]
+    while iterators:
+        node = next(iterators[-1], None)
+        if node is None:
+            iterators.pop()
+            near.pop()
+            in_container.pop()
+            continue
+
+        if isinstance(node, Tag):
+            classes = node.get('class') or []
+            is_container, is_near = _container_flags(node, classes)
+            if _is_header(node, classes):
+                headers.append((node.get_text(strip=True), in_container[-1],
+                                any(near[-CONTAINER_SEARCH_DEPTH:])))
+            near.append(is_near)
+            in_container.append(in_container[-1] or is_container)
+            iterators.append(iter(node.contents))
+        elif node and len(known_found) < len(KNOWN_SECTIONS):
+            near_container = any(near[-CONTAINER_SEARCH_DEPTH:])
+            for known_sec, checked in known_checked.items():
+                if checked >= KNOWN_SECTION_MATCH_LIMIT or known_sec not in node:
+                    continue
+                known_checked[known_sec] = checked + 1
+                if near_container:
+                    known_found.add(known_sec)
+                    known_checked[known_sec] = KNOWN_SECTION_MATCH_LIMIT
+
+    sections = []
+    seen_titles = set()
+    for text, inside, _ in headers:
+        if inside and text != keyword and text not in seen_titles and _accept_title(text):
+            sections.append(text)
+            seen_titles.add(text)
+    for text, _, near_container in headers:
+        if near_container and text not in seen_titles and _accept_title(text):
+            sections.append(text)
+            seen_titles.add(text)
+    for known_sec in KNOWN_SECTIONS:
+        if known_sec in known_found and known_sec not in seen_titles:
+            sections.append(known_sec)
+            seen_titles.add(known_sec)
+
+    return sections
+
+def extract_serp(html, keyword, device='pc', parser=None, subject_titles=None):
+    """
+    SERP HTML을 한 번 파싱해 필요한 값을 모두 뽑아 딕셔너리로 반환합니다.
+    parser를 생략하면 html_parser.default_parser()를 사용합니다.
+    """
+    soup = parse_html(html, parser)
+    return {
+        'sections': extract_sections(soup, keyword, device),
+        'blog_ranks': extract_blog_ranks(soup),
+        'related': sorted(extract_related_from_serp(soup, html, subject_titles))
+    }
+
+class SerpStream:
+    """
+    청크 단위로 SERP를 받으면서 필요한 표지를 찾는 증분 추출기.
+    feed()가 True를 반환하면 더 받을 필요가 없습니다.
+    """
+
+    def __init__(self, encoding=None, byte_budget=STREAM_BYTE_BUDGET):
+        self._decoder = codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+        self._parts = []
+        self._tail = ''
+        self.byte_budget = byte_budget
+        self.bytes_read = 0
+        self.subject_titles = []
+        self.related_block_seen = False
+        self.main_column_done = False
+        # 메인 컬럼 끝 표지를 찾았을 때까지 받은 바이트 수
+        self.main_column_end_at = None
+        # 본문을 끝까지 받기 전에 읽기를 멈췄는지 (read_serp_stream이 설정)
+        self.truncated = False
+
+    def feed(self, chunk):
+        self.bytes_read += len(chunk)
+        text = self._decoder.decode(chunk)
+        self._parts.append(text)
+
+        window = self._tail + text
+        for m in SUBJECT_TITLE_RE.finditer(window):
+            # 겹친 부분에서 끝난 매치는 이전 청크에서 이미 셌음
+            if m.end() > len(self._tail):
+                self.subject_titles.append(m.group(1))
+        if not self.related_block_seen:
+            self.related_block_seen = any(marker in window for marker in RELATED_BLOCK_MARKERS)
+        if not self.main_column_done:
+            self.main_column_done = any(marker in window for marker in MAIN_COLUMN_END_MARKERS)
+            if self.main_column_done:
+                self.main_column_end_at = self.bytes_read
+        self._tail = window[-STREAM_OVERLAP:]
+        return self.done
+
+    @property
+    def done(self):
+        if self.bytes_read >= self.byte_budget:
+            return True
+        if not self.main_column_done:
+            return False
+        return self.related_block_seen or self.bytes_read - self.main_column_end_at >= RELATED_AFTER_MAIN_BYTES
+
+    @property
+    def html(self):
+        return ''.join(self._parts) + self._decoder.decode(b'', final=True)
+
+def read_serp_stream(response, byte_budget=STREAM_BYTE_BUDGET):
+    """
+    stream=True로 받은 응답을 필요한 만큼만 읽고 연결을 닫습니다.
+    """
+    stream = SerpStream(response.encoding, byte_budget)
+    try:
+        for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+            left = time_left()
+            if left is not None and left <= 0:
+                # fan_out 작업의 마감이 지났으면 결과가 버려지므로 더 받지 않습니다.
+                raise TimeoutError("fan-out deadline passed while reading SERP")
+            if stream.feed(chunk):
+                # 마지막 청크에서 멈췄으면 버린 바이트가 없습니다.
+                stream.truncated = not response.raw.isclosed()
+                break
+    finally:
+        response.close()
+    return stream
+
+class SerpDocument:
+    def __init__(self, keyword, device, status_code, extracted, bytes_read=None, truncated=False):
+        self.keyword = keyword
+        self.device = device
+        self.status_code = status_code
+        self.sections = extracted['sections']
+        self.blog_ranks = extracted['blog_ranks']
+        self.related = extracted['related']
+        self.bytes_read = bytes_read
+        self.truncated = truncated
+        self.fetched_at = time.time()
+
+    @property
+    def ok(self):
+        return self.status_code == 200
+
+_cache = {}
+_cache_lock = threading.Lock()
+_flight = SingleFlight()
+
+def serp_request(keyword, device):
+    """
+    (url, headers) 튜플을 반환합니다.
+    """
+    url_template, user_agent = SERP_DEVICES[device]
+    return url_template.format(keyword=keyword), {'User-Agent': user_agent}
+
+def get_cached_serp(keyword, device):
+    with _cache_lock:
+        entry = _cache.get((keyword, device))
+        if entry is not None and time.time() - entry.fetched_at < SERP_CACHE_TTL:
+            return entry
+    return None
+
+def cache_serp(document):
+    if not document.ok:
+        return
+    with _cache_lock:
+        _cache[(document.keyword, document.device)] = document
+        if len(_cache) > SERP_CACHE_MAX_ITEMS:
+            oldest = min(_cache, key=lambda k: _cache[k].fetched_at)
+            del _cache[oldest]
+
+def fetch_serp(keyword, device='pc'):
+    """
+    SERP를 가져와 파싱한 SerpDocument를 반환합니다. 최근에 받은 페이지는 캐시에서,
+    같은 페이지를 동시에 요청하면 한 번만 받아 나눠 씁니다. 네트워크 오류는 그대로 올라갑니다.
+    """
+    cached = get_cached_serp(keyword, device)
+    if cached is not None:
+        return cached
+
+    def load():
+        url, headers = serp_request(keyword, device)
+        if SERP_STREAMING:
+            res = http_get(url, headers=headers, stream=True)
+            stream = read_serp_stream(res)
+            extracted = run_parse(extract_serp, stream.html, keyword, device, None, stream.subject_titles)
+            document = SerpDocument(keyword, device, res.status_code, extracted,
+                                    bytes_read=stream.bytes_read, truncated=stream.truncated)
+        else:
+            res = http_get(url, headers=headers)
+            document = SerpDocument(keyword, device, res.status_code, run_parse(extract_serp, res.text, keyword, device),
+                                    bytes_read=len(res.content))
+        cache_serp(document)
+        return document
+
+    return _flight.do(("serp", keyword, device), load)
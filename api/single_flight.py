@@ -0,0 +1,132 @@
+"""
+동일한 요청이 동시에 여러 번 들어오면 하나만 실제로 실행하고 나머지는 그 결과를 공유하는
+single-flight 계층. (Go의 golang.org/x/sync/singleflight와 같은 방식)
+
+키는 정규화된 요청(메서드 + 엔드포인트 + 정렬된 파라미터, 필요하면 자격증명)이며,
+완료된 결과는 보관하지 않으므로 캐시가 아니라 '진행 중 요청 병합'만 담당합니다.
+"""
+
+import asyncio
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+
+def request_key(method, url, params=None, credential=None):
+    """
+    쿼리스트링과 params를 합쳐 정렬한 정규화 키를 만듭니다.
+    서명/타임스탬프 헤더는 요청마다 달라지므로 키에 넣지 않습니다.
+    """
+    parts = urlsplit(url)
+    pairs = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        items = params.items() if hasattr(params, "items") else params
+        pairs.extend((str(k), str(v)) for k, v in items)
+    query = urlencode(sorted(pairs))
+    endpoint = urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, query, ""))
+    return (method.upper(), endpoint, credential)
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.shared = 0
+
+
+class SingleFlight:
+    """
+    스레드용 single-flight. do(key, fn)은 같은 key로 진행 중인 호출이 있으면 그 결과를 기다립니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.shared += 1
+                self.shared += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+    def stats(self):
+        return {"executed": self.executed, "shared": self.shared, "in_flight": len(self._calls)}
+
+
+class _LeaderCancelled(Exception):
+    """
+    실행하던 코루틴이 취소되어 결과 없이 끝났음을 기다리던 쪽에 알립니다. (대기자는 다시 시도)
+    """
+
+
+class AsyncSingleFlight:
+    """
+    asyncio용 single-flight. 이벤트 루프별로 진행 중인 호출을 따로 관리합니다.
+    실행하던 쪽이 취소되어도 기다리던 쪽은 취소되지 않고, 그중 하나가 이어서 실행합니다.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self.executed = 0
+        self.shared = 0
+
+    async def do(self, key, coro_fn):
+        loop_key = (id(asyncio.get_running_loop()), key)
+        while True:
+            future = self._calls.get(loop_key)
+            if future is None:
+                break
+            self.shared += 1
+            try:
+                return await asyncio.shield(future)
+            except _LeaderCancelled:
+                # 먼저 깨어난 대기자가 새로 실행하고 나머지는 그 결과를 기다림
+                continue
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[loop_key] = future
+        self.executed += 1
+        try:
+            result = await coro_fn()
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            future.exception()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # 공유하는 쪽이 없으면 'exception was never retrieved' 경고가 나지 않도록 소비
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[loop_key]
+
+    def stats(self):
+        return {"executed": self.executed, "shared": self.shared, "in_flight": len(self._calls)}
@@ -0,0 +1,172 @@
+"""
+keywordstool 배치 조회 계획기.
+
+키워드를 앞에서부터 5개씩 잘라 보내는 대신,
+1. 볼륨 캐시(응답 전체 행이 수집되어 있음)로 이미 알고 있는 키워드를 빼고,
+2. 다른 키워드를 포함하는 긴 키워드("캠핑의자" ⊃ "캠핑")는 뒤로 미뤄
+   짧은 키워드의 응답(관련 키워드 최대 ~1000행)으로 먼저 채워지는지 보고,
+3. 남은 키워드만 hintKeywords 한도(5개)에 꽉 채워 보냅니다.
+응답에 없던 키워드는 "없음"으로 하루 동안 기억해 다시 묻지 않습니다.
+호출이 실패한 키워드는 다음 웨이브에 다시 넣고, MAX_KEYWORD_RETRIES번 넘게 실패하면
+VolumePlan.failed에 남겨 호출한 쪽이 알 수 있게 합니다.
+"""
+
+import re
+
+from keyword_cache import volume_cache, normalize_keyword
+
+# hintKeywords 한 번에 넣을 수 있는 최대 키워드 수
+HINT_KEYWORD_LIMIT = 5
+# 응답에 없던 키워드를 다시 묻지 않는 시간(초)
+ABSENT_TTL = 24 * 3600
+# 호출이 실패한 키워드를 다음 웨이브에 다시 넣는 최대 횟수
+MAX_KEYWORD_RETRIES = 2
+# 검색량 결과의 필드. 하나라도 빠진 캐시 항목은 적중으로 보지 않고 다시 조회합니다.
+VOLUME_FIELDS = ('pc', 'mobile', 'total', 'comp_idx')
+
+
+def clean_hint_keyword(keyword):
+    """
+    hintKeywords에 넣을 수 있도록 특수문자와 공백을 제거합니다. (400 에러 방지)
+    """
+    return re.sub(r'[^a-zA-Z0-9가-힣\s]', '', keyword).replace(" ", "")
+
+
+def is_complete_volume(entry):
+    return entry is not None and all(field in entry for field in VOLUME_FIELDS)
+
+
+def lookup_cached_volumes(keyword_list):
+    """
+    캐시에 있는 키워드는 { 'keyword_nospace': {...} } 맵으로, 없는 키워드는 미스 리스트로 나눕니다.
+    API가 모른다고 기록된(absent) 키워드는 어느 쪽에도 넣지 않습니다.
+    """
+    keys = {kwd: normalize_keyword(kwd) for kwd in keyword_list}
+    cached = volume_cache.get_many(list(keys.values()))
+    hits, misses = {}, []
+    for kwd, key in keys.items():
+        entry = cached.get(key)
+        if is_complete_volume(entry):
+            hits[kwd.replace(" ", "")] = entry
+        elif entry is None or not entry.get('absent'):
+            misses.append(kwd)
+    return hits, misses
+
+
+def mark_absent(keys):
+    """
+    hintKeywords로 보냈는데 응답에 없던 키워드를 기록합니다.
+    """
+    volume_cache.put_many({key: {'absent': True} for key in keys}, ttl=ABSENT_TTL)
+
+
+def order_hints(keys):
+    """
+    짧은 키워드부터, 그리고 이미 앞에 나온 키워드를 포함하는 키워드는 뒤로 보냅니다.
+    앞쪽 응답에 뒤쪽 키워드가 관련 키워드로 포함될 가능성이 높기 때문입니다.
+    """
+    heads, dependents = [], []
+    for key in sorted(keys, key=len):
+        if any(head in key for head in heads):
+            dependents.append(key)
+        else:
+            heads.append(key)
+    return heads + dependents
+
+
+class VolumePlan:
+    def __init__(self, keyword_list, chunk_size=HINT_KEYWORD_LIMIT):
+        self.chunk_size = chunk_size
+        self.result, misses = lookup_cached_volumes(keyword_list)
+        requested = {normalize_keyword(kwd) for kwd in keyword_list}
+
+        hints = {}
+        unhintable = 0
+        for kwd in misses:
+            hint = clean_hint_keyword(kwd)
+            if hint:
+                hints.setdefault(normalize_keyword(kwd), hint)
+            else:
+                unhintable += 1
+        self._hints = hints
+        self._pending = order_hints(hints)
+        # 지금까지 응답에 나온 키워드, 키워드별 실패 횟수, 재시도를 포기한 키워드
+        self._returned = set()
+        self._failures = {}
+        self.failed = []
+
+        self.stats = {
+            'requested': len(requested),
+            'cache_hits': len(self.result),
+            'known_absent': len(requested - {normalize_keyword(k) for k in self.result}
+                                - {normalize_keyword(k) for k in misses}),
+            'unhintable': unhintable,
+            'covered_by_responses': 0,
+            'newly_absent': 0,
+            'hinted': 0,
+            'calls': 0,
+            'failed_calls': 0,
+            'retried': 0,
+            'naive_calls': -(-len(requested) // chunk_size)
+        }
+
+    @property
+    def pending(self):
+        return bool(self._pending)
+
+    def next_wave(self, max_calls=1):
+        """
+        다음에 보낼 (hintKeywords 문자열, [정규화 키]) 목록을 최대 max_calls개 꺼냅니다.
+        """
+        wave = []
+        while self._pending and len(wave) < max_calls:
+            keys = self._pending[:self.chunk_size]
+            del self._pending[:self.chunk_size]
+            wave.append((",".join(self._hints[k] for k in keys), keys))
+            self.stats['calls'] += 1
+            self.stats['hinted'] += len(keys)
+        return wave
+
+    def record(self, keys, rows):
+        """
+        keys로 보낸 호출의 응답 행(parse_volume_rows 결과)을 반영합니다.
+        응답에 포함된 다른 대기 키워드는 호출 없이 완료 처리합니다.
+        """
+        self.result.update(rows)
+        returned = {normalize_keyword(kwd) for kwd in rows}
+        self._returned |= returned
+
+        def found(key):
+            return key in returned or self._hints[key].lower() in returned
+
+        covered = [key for key in self._pending if found(key)]
+        if covered:
+            self._pending = [key for key in self._pending if not found(key)]
+            self.stats['covered_by_responses'] += len(covered)
+
+        absent = [key for key in keys if not found(key)]
+        if absent:
+            mark_absent(absent)
+            self.stats['newly_absent'] += len(absent)
+
+    def record_failure(self, keys):
+        """
+        keys로 보낸 호출이 실패했을 때 부릅니다. 그사이 다른 응답으로 채워지지 않은 키워드는
+        다음 웨이브에 다시 넣고, 재시도 횟수를 넘긴 키워드는 failed에 남깁니다.
+        """
+        self.stats['failed_calls'] += 1
+        for key in keys:
+            if key in self._returned or self._hints[key].lower() in self._returned:
+                continue
+            self._failures[key] = self._failures.get(key, 0) + 1
+            if self._failures[key] > MAX_KEYWORD_RETRIES:
+                self.failed.append(key)
+            else:
+                self._pending.append(key)
+                self.stats['retried'] += 1
+
+    def summary(self):
+        s = self.stats
+        return (f"{s['requested']} keywords: {s['cache_hits']} cached, {s['known_absent']} known absent, "
+                f"{s['covered_by_responses']} covered by responses, {s['calls']} calls "
+                f"(naive {s['naive_calls']}), {s['failed_calls']} failed, {len(self.failed)} keywords given up")
@@ -0,0 +1,45 @@
+"""
+SERP 한 페이지당 파싱/추출 시간을 파서 백엔드별로 비교합니다.
+
+    python benchmark_parsers.py [반복 횟수] [SERP 디렉터리]
+
+기본은 fixtures/serp의 합성 페이지입니다. 백엔드 기본값을 바꾸기 전에 실제로 저장한
+네이버 SERP(.html) 디렉터리를 넘겨 측정하세요.
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'api'))
+
+from html_parser import available_parsers, parse_html, default_parser
+from serp import extract_serp
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'serp')
+
+def load_pages(directory=FIXTURE_DIR):
+    pages = []
+    for name in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, name), encoding='utf-8') as f:
+            pages.append((name, f.read()))
+    return pages
+
+def bench(func, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) / rounds * 1000
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    pages = load_pages(sys.argv[2]) if len(sys.argv) > 2 else load_pages()
+    print(f"Parsers installed: {available_parsers()} (default: {default_parser()})")
+    print(f"{'page':<28}{'parser':<14}{'parse ms':>10}{'parse+extract ms':>18}")
+    for name, html in pages:
+        for parser in available_parsers():
+            parse_ms = bench(lambda: parse_html(html, parser), rounds)
+            full_ms = bench(lambda: extract_serp(html, '캠핑', 'pc', parser), rounds)
+            print(f"{name:<28}{parser:<14}{parse_ms:>10.1f}{full_ms:>18.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+테스트 공용 도우미: 업스트림 호출과 공유 캐시/인덱스를 가짜로 바꿔 끼웁니다.
+
+@isolated로 감싼 테스트 안에서 patch()로 바꾼 모듈 속성은 테스트가 끝나면 원래 값으로
+되돌아가므로, 가짜 함수가 같은 프로세스에서 나중에 실행되는 다른 테스트로 새지 않습니다.
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'api'))
+
+import doc_count_cache
+import gold_index
+import gold_pipeline
+from keyword_cache import TieredCache
+
+# 황금 키워드 테스트의 기본 후보와 문서수
+GOLD_DOCS = {'빠른키워드': 100, '느린키워드': 200, '경쟁키워드': 900000}
+
+# 현재 테스트에서 바꾼 (모듈, 이름, 원래 값)
+_patches = []
+_patches_lock = threading.Lock()
+
+
+def patch(module, name, value):
+    """
+    module.name을 value로 바꿉니다. @isolated 테스트가 끝나면 원래 값으로 돌아갑니다.
+    """
+    with _patches_lock:
+        _patches.append((module, name, getattr(module, name)))
+    setattr(module, name, value)
+
+
+def restore_patches():
+    with _patches_lock:
+        while _patches:
+            module, name, value = _patches.pop()
+            setattr(module, name, value)
+
+
+def memory_gold_index():
+    # 실제 인덱스 파일에 가짜 키워드가 남지 않도록 메모리 DB 사용
+    patch(gold_index, '_index', gold_index.GoldIndex(':memory:'))
+
+
+def memory_doc_counts():
+    # 실제 캐시 파일에 테스트 키워드의 문서수가 남지 않도록 메모리 캐시 사용
+    patch(doc_count_cache, 'doc_count_cache',
+          TieredCache("doc_counts", doc_count_cache.HISTORY_TTL, db_path="off"))
+
+
+def isolated(*setups):
+    """
+    테스트 데코레이터. setups(memory_gold_index 등)를 먼저 실행하고, 테스트가 끝나면
+    patch()로 바꾼 값을 모두 되돌립니다.
+    """
+    def decorate(test):
+        def run():
+            try:
+                for setup in setups:
+                    setup()
+                test()
+            finally:
+                restore_patches()
+        run.__name__ = test.__name__
+        return run
+    return decorate
+
+
+def fake_gold_upstreams(candidates=GOLD_DOCS, docs=GOLD_DOCS, trending=(), volumes=None,
+                        doc_delay=0.0, section_delays=None, hold=None):
+    """
+    gold_pipeline의 업스트림 호출(후보 수집, 검색량, 문서수, 섹션)을 가짜로 바꿉니다.
+
+    docs: { 키워드: 문서수 } - 없는 키워드는 50, None이면 조회 실패
+    volumes: { 키워드: 총검색량 } - 없는 키워드는 5000
+    section_delays: { 키워드: 섹션 조회 지연(초) }
+    hold: { 키워드: threading.Event } - 그 키워드의 섹션 조회는 이벤트가 설정될 때까지 기다림
+    Returns: 호출 기록 리스트 ('collect', ('docs', 키워드), ('sections' | 'sections_done', 키워드))
+    """
+    calls = []
+    volumes = volumes or {}
+    section_delays = section_delays or {}
+    hold = hold or {}
+
+    def fake_collect():
+        calls.append('collect')
+        return {kw: {'volume': None, 'trending': kw in trending} for kw in candidates}
+
+    def fake_volumes(kws):
+        return {kw.replace(" ", ""): {'pc': 10, 'mobile': 10, 'total': volumes.get(kw, 5000), 'comp_idx': '낮음'}
+                for kw in kws}
+
+    def fake_info(kwd):
+        calls.append(('docs', kwd))
+        time.sleep(doc_delay)
+        doc_count = docs.get(kwd, 50)
+        return {'total': 0, 'error': 'quota'} if doc_count is None else {'total': doc_count}
+
+    def fake_sections(kwd):
+        calls.append(('sections', kwd))
+        if kwd in hold:
+            hold[kwd].wait(5)
+        time.sleep(section_delays.get(kwd, 0))
+        calls.append(('sections_done', kwd))
+        return {'pc': [], 'mobile': ['블로그']}
+
+    patch(gold_pipeline, 'collect_gold_candidates', fake_collect)
+    patch(gold_pipeline, 'get_search_volumes_for_keywords', fake_volumes)
+    patch(gold_pipeline, 'get_keyword_info', fake_info)
+    patch(gold_pipeline, 'get_naver_section_order', fake_sections)
+    return calls
+
+
+def called(calls, kind):
+    """
+    호출 기록에서 kind('docs' | 'sections' | 'sections_done') 호출의 키워드만 순서대로
+    """
+    return [call[1] for call in calls if isinstance(call, tuple) and call[0] == kind]
@@ -120,8 +120,15 @@ async function performAnalysis(keyword) {
     btn.disabled = true;
     btn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> 분석 중...';
 
+    // Related keywords are the slowest part, so they load in their own request and
+    // fill in when ready instead of holding back the summary and sections
+    loadRelatedKeywords(keyword);
+
     try {
-        const response = await fetch(`${API_BASE}/analyze?q=${encodeURIComponent(keyword)}`);
+        // One composite request for the fast parts: the blog list is included only when the blog tab is active
+        const parts = ['summary', 'sections', 'ranks', 'difficulty'];
+        if (currentTab === 'blog') parts.push('blog');
+        const response = await fetch(`${API_BASE}/report?q=${encodeURIComponent(keyword)}&parts=${parts.join(',')}`);
         const data = await response.json();
 
         if (data.error) {
@@ -137,33 +144,27 @@ async function performAnalysis(keyword) {
 
         updateStats(data.summary);
         updateSections(data.sections);
-        loadSearchResults(keyword, currentTab);
-        loadRelatedKeywords(keyword);
-
-        // Fetch difficulty score
-        try {
-            const diffRes = await fetch(`${API_BASE}/difficulty?q=${encodeURIComponent(keyword)}`);
-            const diffData = await diffRes.json();
-            if (!diffData.error) {
-                document.getElementById('difficulty-score').textContent = diffData.difficulty_score + '점';
-                document.getElementById('difficulty-label').textContent = diffData.difficulty;
-
-                // Color code the difficulty card
-                const diffCard = document.getElementById('difficulty-card');
-                diffCard.classList.remove('easy', 'medium', 'hard');
-                if (diffData.difficulty_score < 30) {
-                    diffCard.classList.add('easy');
-                } else if (diffData.difficulty_score < 60) {
-                    diffCard.classList.add('medium');
-                } else {
-                    diffCard.classList.add('hard');
-                }
-            }
-        } catch (diffErr) {
-            console.log('Difficulty fetch error:', diffErr);
+        if (data.blog) {
+            renderSearchResults(data.blog);
+        } else {
+            loadSearchResults(keyword, currentTab);
         }
 
-        showToast(`'${keyword}' 분석 완료`, 'success');
+        // Difficulty comes back with the analysis (no extra /difficulty round trip)
+        if (data.difficulty && !data.difficulty.error) {
+            updateDifficulty(data.difficulty);
+        }
+
+        // Some upstream sources may have failed or timed out; the rest is still shown
+        const failedSources = Object.entries(data.sources || {})
+            .filter(([, meta]) => meta.status !== 'ok')
+            .map(([name]) => name);
+        if (failedSources.length > 0) {
+            console.log('Analysis sources unavailable:', data.sources);
+            showToast(`'${keyword}' 분석 완료 (일부 데이터 누락: ${failedSources.join(', ')})`, 'info');
+        } else {
+            showToast(`'${keyword}' 분석 완료`, 'success');
+        }
         showAdsenseAd();
 
     } catch (err) {
@@ -174,6 +175,22 @@ async function performAnalysis(keyword) {
     }
 }
 
+function updateDifficulty(diffData) {
+    document.getElementById('difficulty-score').textContent = diffData.difficulty_score + '점';
+    document.getElementById('difficulty-label').textContent = diffData.difficulty;
+
+    // Color code the difficulty card
+    const diffCard = document.getElementById('difficulty-card');
+    diffCard.classList.remove('easy', 'medium', 'hard');
+    if (diffData.difficulty_score < 30) {
+        diffCard.classList.add('easy');
+    } else if (diffData.difficulty_score < 60) {
+        diffCard.classList.add('medium');
+    } else {
+        diffCard.classList.add('hard');
+    }
+}
+
 function updateStats(summary) {
     document.getElementById('pc-vol').innerText = summary.pc.toLocaleString();
     document.getElementById('mo-vol').innerText = summary.mobile.toLocaleString();
@@ -210,34 +227,43 @@ function updateSections(sections) {
 }
 
 async function loadRelatedKeywords(keyword) {
-    const container = document.getElementById('related-keywords-container');
-    container.innerHTML = '<div class="loading-spinner">연관 키워드 분석 중...</div>';
-
+    showRelatedLoading();
     try {
-        const response = await fetch(`${API_BASE}/related?q=${encodeURIComponent(keyword)}`);
+        const response = await fetch(`${API_BASE}/report?q=${encodeURIComponent(keyword)}&parts=related`);
         const data = await response.json();
+        // Ignore the result if a newer search started while this one was loading
+        if (keyword !== currentKeyword) return;
+        renderRelatedKeywords(data.related);
+    } catch (err) {
+        if (keyword === currentKeyword) renderRelatedKeywords([]);
+    }
+}
 
-        if (!data || data.length === 0) {
-            container.innerHTML = '<div class="loading-spinner">연관 키워드가 없습니다.</div>';
-            return;
-        }
+function showRelatedLoading() {
+    const container = document.getElementById('related-keywords-container');
+    container.innerHTML = '<div class="loading-spinner">연관 키워드 분석 중...</div>';
+}
 
-        container.innerHTML = data.map(item => `
-            <div class="related-item" onclick="document.getElementById('keyword-input').value='${item.keyword}'; performAnalysis('${item.keyword}'); navigateTo('dashboard')">
-                <span class="related-kwd-name">${item.keyword}</span>
-                <div class="related-kwd-stats">
-                    <span>조회 <b>${item.total.toLocaleString()}</b></span>
-                    <span>문서 <b>${item.docs.toLocaleString()}</b></span>
-                </div>
-                <div class="related-kwd-stats" style="margin-top: 4px;">
-                    <span>비율 <b>${item.ratio.toFixed(2)}</b></span>
-                </div>
-            </div>
-        `).join('');
+function renderRelatedKeywords(data) {
+    const container = document.getElementById('related-keywords-container');
 
-    } catch (err) {
-        container.innerHTML = '<div class="loading-spinner">연관 키워드 로드 실패</div>';
+    if (!data || data.length === 0) {
+        container.innerHTML = '<div class="loading-spinner">연관 키워드가 없습니다.</div>';
+        return;
     }
+
+    container.innerHTML = data.map(item => `
+        <div class="related-item" onclick="document.getElementById('keyword-input').value='${item.keyword}'; performAnalysis('${item.keyword}'); navigateTo('dashboard')">
+            <span class="related-kwd-name">${item.keyword}</span>
+            <div class="related-kwd-stats">
+                <span>조회 <b>${item.total.toLocaleString()}</b></span>
+                <span>문서 <b>${item.docs.toLocaleString()}</b></span>
+            </div>
+            <div class="related-kwd-stats" style="margin-top: 4px;">
+                <span>비율 <b>${item.ratio.toFixed(2)}</b></span>
+            </div>
+        </div>
+    `).join('');
 }
 
 async function loadSearchResults(keyword, type) {
@@ -246,29 +272,32 @@ async function loadSearchResults(keyword, type) {
 
     try {
         const response = await fetch(`${API_BASE}/search?q=${encodeURIComponent(keyword)}&type=${type}`);
-        const items = await response.json();
-
-        if (items.length === 0) {
-            container.innerHTML = '<div class="loading-spinner">결과가 없습니다.</div>';
-            return;
-        }
-
-        container.innerHTML = items.map(item => `
-            <div class="item-row clickable-result" onclick="window.open('${item.link}', '_blank')" style="cursor: pointer;">
-                <div class="item-title">${item.title || item.bloggername || '결과'}</div>
-                <div class="item-desc">${item.description || (item.lprice ? item.lprice + '원' : '') || ''}</div>
-                <div class="item-meta" style="font-size: 11px; margin-top: 8px; color: #64748b;">
-                    ${item.bloggername || item.mallName || ''} ${item.postdate ? '| ' + item.postdate : ''}
-                    <span style="float: right; color: var(--accent);"><i class="fas fa-external-link-alt"></i> 원문보기</span>
-                </div>
-            </div>
-        `).join('');
-
+        renderSearchResults(await response.json());
     } catch (err) {
         container.innerHTML = '<div class="loading-spinner">에러가 발생했습니다.</div>';
     }
 }
 
+function renderSearchResults(items) {
+    const container = document.getElementById('results-table');
+
+    if (items.length === 0) {
+        container.innerHTML = '<div class="loading-spinner">결과가 없습니다.</div>';
+        return;
+    }
+
+    container.innerHTML = items.map(item => `
+        <div class="item-row clickable-result" onclick="window.open('${item.link}', '_blank')" style="cursor: pointer;">
+            <div class="item-title">${item.title || item.bloggername || '결과'}</div>
+            <div class="item-desc">${item.description || (item.lprice ? item.lprice + '원' : '') || ''}</div>
+            <div class="item-meta" style="font-size: 11px; margin-top: 8px; color: #64748b;">
+                ${item.bloggername || item.mallName || ''} ${item.postdate ? '| ' + item.postdate : ''}
+                <span style="float: right; color: var(--accent);"><i class="fas fa-external-link-alt"></i> 원문보기</span>
+            </div>
+        </div>
+    `).join('');
+}
+
 async function loadRealtime() {
     const container = document.getElementById('realtime-keywords');
     container.innerHTML = '<div class="loading-spinner">실시간 정보를 가져오는 중...</div>';
@@ -345,57 +374,112 @@ function initGold() {
     if (btn) btn.onclick = loadGoldKeywords;
 }
 
+const GOLD_STAGE_LABELS = {
+    candidates: '후보 키워드 수집 완료',
+    volumes: '검색량 조회 완료',
+    docs: '문서수 조회 중',
+    filter: '황금 키워드 선별 완료',
+    enrich: '상위 키워드 섹션 분석 중'
+};
+
+function renderGoldTable(data, statusText) {
+    const container = document.getElementById('gold-keywords-container');
+
+    // Sort by Golden Score descending (Higher is better: High Volume, Low Docs)
+    const rows = [...data].sort((a, b) => b.score - a.score);
+
+    container.innerHTML = `
+        ${statusText ? `<div class="loading-spinner">${statusText}</div>` : ''}
+        <table class="data-table">
+            <thead>
+                <tr>
+                    <th>순위</th><th>키워드</th><th>트렌드</th><th>PC/모바일</th><th>문서수</th><th>황금점수</th><th>경쟁도</th><th>상태</th>
+                </tr>
+            </thead>
+            <tbody>
+                ${rows.map(item => `
+                    <tr>
+                        <td>${item.rank || '-'}</td>
+                        <td class="clickable" onclick="document.getElementById('keyword-input').value='${item.keyword}'; performAnalysis('${item.keyword}'); navigateTo('dashboard')"><b>${item.keyword}</b></td>
+                        <td><span class="trend-chip ${item.trend && item.trend.includes('급상승') ? 'trending' : 'stable'}">${item.trend || '➡️'}</span></td>
+                        <td>
+                            <div style="font-size: 0.85em;">
+                                <span style="color:var(--primary)">${(item.pc_vol || 0).toLocaleString()}</span> / 
+                                <span style="color:var(--secondary)">${(item.mo_vol || 0).toLocaleString()}</span>
+                            </div>
+                        </td>
+                        <td>${(item.docs || 0).toLocaleString()}</td>
+                        <td>${(item.score || 0).toFixed(2)}</td>
+                        <td><span class="badge comp-${item.comp === '높음' ? 'high' : (item.comp === '중간' ? 'mid' : 'low')}">${item.comp || '-'}</span></td>
+                        <td><span class="badge ${item.tier || 'info'}">${item.label || '평범'}</span></td>
+                    </tr>
+                `).join('')}
+            </tbody>
+        </table>
+    `;
+}
+
 async function loadGoldKeywords() {
     const container = document.getElementById('gold-keywords-container');
     const btn = document.getElementById('gold-discover-btn');
     const seed = document.getElementById('keyword-input').value || '인기아이템';
 
-    container.innerHTML = '<div class="loading-spinner">네이버 연관 검색 데이터 분석 중... (약 15초 소요)</div>';
+    container.innerHTML = '<div class="loading-spinner">후보 키워드 수집 중...</div>';
     if (btn) {
         btn.disabled = true;
         btn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> 분석 중...';
     }
 
+    // NDJSON stream: one event per line, keywords arrive as soon as each is scored
+    const found = [];
+    let status = '';
+    let finalResults = null;
+
+    const handleEvent = (event) => {
+        if (event.event === 'stage') {
+            status = `${GOLD_STAGE_LABELS[event.stage] || event.stage} (${event.count}개)`;
+        } else if (event.event === 'progress') {
+            status = `${GOLD_STAGE_LABELS[event.stage] || event.stage}... ${event.done}/${event.total}`;
+        } else if (event.event === 'keyword') {
+            // 인덱스에서 먼저 받은 키워드가 다시 분석되어 오면 교체
+            const i = found.findIndex(item => item.keyword === event.item.keyword);
+            if (i >= 0) found[i] = event.item; else found.push(event.item);
+        } else if (event.event === 'done') {
+            finalResults = event.results;
+        } else if (event.event === 'error') {
+            throw new Error(event.error);
+        }
+        if (finalResults === null) {
+            if (found.length > 0) {
+                renderGoldTable(found, status);
+            } else {
+                container.innerHTML = `<div class="loading-spinner">${status}</div>`;
+            }
+        }
+    };
+
     try {
-        const response = await fetch(`${API_BASE}/gold/discover?q=${encodeURIComponent(seed)}`);
-        let data = await response.json();
+        const response = await fetch(`${API_BASE}/gold/discover?q=${encodeURIComponent(seed)}&stream=ndjson`);
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            const lines = buffer.split('\n');
+            buffer = lines.pop();
+            lines.filter(line => line.trim()).forEach(line => handleEvent(JSON.parse(line)));
+        }
+        if (buffer.trim()) handleEvent(JSON.parse(buffer));
 
+        const data = finalResults || found;
         if (!data || data.length === 0) {
             container.innerHTML = '<div class="loading-spinner">데이터가 없습니다.</div>';
             return;
         }
-
-        // Sort by Golden Score descending (Higher is better: High Volume, Low Docs)
-        data.sort((a, b) => b.score - a.score);
-
-        container.innerHTML = `
-            <table class="data-table">
-                <thead>
-                    <tr>
-                        <th>순위</th><th>키워드</th><th>트렌드</th><th>PC/모바일</th><th>문서수</th><th>황금점수</th><th>경쟁도</th><th>상태</th>
-                    </tr>
-                </thead>
-                <tbody>
-                    ${data.map(item => `
-                        <tr>
-                            <td>${item.rank || '-'}</td>
-                            <td class="clickable" onclick="document.getElementById('keyword-input').value='${item.keyword}'; performAnalysis('${item.keyword}'); navigateTo('dashboard')"><b>${item.keyword}</b></td>
-                            <td><span class="trend-chip ${item.trend && item.trend.includes('급상승') ? 'trending' : 'stable'}">${item.trend || '➡️'}</span></td>
-                            <td>
-                                <div style="font-size: 0.85em;">
-                                    <span style="color:var(--primary)">${(item.pc_vol || 0).toLocaleString()}</span> / 
-                                    <span style="color:var(--secondary)">${(item.mo_vol || 0).toLocaleString()}</span>
-                                </div>
-                            </td>
-                            <td>${(item.docs || 0).toLocaleString()}</td>
-                            <td>${(item.score || 0).toFixed(2)}</td>
-                            <td><span class="badge comp-${item.comp === '높음' ? 'high' : (item.comp === '중간' ? 'mid' : 'low')}">${item.comp || '-'}</span></td>
-                            <td><span class="badge ${item.tier || 'info'}">${item.label || '평범'}</span></td>
-                        </tr>
-                    `).join('')}
-                </tbody>
-            </table>
-        `;
+        renderGoldTable(data);
     } catch (err) {
         console.error('Golden Keyword Error:', err);
         container.innerHTML = '<div class="loading-spinner">분석 실패: ' + err.message + '</div>';
@@ -0,0 +1,84 @@
+import os
+import sys
+import time
+import threading
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'api'))
+
+import index
+from fakes import patch, isolated
+
+BLOG_RESULT = {
+    'total': 1200,
+    'items': [{'title': f'<b>캠핑</b> 후기 {i}', 'description': '설명' * 40,
+               'bloggername': 'tester', 'postdate': '20200101', 'link': ''} for i in range(10)]
+}
+
+def install_fakes(sections_gate=None):
+    calls = {'blog': 0, 'running': 0, 'peak': 0, 'sections_done': False}
+    lock = threading.Lock()
+
+    def slow(value, gate=None):
+        # 동시에 실행 중인 업스트림 호출 수를 기록 (벽시계 시간 대신 병렬 여부를 확인)
+        with lock:
+            calls['running'] += 1
+            calls['peak'] = max(calls['peak'], calls['running'])
+        if gate is not None:
+            gate.wait(5)
+        else:
+            time.sleep(0.2)
+        with lock:
+            calls['running'] -= 1
+        return value
+
+    def fake_search_blog(keyword, display=10, sort='sim'):
+        calls['blog'] += 1
+        return slow(BLOG_RESULT)
+    def fake_volume(keyword):
+        return slow({'pc': 100, 'mobile': 900, 'total': 1000, 'comp_idx': '높음'})
+    def fake_sections(keyword):
+        result = slow({'pc': ['블로그'], 'mobile': ['쇼핑']}, sections_gate)
+        calls['sections_done'] = True
+        return result
+    def fake_ranks(keyword):
+        raise RuntimeError("rank parse failed")
+    patch(index, 'search_blog', fake_search_blog)
+    patch(index, 'get_search_volume', fake_volume)
+    patch(index, 'get_naver_section_order', fake_sections)
+    patch(index, 'get_blog_rank', fake_ranks)
+    return calls
+
+@isolated()
+def test_analyze_runs_sources_concurrently():
+    calls = install_fakes()
+    client = index.app.test_client()
+    data = client.get('/api/analyze?q=캠핑').get_json()
+    print(data['sources'], f"peak concurrent upstream calls: {calls['peak']}")
+    # 블로그 검색, 검색량, 섹션 순서가 동시에 진행됨
+    assert calls['peak'] >= 3
+    assert data['summary']['total_vol'] == 1000 and data['summary']['doc_count'] == 1200
+    assert data['sections'] == {'pc': ['블로그'], 'mobile': ['쇼핑']}
+    assert data['sources']['ranks']['status'] == 'error' and data['blog_ranks'] == []
+    assert len(data['difficulty']['top_posts']) == 5
+    assert calls['blog'] == 1
+
+@isolated()
+def test_analyze_partial_on_timeout():
+    # 섹션 조회는 응답을 받은 뒤에야 풀어 줍니다. 응답이 섹션을 기다렸다면 sections_done이 True.
+    gate = threading.Event()
+    calls = install_fakes(sections_gate=gate)
+    patch(index, 'ANALYZE_DEADLINE', 0.6)
+    try:
+        data = index.app.test_client().get('/api/analyze?q=캠핑').get_json()
+        answered_before_sections = not calls['sections_done']
+    finally:
+        gate.set()
+    print(data['sources'])
+    assert answered_before_sections
+    assert data['sources']['sections']['status'] == 'timeout'
+    assert data['sections']['pc'] == ['시간 초과']
+    assert data['summary']['total_vol'] == 1000
+
+if __name__ == "__main__":
+    test_analyze_runs_sources_concurrently()
+    test_analyze_partial_on_timeout()
@@ -0,0 +1,23 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'api'))
+
+from async_service import run_async, gather_limited
+
+def test_run_async_reuses_client():
+    seen = []
+
+    async def grab(item, client=None):
+        seen.append(client)
+        return item
+
+    # 요청(run_async 호출)이 바뀌어도 같은 루프와 클라이언트를 씁니다.
+    assert run_async(gather_limited(grab, [1, 2])) == {1: 1, 2: 2}
+    assert run_async(gather_limited(grab, [3])) == {3: 3}
+    assert seen[0] is not None and all(client is seen[0] for client in seen)
+    assert not seen[0].is_closed
+    print(f"run_async shared client across calls: {type(seen[0]).__name__}")
+
+if __name__ == "__main__":
+    test_run_async_reuses_client()
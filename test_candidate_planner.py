@@ -0,0 +1,61 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'api'))
+
+from keyword_cache import volume_cache, normalize_keyword
+from doc_count_cache import doc_count_cache, doc_count_key, store_doc_counts
+from volume_planner import mark_absent
+from candidate_planner import CandidatePlan, merge_candidates, VOLUME_CALL_COST, DOC_CALL_COST
+
+KEYWORDS = ['후보캠핑 의자', '후보캠핑의자', '후보무료', '후보탈락', '후보없음', '후보저검색',
+            '후보트렌드', '후보대형', '후보소형']
+
+def cleanup():
+    for kwd in KEYWORDS:
+        volume_cache.delete(normalize_keyword(kwd))
+        doc_count_cache.delete(doc_count_key(kwd))
+
+def test_merge_candidates():
+    merged = merge_candidates({
+        '후보캠핑 의자': {'volume': None, 'trending': True},
+        '후보캠핑의자': {'volume': 3000, 'trending': False},
+        '  ': {'volume': None, 'trending': False}
+    })
+    assert list(merged) == ['후보캠핑의자']
+    assert merged['후보캠핑의자'] == {'keyword': '후보캠핑의자', 'volume': 3000, 'trending': True}
+
+def test_candidate_plan_uses_prior_information():
+    cleanup()
+    try:
+        row = {'pc': 1000, 'mobile': 4000, 'total': 5000, 'comp_idx': '낮음'}
+        volume_cache.put_many({normalize_keyword('후보무료'): row, normalize_keyword('후보탈락'): row})
+        store_doc_counts({'후보무료': 100, '후보탈락': 900000})
+        mark_absent([normalize_keyword('후보없음')])
+
+        candidates = {
+            '후보무료': {'volume': None, 'trending': False},     # 검색량/문서수 모두 캐시 → 비용 0
+            '후보탈락': {'volume': None, 'trending': False},     # 캐시로 이미 황금이 아님을 앎
+            '후보없음': {'volume': None, 'trending': False},     # keywordstool이 모르는 키워드
+            '후보저검색': {'volume': 300, 'trending': False},    # 시드 응답의 검색량이 기준 미만
+            '후보트렌드': {'volume': None, 'trending': True},    # 검색량 모름, 트렌드 가중치
+            '후보대형': {'volume': 50000, 'trending': False},
+            '후보소형': {'volume': 1200, 'trending': False},
+        }
+        cost = VOLUME_CALL_COST + DOC_CALL_COST
+        plan = CandidatePlan(candidates, budget=cost * 2)
+        print(plan.summary())
+        # 무료 후보가 먼저, 그다음 기대 가치/비용 순 (대형 > 트렌드 > 소형), 예산 2개 분량
+        assert plan.keywords == ['후보무료', '후보대형', '후보트렌드']
+        assert plan.trending == ['후보트렌드']
+        stats = plan.stats
+        assert stats['unique'] == 7 and stats['known_absent'] == 1 and stats['low_volume'] == 1
+        assert stats['known_filtered'] == 1 and stats['free'] == 1
+        assert stats['selected'] == 2 and stats['over_budget'] == 1
+        assert stats['planned_calls'] == round(cost * 2, 1)
+    finally:
+        cleanup()
+
+if __name__ == "__main__":
+    test_merge_candidates()
+    test_candidate_plan_uses_prior_information()
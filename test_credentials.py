@@ -0,0 +1,68 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'api'))
+
+from credentials import Credential, CredentialPool, load_open_api_credentials, reset_pools
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+def test_least_loaded_spread():
+    pool = CredentialPool("test", [Credential("key-a", "s"), Credential("key-b", "s"), Credential("key-c", "s")])
+    leased = [pool.acquire() for _ in range(3)]
+    assert sorted(c.key_id for c in leased) == ["key-a", "key-b", "key-c"]
+    for c in leased:
+        pool.release(c, FakeResponse(200))
+    print("Least-loaded spread OK")
+
+def test_throttled_key_rotates_out():
+    pool = CredentialPool("test", [Credential("key-a", "s"), Credential("key-b", "s")])
+    calls = []
+
+    def send(cred, retry):
+        calls.append(cred.key_id)
+        return FakeResponse(429, {"Retry-After": "30"}) if cred.key_id == "key-a" else FakeResponse(200)
+
+    # key-a가 먼저 선택되도록 사용량을 맞춤
+    pool.credentials[1].used_today = 1
+    res = pool.call(send)
+    assert res.status_code == 200 and calls == ["key-a", "key-b"]
+
+    # key-a는 쉬는 중이므로 다음 호출은 바로 key-b
+    calls.clear()
+    pool.call(send)
+    assert calls == ["key-b"]
+    print("Throttled key rotation OK:", pool.stats())
+
+def test_daily_quota():
+    pool = CredentialPool("test", [Credential("key-a", "s", daily_quota=1), Credential("key-b", "s", daily_quota=100)])
+    first = pool.acquire()
+    pool.release(first)
+    second = pool.acquire()
+    pool.release(second)
+    assert {first.key_id, second.key_id} == {"key-a", "key-b"}
+    assert pool.acquire().key_id == "key-b"
+    print("Daily quota OK")
+
+def test_numbered_env_loading():
+    os.environ.update({
+        "NAVER_CLIENT_ID": "id1", "NAVER_CLIENT_SECRET": "sec1",
+        "NAVER_CLIENT_ID_2": "id2", "NAVER_CLIENT_SECRET_2": "sec2",
+    })
+    try:
+        creds = load_open_api_credentials()
+        assert [c.key_id for c in creds] == ["id1", "id2"]
+        print("Numbered env loading OK")
+    finally:
+        for k in ("NAVER_CLIENT_ID", "NAVER_CLIENT_SECRET", "NAVER_CLIENT_ID_2", "NAVER_CLIENT_SECRET_2"):
+            os.environ.pop(k, None)
+        reset_pools()
+
+if __name__ == "__main__":
+    test_least_loaded_spread()
+    test_throttled_key_rotates_out()
+    test_daily_quota()
+    test_numbered_env_loading()
@@ -0,0 +1,43 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'api'))
+
+from doc_count_cache import (
+    adaptive_ttl, lookup_doc_counts, store_doc_counts, doc_count_cache, doc_count_key,
+    DOC_COUNT_DEFAULT_TTL, DOC_COUNT_MIN_TTL, DOC_COUNT_MAX_TTL
+)
+from naver_service import get_keyword_infos
+
+def test_adaptive_ttl():
+    now = time.time()
+    assert adaptive_ttl(None, 100, now) == DOC_COUNT_DEFAULT_TTL
+    # 하루 동안 변화 없음 → 최대 TTL
+    assert adaptive_ttl({'total': 5000, 'observed_at': now - 86400}, 5000, now) == DOC_COUNT_MAX_TTL
+    # 하루에 1% 변화 → 허용 오차 2%까지 약 이틀이지만 최대 TTL로 제한
+    slow = adaptive_ttl({'total': 10000, 'observed_at': now - 86400}, 10100, now)
+    # 한 시간에 두 배 → 최소 TTL
+    fast = adaptive_ttl({'total': 100, 'observed_at': now - 3600}, 200, now)
+    assert slow == DOC_COUNT_MAX_TTL and fast == DOC_COUNT_MIN_TTL
+    # 하루에 10% 변화 → 0.02 / (0.1 / 86400) = 17280초
+    mid = adaptive_ttl({'total': 9000, 'observed_at': now - 86400}, 10000, now)
+    assert abs(mid - 17280) < 1
+    print(f"Adaptive TTL OK: slow={slow:.0f}s, mid={mid:.0f}s, fast={fast:.0f}s")
+
+def test_bulk_lookup_served_from_cache():
+    keywords = ["문서수 캐시 테스트", "문서수캐시테스트2"]
+    store_doc_counts({keywords[0]: 1234, keywords[1]: 55})
+    hits, misses = lookup_doc_counts(keywords + ["캐시에 없는 키워드 xyz"])
+    assert hits == {keywords[0]: 1234, keywords[1]: 55} and misses == ["캐시에 없는 키워드 xyz"]
+
+    # 키가 없어도 캐시된 키워드는 API 호출 없이 반환
+    infos = get_keyword_infos(keywords)
+    assert infos[keywords[0]] == {'total': 1234}
+    for k in keywords:
+        doc_count_cache.delete(doc_count_key(k))
+    print("Bulk doc-count lookup OK")
+
+if __name__ == "__main__":
+    test_adaptive_ttl()
+    test_bulk_lookup_served_from_cache()
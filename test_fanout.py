@@ -0,0 +1,167 @@
+import os
+import sys
+import time
+import threading
+import http.server
+
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'api'))
+
+import fanout
+import serp
+from fanout import fan_out, FANOUT_WORKERS
+from http_client import http_get
+from resilience import get_breaker
+from naver_service import get_naver_section_order
+
+def test_fan_out_deadline_and_errors():
+    # 느린 작업은 fan_out이 돌아온 뒤에야 풀어 줍니다. fan_out이 기다렸다면 finished에 남습니다.
+    release = threading.Event()
+    finished = []
+
+    def blocked(name):
+        release.wait(5)
+        finished.append(name)
+        return 'late'
+
+    def boom():
+        raise ValueError("upstream failed")
+
+    try:
+        outcomes = fan_out({
+            'fast': lambda: 'done',
+            'slow': lambda: blocked('slow'),
+            'broken': boom,
+            'short': lambda: blocked('short')
+        }, deadline=0.5, timeouts={'short': 0.2})
+        finished_before_return = list(finished)
+    finally:
+        release.set()
+    print({name: o.meta() for name, o in outcomes.items()})
+    assert finished_before_return == []
+    assert outcomes['fast'].ok and outcomes['fast'].value == 'done'
+    assert outcomes['slow'].status == 'timeout' and outcomes['short'].status == 'timeout'
+    # short는 자기 타임아웃(0.2초)에서, slow는 전체 마감(0.5초)에서 끊김
+    assert outcomes['short'].elapsed_ms < outcomes['slow'].elapsed_ms
+    assert outcomes['broken'].status == 'error' and 'upstream failed' in outcomes['broken'].error
+
+def test_nested_fan_out_does_not_starve():
+    # 바깥 작업이 한 단계의 워커를 모두 잡아도 안쪽 fan_out은 다음 단계 풀에서 실행됨
+    def outer():
+        return fan_out({'inner': lambda: time.sleep(0.05) or 'ok'}, deadline=3.0)['inner'].status
+
+    start = time.monotonic()
+    outcomes = fan_out({i: outer for i in range(FANOUT_WORKERS * 2)}, deadline=5.0)
+    elapsed = time.monotonic() - start
+    print(f"{len(outcomes)} nested fan-outs in {elapsed:.2f}s")
+    # 안쪽 작업이 바깥 작업 뒤에 줄을 섰다면 안쪽 마감(3초)에 걸려 'timeout'이 됩니다.
+    assert all(o.ok and o.value == 'ok' for o in outcomes.values())
+
+class SlowMobileHandler(http.server.BaseHTTPRequestHandler):
+    # 모바일 응답은 테스트가 server.release를 설정할 때까지 보내지 않습니다.
+    def do_GET(self):
+        if self.path.startswith('/m'):
+            self.server.release.wait(5)
+            self.server.mobile_served.set()
+        body = '<section class="sc_new"><h2 class="api_title">블로그</h2></section><div id="footer"></div>'.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except OSError:
+            pass
+
+    def log_message(self, *args):
+        pass
+
+def start_server():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), SlowMobileHandler)
+    server.release, server.mobile_served = threading.Event(), threading.Event()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+def stop_server(server):
+    server.release.set()
+    server.shutdown()
+
+def test_partial_section_order():
+    server, base = start_server()
+    original = dict(serp.SERP_DEVICES)
+    serp.SERP_DEVICES['pc'] = (base + "/pc?query={keyword}", "pc-agent")
+    serp.SERP_DEVICES['mobile'] = (base + "/m?query={keyword}", "mobile-agent")
+    try:
+        result = get_naver_section_order("마감테스트", deadline=0.5)
+        print(result)
+        # 모바일 응답이 나가기 전에 PC 결과만으로 돌아옴
+        assert not server.mobile_served.is_set()
+        assert result == {'pc': ['블로그'], 'mobile': ['시간 초과']}
+    finally:
+        serp.SERP_DEVICES.update(original)
+        stop_server(server)
+
+def test_timed_out_task_releases_worker():
+    server, base = start_server()
+    finished = threading.Event()
+
+    def slow_call():
+        try:
+            return http_get(base + "/m", timeout=10)
+        finally:
+            finished.set()
+
+    try:
+        outcome = fan_out({'slow': slow_call}, deadline=0.3)['slow']
+        # HTTP 타임아웃이 남은 마감으로 줄어, 서버가 응답하기 전에 워커가 풀려남
+        freed = finished.wait(5)
+        print(f"slow call {outcome.status}, worker freed: {freed}")
+        assert outcome.status == 'timeout' and freed
+        assert not server.mobile_served.is_set()
+    finally:
+        stop_server(server)
+
+def test_deadline_releases_half_open_probe():
+    server, base = start_server()
+    url = base + "/m"
+    breaker = get_breaker(url)
+    breaker.reset_timeout = 0.1
+
+    def half_open():
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        time.sleep(0.15)
+
+    try:
+        # 마감이 이미 지난 작업: 시험 자리를 차지하지 않고 실패
+        half_open()
+        fanout._context.deadline = time.monotonic() - 1
+        try:
+            http_get(url)
+            assert False, "expected Timeout"
+        except requests.exceptions.Timeout:
+            pass
+        finally:
+            fanout._context.deadline = None
+        assert not breaker.probe_in_flight
+
+        # 시험 요청이 보내진 뒤 마감에 걸림: 결과 없이 끝나도 자리를 돌려줌
+        outcome = fan_out({'probe': lambda: http_get(url, timeout=10)}, deadline=0.3)['probe']
+        for _ in range(250):
+            if not breaker.probe_in_flight:
+                break
+            time.sleep(0.02)
+        print(f"probe {outcome.status}, breaker {breaker.state}")
+        assert outcome.status == 'timeout' and breaker.state == 'half_open'
+        assert not breaker.probe_in_flight and breaker.allow()
+    finally:
+        breaker.record_success()
+        breaker.reset_timeout = 30.0
+        stop_server(server)
+
+if __name__ == "__main__":
+    test_fan_out_deadline_and_errors()
+    test_nested_fan_out_does_not_starve()
+    test_partial_section_order()
+    test_timed_out_task_releases_worker()
+    test_deadline_releases_half_open_probe()
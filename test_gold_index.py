@@ -0,0 +1,107 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'api'))
+
+import gold_index
+import gold_jobs
+import index
+from gold_index import GoldIndex
+from fakes import isolated, memory_gold_index, fake_gold_upstreams, called
+
+def row(keyword, volume, docs, tier, platform='블로그'):
+    return {'keyword': keyword, 'pc_vol': volume // 2, 'mo_vol': volume // 2, 'volume': volume,
+            'docs': docs, 'comp': '낮음', 'platform': platform, 'score': round(volume / (docs + 1), 2),
+            'tier': tier, 'label': tier, 'trend': '➡️ 안정'}
+
+def test_gold_index_query_filters():
+    idx = GoldIndex(':memory:')
+    idx.upsert_many([
+        row('a', 5000, 100, 'ultra'), row('b', 3000, 2000, 'golden', '쇼핑'),
+        row('c', 1200, 30000, 'normal'), None
+    ])
+    assert [r['keyword'] for r in idx.query()] == ['a', 'b', 'c']
+    assert [r['keyword'] for r in idx.query(tiers=['golden', 'ultra'])] == ['a', 'b']
+    assert [r['keyword'] for r in idx.query(min_volume=2000, max_docs=1000)] == ['a']
+    assert [r['keyword'] for r in idx.query(platform='쇼핑')] == ['b']
+    assert idx.query(limit=1)[0]['comp'] == '낮음'
+
+    start = time.perf_counter()
+    for _ in range(100):
+        idx.query(tiers=['ultra', 'golden'], max_docs=5000)
+    print(f"query: {(time.perf_counter() - start) * 10:.2f}ms")
+
+def wait_for_job(job):
+    deadline = time.monotonic() + 5
+    while gold_jobs.get_gold_job(job['id'])['status'] in ('queued', 'running') and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return gold_jobs.get_gold_job(job['id'])
+
+@isolated(memory_gold_index)
+def test_discover_from_index_refreshes_lazily():
+    calls = fake_gold_upstreams()
+    idx = gold_index.get_gold_index()
+
+    # wait=False: 비어 있어도 요청 안에서 분석하지 않고 갱신 작업만 등록
+    results, job = gold_index.discover_from_index(wait=False)
+    assert results == [] and job is not None
+    assert gold_index.request_index_refresh()['id'] == job['id']
+    assert wait_for_job(job)['status'] == 'done'
+    assert idx.stats()['rows'] == 3
+
+    # 신선하면 파이프라인을 부르지 않음
+    calls.clear()
+    results, job = gold_index.discover_from_index()
+    assert [r['keyword'] for r in results] == ['빠른키워드', '느린키워드'] and job is None
+    assert calls == []
+
+    # 오래된 행(느린키워드)만 작업에서 다시 분석, 후보에서 빠진 키워드(경쟁키워드)는 정리
+    old = time.time() - gold_index.GOLD_INDEX_MAX_AGE - 10
+    idx.upsert_many([r for r in idx.query() if r['keyword'] != '빠른키워드'], fetched_at=old)
+    fast_fetched = idx.fresh_results()['빠른키워드']['fetched_at']
+    calls = fake_gold_upstreams(candidates=['빠른키워드', '느린키워드', '새키워드'])
+    results, job = gold_index.discover_from_index()
+    assert [r['keyword'] for r in results] == ['빠른키워드', '느린키워드']
+    assert wait_for_job(job)['status'] == 'done'
+    assert sorted(called(calls, 'docs')) == ['느린키워드', '새키워드']
+    stats = idx.stats()
+    assert stats['rows'] == 3 and stats['stale_rows'] == 0
+    assert '경쟁키워드' not in {r['keyword'] for r in idx.query()}
+    # 재사용한 행은 다시 쓰지 않음
+    assert idx.fresh_results()['빠른키워드']['fetched_at'] == fast_fetched
+
+@isolated(memory_gold_index)
+def test_cold_index_route():
+    fake_gold_upstreams()
+    client = index.app.test_client()
+    # 기본: 비어 있으면 지금 분석해 목록을 돌려주고 인덱스에 저장
+    response = client.get('/api/gold/discover')
+    assert response.status_code == 200
+    assert [r['keyword'] for r in response.get_json()] == ['빠른키워드', '느린키워드']
+    assert gold_index.get_gold_index().stats()['rows'] == 3
+
+@isolated(memory_gold_index)
+def test_cold_index_route_async():
+    fake_gold_upstreams()
+    client = index.app.test_client()
+    response = client.get('/api/gold/discover?async=1')
+    assert response.status_code == 202 and response.get_json() == []
+    job_id = response.headers['Location'].rsplit('/', 1)[1]
+    assert wait_for_job({'id': job_id})['status'] == 'done'
+    assert [r['keyword'] for r in client.get('/api/gold/discover').get_json()] == ['빠른키워드', '느린키워드']
+
+@isolated(memory_gold_index)
+def test_gold_index_route():
+    idx = gold_index.get_gold_index()
+    idx.upsert_many([row('a', 5000, 100, 'ultra'), row('b', 3000, 2000, 'golden', '쇼핑')])
+    data = index.app.test_client().get('/api/gold/index?tier=golden&platform=쇼핑').get_json()
+    assert [r['keyword'] for r in data['items']] == ['b'] and data['rows'] == 2
+    assert len(index.app.test_client().get('/api/gold/index?limit=-1').get_json()['items']) == 1
+
+if __name__ == "__main__":
+    test_gold_index_query_filters()
+    test_discover_from_index_refreshes_lazily()
+    test_cold_index_route()
+    test_cold_index_route_async()
+    test_gold_index_route()
@@ -0,0 +1,218 @@
+import os
+import sys
+import json
+import time
+import threading
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'api'))
+
+import gold_pipeline
+import gold_jobs
+import index
+from fakes import GOLD_DOCS, patch, isolated, memory_gold_index, fake_gold_upstreams, called
+
+def install_fakes():
+    return fake_gold_upstreams(section_delays={'느린키워드': 1.0, '빠른키워드': 0.1})
+
+@isolated(memory_gold_index)
+def test_gold_job_polling_returns_partial_results():
+    install_fakes()
+    client = index.app.test_client()
+    response = client.post('/api/gold/jobs', json={})
+    assert response.status_code == 202
+    job_id = response.get_json()['job_id']
+
+    saw_partial = False
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        job = client.get(f'/api/gold/jobs/{job_id}').get_json()
+        assert 'state' not in job
+        if job['status'] == 'running' and job['partial'] and job['results'] is None:
+            saw_partial = True
+        if job['status'] == 'done':
+            break
+        time.sleep(0.05)
+    print(job['progress'], [r['keyword'] for r in job['results']])
+    assert job['status'] == 'done' and saw_partial
+    assert [r['keyword'] for r in job['results']] == ['빠른키워드', '느린키워드']
+    assert job['progress'] == {'stage': 'enrich', 'done': 2, 'total': 2}
+    assert job['counters']['survivors'] == 2
+    # 체크포인트에는 검색량 응답 전체가 아니라 통과한 후보만 남습니다.
+    state = gold_jobs.get_job_store().get(job_id)['state']
+    assert 'vol_map' not in state and len(state['qualified']) == 3
+    assert client.get('/api/gold/jobs/unknown').status_code == 404
+
+@isolated(memory_gold_index)
+def test_gold_job_resumes_from_checkpoint():
+    calls = install_fakes()
+    store = gold_jobs.MemoryJobStore()
+    job = gold_jobs.new_job()
+    # 후보/검색량 단계와 키워드 하나의 분석(섹션 조회까지)이 끝난 뒤 워커가 죽은 상황
+    job['status'] = 'running'
+    job['heartbeat'] = time.time() - gold_jobs.GOLD_JOB_STALE - 1
+    job['state'] = {
+        'candidates': list(GOLD_DOCS), 'realtime': [],
+        'qualified': [[kw, {'pc': 10, 'mobile': 10, 'total': 5000}] for kw in GOLD_DOCS],
+        'scored': {'느린키워드': dict(gold_pipeline.score_candidates({'느린키워드': 200}, {'느린키워드': {'total': 5000}},
+                                                                  set())['느린키워드'], platform='블로그')}
+    }
+    calls.clear()
+    store.create(job)
+    store.dequeue(0)  # 원래 워커가 가져간 상태
+
+    assert gold_jobs.requeue_stale_jobs(store) == [job['id']]
+    gold_jobs.run_gold_job(store.dequeue(0), store)
+    finished = store.get(job['id'])
+    assert finished['status'] == 'done' and finished['attempts'] == 1
+    assert [r['keyword'] for r in finished['results']] == ['빠른키워드', '느린키워드']
+    assert 'collect' not in calls and '느린키워드' not in called(calls, 'docs')
+    assert '느린키워드' not in called(calls, 'sections')
+    assert called(calls, 'docs').count('경쟁키워드') == 1 and '빠른키워드' in called(calls, 'sections')
+
+@isolated(memory_gold_index)
+def test_requeued_job_stops_the_slow_worker():
+    install_fakes()
+    store = gold_jobs.MemoryJobStore()
+    job = gold_jobs.new_job()
+    store.create(job)
+    stolen = []
+    lock = threading.Lock()
+
+    def slow_sections(kwd):
+        # 첫 워커가 살아 있지만 하트비트가 끊긴 것으로 보여 다시 큐에 들어간 상황
+        with lock:
+            if not stolen:
+                stale = store.get(job['id'])
+                stale['heartbeat'] = 0
+                store.save(stale)
+                stolen.extend(gold_jobs.requeue_stale_jobs(store))
+        return {'pc': [], 'mobile': ['블로그']}
+    patch(gold_pipeline, 'get_naver_section_order', slow_sections)
+
+    gold_jobs.run_gold_job(store.dequeue(0), store)
+    after_first = store.get(job['id'])
+    # 임대를 잃은 첫 워커는 멈추고 결과를 쓰지 않음
+    assert stolen == [job['id']] and after_first['status'] == 'queued'
+    assert after_first['results'] is None and after_first['lease'] is None
+
+    gold_jobs.run_gold_job(store.dequeue(0), store)
+    finished = store.get(job['id'])
+    assert finished['status'] == 'done' and finished['attempts'] == 2
+    assert [r['keyword'] for r in finished['results']] == ['빠른키워드', '느린키워드']
+    with_old_lease = dict(finished, lease='old-lease')
+    try:
+        store.save(with_old_lease, expected_lease='old-lease')
+        assert False, "stale lease must not overwrite the job"
+    except gold_jobs.LeaseLost:
+        pass
+    print("Slow worker lost its lease and stopped")
+
+class FakeRedis:
+    """
+    RedisJobStore가 쓰는 명령만 흉내 낸 단일 스레드용 가짜 클라이언트.
+    """
+
+    def __init__(self):
+        self.values, self.lists, self.sets = {}, {}, {}
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value.encode() if isinstance(value, str) else value
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def lpush(self, key, value):
+        self.lists.setdefault(key, []).insert(0, value.encode())
+
+    def blmove(self, source, destination, timeout, src, dest):
+        items = self.lists.get(source)
+        if not items:
+            return None
+        item = items.pop() if src == "RIGHT" else items.pop(0)
+        target = self.lists.setdefault(destination, [])
+        target.insert(0, item) if dest == "LEFT" else target.append(item)
+        return item
+
+    def lrem(self, key, count, value):
+        items = self.lists.get(key, [])
+        if value.encode() in items:
+            items.remove(value.encode())
+
+    def lrange(self, key, start, end):
+        return list(self.lists.get(key, []))
+
+    def sadd(self, key, value):
+        self.sets.setdefault(key, set()).add(value.encode())
+
+    def srem(self, key, value):
+        self.sets.get(key, set()).discard(value.encode())
+
+    def smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.buffered = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def watch(self, key):
+        pass
+
+    def multi(self):
+        self.buffered = []
+
+    def __getattr__(self, name):
+        command = getattr(self.client, name)
+        if self.buffered is None:
+            # WATCH 이후 MULTI 전에는 즉시 실행 (redis-py와 같음)
+            return command
+        return lambda *args, **kwargs: self.buffered.append((command, args, kwargs))
+
+    def execute(self):
+        for command, args, kwargs in self.buffered or []:
+            command(*args, **kwargs)
+
+@isolated(memory_gold_index)
+def test_redis_store_acks_and_recovers_dequeued_jobs():
+    install_fakes()
+    fake = FakeRedis()
+    store = gold_jobs.RedisJobStore(client=fake)
+
+    # 꺼낸 뒤 맡기 전에 워커가 죽은 작업은 처리 중 목록에 남았다가 다시 큐로
+    lost = gold_jobs.new_job()
+    store.create(lost)
+    assert store.dequeue(1) == lost['id'] and store.unacked_jobs() == [lost['id']]
+    assert gold_jobs.requeue_stale_jobs(store) == []
+    stale = store.get(lost['id'])
+    stale['updated_at'] = 0
+    fake.set(store._key(lost['id']), json.dumps(stale))
+    assert gold_jobs.requeue_stale_jobs(store) == [lost['id']]
+    assert store.unacked_jobs() == []
+
+    # 다시 꺼내 실행하면 맡는 즉시 ack되고 끝까지 저장됨
+    gold_jobs.run_gold_job(store.dequeue(1), store)
+    finished = store.get(lost['id'])
+    assert finished['status'] == 'done' and finished['owner'] and store.unacked_jobs() == []
+    assert [r['keyword'] for r in finished['results']] == ['빠른키워드', '느린키워드']
+    assert store.running_jobs() == []
+
+    # 이미 끝난 작업이 한 번 더 꺼내지면 실행하지 않고 ack만
+    store.requeue(lost['id'])
+    gold_jobs.run_gold_job(store.dequeue(1), store)
+    assert store.get(lost['id'])['attempts'] == 1 and store.unacked_jobs() == []
+    print("Redis store moves jobs through the processing list")
+
+if __name__ == "__main__":
+    test_gold_job_polling_returns_partial_results()
+    test_gold_job_resumes_from_checkpoint()
+    test_requeued_job_stops_the_slow_worker()
+    test_redis_store_acks_and_recovers_dequeued_jobs()
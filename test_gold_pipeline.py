@@ -0,0 +1,106 @@
+import os
+import sys
+import json
+import time
+import threading
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'api'))
+
+import gold_pipeline
+import index
+from fakes import GOLD_DOCS, patch, isolated, memory_gold_index, fake_gold_upstreams, called
+
+def install_fakes(hold=None):
+    return fake_gold_upstreams(candidates=list(GOLD_DOCS) + ['저검색량'], trending={'빠른키워드'},
+                               volumes={'저검색량': 10}, doc_delay=0.05, hold=hold)
+
+@isolated()
+def test_gold_events_stream_progressively():
+    # 느린키워드의 섹션 조회는 첫 키워드 이벤트를 받은 뒤에야 끝나도록 붙잡아 둡니다.
+    slow = threading.Event()
+    calls = install_fakes(hold={'느린키워드': slow})
+    state = {}
+    seen = []
+    slow_done_at_first_keyword = None
+    for event in gold_pipeline.discover_gold_events('', state):
+        if event['event'] == 'keyword' and slow_done_at_first_keyword is None:
+            slow_done_at_first_keyword = '느린키워드' in called(calls, 'sections_done')
+            slow.set()
+        seen.append((event['event'], event))
+    print([(name, event.get('stage')) for name, event in seen])
+    stages = [event['stage'] for name, event in seen if name == 'stage']
+    assert stages == ['candidates', 'volumes', 'docs', 'filter', 'enrich'] and seen[-1][0] == 'done'
+    assert seen[1][1]['count'] == 3  # 저검색량 제외
+    keywords = [e['item']['keyword'] for name, e in seen if name == 'keyword']
+    assert keywords == ['빠른키워드', '느린키워드']
+    # 경쟁키워드는 문서수 필터에서 걸러져 섹션을 조회하지 않습니다.
+    assert sorted(called(calls, 'sections')) == ['느린키워드', '빠른키워드']
+    # 빠른 키워드는 느린 키워드의 섹션 조회가 끝나기 전에 나옵니다.
+    assert slow_done_at_first_keyword is False
+    final = seen[-1][1]['results']
+    assert [r['keyword'] for r in final] == ['빠른키워드', '느린키워드']
+    assert final[0]['trend'] == '🚀 급상승' and final[0]['platform'] == '블로그'
+    counters = seen[-1][1]['counters']
+    print(counters)
+    assert counters['qualified'] == 3 and counters['survivors'] == 2 and counters['enriched'] == 2
+    assert counters['serp_fetches_saved'] == 2
+    assert state['scored']['경쟁키워드']['platform'] == gold_pipeline.NOT_ENRICHED
+
+@isolated()
+def test_gold_enrich_only_top_k():
+    calls = install_fakes()
+    patch(gold_pipeline, 'GOLD_ENRICH_TOP_K', 1)
+    events = list(gold_pipeline.discover_gold_events())
+    assert called(calls, 'sections') == ['빠른키워드']
+    final = events[-1]['results']
+    assert [(r['keyword'], r['platform']) for r in final] == [('빠른키워드', '블로그'), ('느린키워드', '-')]
+
+@isolated()
+def test_gold_doc_count_failure_is_dropped():
+    fake_gold_upstreams(docs=dict(GOLD_DOCS, 빠른키워드=None))
+    events = list(gold_pipeline.discover_gold_events())
+    assert [r['keyword'] for r in events[-1]['results']] == ['느린키워드']
+    assert events[-1]['counters']['doc_failed'] == 1
+
+@isolated()
+def test_gold_stream_close_cancels_pending_lookups():
+    keywords = [f"후보{i}" for i in range(50)]
+    calls = fake_gold_upstreams(candidates=keywords, doc_delay=0.1)
+    events = gold_pipeline.discover_gold_events()
+    for event in events:
+        if event['event'] == 'progress':
+            break
+    # 클라이언트가 연결을 끊으면 Flask가 제너레이터를 닫습니다.
+    events.close()
+    time.sleep(0.3)
+    lookups = called(calls, 'docs')
+    print(f"doc lookups after close: {len(lookups)} of {len(keywords)}")
+    assert len(lookups) <= 2 * gold_pipeline.GOLD_SCORING_WORKERS
+
+@isolated(memory_gold_index)
+def test_gold_discover_ndjson_and_sse():
+    install_fakes()
+    client = index.app.test_client()
+
+    response = client.get('/api/gold/discover?stream=ndjson')
+    assert response.mimetype == 'application/x-ndjson'
+    events = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert events[-1]['event'] == 'done' and len(events[-1]['results']) == 2
+
+    # 두 번째 스트림은 인덱스에 저장된 키워드를 먼저 보내고 같은 행을 다시 보내지 않음
+    calls = install_fakes()
+    body = client.get('/api/gold/discover?stream=sse').get_data(as_text=True)
+    kinds = [line.split(': ', 1)[1] for line in body.splitlines() if line.startswith('event: ')]
+    assert kinds[:3] == ['keyword', 'keyword', 'stage'] and kinds.count('keyword') == 2
+    assert 'event: done' in body and called(calls, 'sections') == []
+
+    plain = client.get('/api/gold/discover').get_json()
+    assert [r['keyword'] for r in plain] == ['빠른키워드', '느린키워드']
+    assert client.get('/api/gold/discover?stream=xml').status_code == 400
+
+if __name__ == "__main__":
+    test_gold_events_stream_progressively()
+    test_gold_enrich_only_top_k()
+    test_gold_doc_count_failure_is_dropped()
+    test_gold_stream_close_cancels_pending_lookups()
+    test_gold_discover_ndjson_and_sse()
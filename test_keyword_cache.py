@@ -0,0 +1,111 @@
+import os
+import sys
+import time
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'api'))
+
+import naver_service
+from keyword_cache import TieredCache, normalize_keyword, volume_cache
+from naver_service import get_search_volumes_for_keywords, get_search_volume, harvest_volume_rows
+from volume_planner import mark_absent
+from fakes import patch, isolated
+
+def make_cache(**kwargs):
+    path = os.path.join(tempfile.mkdtemp(), "cache.sqlite3")
+    return TieredCache("test_volumes", kwargs.pop("ttl", 60), db_path=path, **kwargs), path
+
+def test_bulk_get_put_and_persistence():
+    cache, path = make_cache()
+    cache.put_many({normalize_keyword("캠핑 의자"): {"total": 100}, "캠핑": {"total": 5000}})
+    found = cache.get_many(["캠핑의자", "캠핑", "없는키워드"])
+    assert found == {"캠핑의자": {"total": 100}, "캠핑": {"total": 5000}}
+    assert cache.misses == 1
+
+    # 새 인스턴스(= 재시작)에서도 SQLite 계층에서 읽힘
+    reopened = TieredCache("test_volumes", 60, db_path=path)
+    assert reopened.get("캠핑") == {"total": 5000}
+    assert reopened.hits["disk"] == 1
+    print(f"Bulk get/put + persistence OK: {reopened.stats()}")
+
+def test_lru_eviction_and_disk_cap():
+    cache, _ = make_cache(max_memory_items=2, max_disk_items=3)
+    for i in range(5):
+        cache.put(f"k{i}", i)
+    stats = cache.stats()
+    assert stats["memory_items"] == 2 and stats["disk_items"] == 3
+    assert cache.get("k0") is None and cache.get("k4") == 4
+    print(f"Eviction OK: {stats}")
+
+def test_ttl_expiry():
+    cache, _ = make_cache(ttl=0.1)
+    cache.put("short", 1)
+    assert cache.get("short") == 1
+    time.sleep(0.15)
+    assert cache.get("short") is None
+    print("TTL expiry OK")
+
+def test_batch_lookup_served_from_cache():
+    # 캐시에 있으면 Ad API 키가 없어도 결과가 나와야 함 (업스트림 호출 없음)
+    volume_cache.put_many({
+        "테스트캐시키워드": {'original_keyword': '테스트캐시키워드', 'pc': 10, 'mobile': 90, 'total': 100, 'comp_idx': '낮음'}
+    })
+    result = get_search_volumes_for_keywords(["테스트 캐시키워드"])
+    assert result["테스트캐시키워드"]["total"] == 100
+    assert get_search_volume("테스트캐시키워드") == {'pc': 10, 'mobile': 90, 'total': 100, 'comp_idx': '낮음'}
+    volume_cache.delete("테스트캐시키워드")
+    print("Batch lookup served from cache OK")
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def json(self):
+        return {'keywordList': self.rows}
+
+@isolated()
+def test_partial_cache_entry_is_a_miss():
+    calls = []
+
+    def fake_keywordstool(hint):
+        calls.append(hint)
+        return FakeResponse([{'relKeyword': '부분캐시키워드', 'monthlyPcQcCnt': 10,
+                              'monthlyMobileQcCnt': 20, 'compIdx': '높음'}])
+    patch(naver_service, 'call_keywordstool', fake_keywordstool)
+
+    # 필드가 빠진 항목은 0으로 채워 돌려주지 않고 다시 조회
+    volume_cache.put("부분캐시키워드", {'total': 30})
+    assert get_search_volume("부분캐시키워드") == {'pc': 10, 'mobile': 20, 'total': 30, 'comp_idx': '높음'}
+    assert calls == ['부분캐시키워드']
+    assert get_search_volumes_for_keywords(["부분캐시키워드"])["부분캐시키워드"]['comp_idx'] == '높음'
+
+    # API가 모른다고 기록된 키워드는 다시 묻지 않음
+    mark_absent(["없는캐시키워드"])
+    assert get_search_volume("없는캐시키워드") == {'pc': 0, 'mobile': 0, 'total': 0}
+    assert calls == ['부분캐시키워드']
+    for key in ("부분캐시키워드", "없는캐시키워드"):
+        volume_cache.delete(key)
+    print("Partial cache entries are refetched")
+
+def test_harvest_all_rows():
+    # keywordstool 응답 전체 행이 캐시에 들어가 이후 조회는 로컬에서 처리
+    rows = harvest_volume_rows([
+        {'relKeyword': '수집테스트', 'monthlyPcQcCnt': 100, 'monthlyMobileQcCnt': 400, 'compIdx': '중간'},
+        {'relKeyword': '수집테스트 추천', 'monthlyPcQcCnt': '< 10', 'monthlyMobileQcCnt': 30, 'compIdx': '낮음'},
+    ])
+    assert len(rows) == 2
+    result = get_search_volumes_for_keywords(["수집테스트 추천", "수집테스트"])
+    assert result["수집테스트추천"]["total"] == 30 and result["수집테스트"]["total"] == 500
+    for key in ("수집테스트", "수집테스트추천"):
+        volume_cache.delete(key)
+    print("Harvested rows served locally OK")
+
+if __name__ == "__main__":
+    test_bulk_get_put_and_persistence()
+    test_lru_eviction_and_disk_cap()
+    test_ttl_expiry()
+    test_batch_lookup_served_from_cache()
+    test_partial_cache_entry_is_a_miss()
+    test_harvest_all_rows()
@@ -0,0 +1,55 @@
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'api'))
+
+from parse_pool import run_parse, get_parse_pool, shutdown_parse_pool
+from serp import extract_serp
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'serp')
+
+def load_pages():
+    pages = []
+    for name in sorted(os.listdir(FIXTURE_DIR)):
+        with open(os.path.join(FIXTURE_DIR, name), encoding='utf-8') as f:
+            pages.append(f.read())
+    return pages
+
+def test_worker_results_match_inline():
+    os.environ["PARSE_WORKERS"] = "2"
+    shutdown_parse_pool()
+    try:
+        pool = get_parse_pool()
+        assert pool is not None and pool._mp_context.get_start_method() in ('forkserver', 'spawn')
+        pages = load_pages() * 4
+        start = time.perf_counter()
+        # 스레드는 HTML만 넘기고 워커 프로세스가 파싱
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            offloaded = list(executor.map(lambda html: run_parse(extract_serp, html, '캠핑', 'pc'), pages))
+        pooled = time.perf_counter() - start
+
+        start = time.perf_counter()
+        inline = [extract_serp(html, '캠핑', 'pc') for html in pages]
+        serial = time.perf_counter() - start
+        print(f"{len(pages)} pages: worker pool {pooled:.2f}s, in-process {serial:.2f}s ({os.cpu_count()} cores)")
+        assert offloaded == inline
+    finally:
+        shutdown_parse_pool()
+        os.environ.pop("PARSE_WORKERS", None)
+
+def test_disabled_by_default():
+    os.environ.pop("PARSE_WORKERS", None)
+    shutdown_parse_pool()
+    try:
+        assert get_parse_pool() is None
+        assert run_parse(len, "abc") == 3
+        print("No PARSE_WORKERS runs in-process OK")
+    finally:
+        shutdown_parse_pool()
+        os.environ.pop("PARSE_WORKERS", None)
+
+if __name__ == "__main__":
+    test_worker_results_match_inline()
+    test_disabled_by_default()
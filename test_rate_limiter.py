@@ -0,0 +1,48 @@
+import os
+import sys
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'api'))
+
+from rate_limiter import TokenBucket, resolve_upstream, get_limiter
+
+def test_bucket_threads():
+    # 버스트 5 이후로는 초당 20회를 넘지 않아야 함
+    bucket = TokenBucket(rate=20, burst=5)
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        list(executor.map(lambda _: bucket.acquire(), range(25)))
+    elapsed = time.monotonic() - start
+    print(f"25 acquires across 10 threads: {elapsed:.2f}s (expected ~1.0s)")
+    assert elapsed >= 0.95
+
+def test_bucket_async():
+    bucket = TokenBucket(rate=50, burst=10)
+
+    async def run():
+        await asyncio.gather(*(bucket.acquire_async() for _ in range(60)))
+
+    start = time.monotonic()
+    asyncio.run(run())
+    elapsed = time.monotonic() - start
+    print(f"60 async acquires: {elapsed:.2f}s (expected ~1.0s)")
+    assert elapsed >= 0.95
+
+def test_upstream_resolution():
+    assert resolve_upstream("https://api.naver.com/keywordstool?hintKeywords=a") == "api.naver.com/keywordstool"
+    assert resolve_upstream("https://openapi.naver.com/v1/search/blog?query=a") == "openapi.naver.com"
+    assert resolve_upstream("https://m.search.naver.com/search.naver?query=a") == "m.search.naver.com"
+    assert resolve_upstream("https://www.nate.com/js/data/jsonLiveKeywordDataV1.js") is None
+    # 자격증명별로 버킷이 분리되어야 함
+    a = get_limiter("https://openapi.naver.com/v1/search/blog", "id-a")
+    b = get_limiter("https://openapi.naver.com/v1/search/news", "id-b")
+    assert a is not b
+    assert a is get_limiter("https://openapi.naver.com/v1/search/kin", "id-a")
+    print("Upstream resolution OK")
+
+if __name__ == "__main__":
+    test_bucket_threads()
+    test_bucket_async()
+    test_upstream_resolution()
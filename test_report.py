@@ -0,0 +1,89 @@
+import os
+import sys
+import time
+import threading
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'api'))
+# 실제 캐시 파일에 테스트 키워드를 남기지 않도록 (이 파일만 실행할 때)
+os.environ.setdefault("KEYWORD_CACHE_DB", "off")
+
+import index
+from doc_count_cache import lookup_doc_counts
+from fakes import patch, isolated, memory_doc_counts
+
+KEYWORD = "리포트테스트"
+
+def install_fakes():
+    calls = {'blog': 0, 'ad': 0, 'volume': 0, 'doc_misses': [], 'running': 0, 'peak': 0}
+    lock = threading.Lock()
+
+    def slow(value):
+        # 동시에 실행 중인 업스트림 호출 수를 기록 (벽시계 시간 대신 병렬 여부를 확인)
+        with lock:
+            calls['running'] += 1
+            calls['peak'] = max(calls['peak'], calls['running'])
+        time.sleep(0.2)
+        with lock:
+            calls['running'] -= 1
+        return value
+
+    def fake_search_blog(keyword, display=10, sort='sim'):
+        calls['blog'] += 1
+        return slow( {'total': 500, 'items': [
+            {'title': f'<b>{keyword}</b> {i}', 'description': '설명', 'bloggername': 'tester',
+             'postdate': '20200101', 'link': ''} for i in range(10)]})
+    def fake_ad(keyword):
+        calls['ad'] += 1
+        return slow([{'keyword': keyword, 'pc': 10, 'mobile': 40, 'total': 50, 'comp_idx': '낮음'},
+                     {'keyword': '연관A', 'pc': 100, 'mobile': 200, 'total': 300, 'comp_idx': '높음'}])
+    def fake_volume(keyword):
+        calls['volume'] += 1
+        return {'pc': 10, 'mobile': 40, 'total': 50, 'comp_idx': '낮음'}
+    async def fake_gather(keywords):
+        hits, misses = lookup_doc_counts(keywords)
+        calls['doc_misses'].extend(misses)
+        return {kwd: {'total': hits.get(kwd, 7)} for kwd in keywords}
+    patch(index, 'search_blog', fake_search_blog)
+    patch(index, 'get_related_keywords_from_ad_api', fake_ad)
+    patch(index, 'get_search_volume', fake_volume)
+    patch(index, 'get_related_keywords', lambda keyword: slow(['연관B']))
+    patch(index, 'get_search_volumes_for_keywords', lambda kws: {kw: {'pc': 1, 'mobile': 2, 'total': 3} for kw in kws})
+    patch(index, 'gather_keyword_infos', fake_gather)
+    patch(index, 'get_naver_section_order', lambda keyword: slow({'pc': ['블로그'], 'mobile': ['쇼핑']}))
+    patch(index, 'get_blog_rank', lambda keyword: ['B', 'C'])
+    return calls
+
+@isolated(memory_doc_counts)
+def test_report_shares_upstream_calls():
+    calls = install_fakes()
+    data = index.app.test_client().get(f'/api/report?q={KEYWORD}').get_json()
+    print(data['sources'], f"peak concurrent upstream calls: {calls['peak']}")
+    assert data['parts'] == list(index.REPORT_PARTS)
+    assert data['summary']['doc_count'] == 500 and data['summary']['total_vol'] == 50
+    assert data['sections']['pc'] == ['블로그'] and data['blog_ranks'] == ['B', 'C']
+    assert len(data['difficulty']['top_posts']) == 5
+    assert len(data['blog']) == 10 and '<b>' not in data['blog'][0]['title']
+    assert {item['keyword'] for item in data['related']} == {KEYWORD, '연관A', '연관B'}
+    # 블로그 검색과 keywordstool은 한 번씩만, 원 키워드 문서수는 블로그 검색 결과를 재사용
+    assert calls['blog'] == 1 and calls['ad'] == 1
+    assert KEYWORD not in calls['doc_misses']
+    # 블로그 검색, keywordstool, 섹션 순서, 연관 스크랩이 동시에 진행됨
+    assert calls['peak'] >= 3
+
+@isolated(memory_doc_counts)
+def test_report_parts_selector():
+    calls = install_fakes()
+    client = index.app.test_client()
+    data = client.get(f'/api/report?q={KEYWORD}&parts=sections,ranks').get_json()
+    assert set(data) == {'keyword', 'parts', 'sections', 'blog_ranks', 'sources'}
+    assert calls['blog'] == 0 and calls['ad'] == 0 and calls['volume'] == 0
+    # 대시보드는 연관 키워드만 따로 요청해 요약/섹션을 먼저 그립니다.
+    data = client.get(f'/api/report?q={KEYWORD}&parts=related').get_json()
+    assert {item['keyword'] for item in data['related']} == {KEYWORD, '연관A', '연관B'}
+    assert calls['blog'] == 0 and calls['volume'] == 0
+    response = client.get(f'/api/report?q={KEYWORD}&parts=summary,bogus')
+    assert response.status_code == 400
+
+if __name__ == "__main__":
+    test_report_shares_upstream_calls()
+    test_report_parts_selector()
@@ -0,0 +1,105 @@
+import os
+import sys
+import time
+import threading
+import http.server
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'api'))
+
+from http_client import http_get
+from resilience import RetryPolicy, CircuitBreaker, CircuitOpenError, parse_retry_after, get_breaker
+
+class FlakyHandler(http.server.BaseHTTPRequestHandler):
+    # 경로별 응답 시나리오: 앞에서부터 하나씩 소비
+    scripts = {}
+    hits = {}
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        FlakyHandler.hits[path] = FlakyHandler.hits.get(path, 0) + 1
+        script = FlakyHandler.scripts.get(path, [])
+        status, headers = script.pop(0) if script else (200, {})
+        self.send_response(status)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    def log_message(self, *args):
+        pass
+
+def start_server():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+def test_retry_and_auth():
+    base = start_server()
+    fast = RetryPolicy(max_retries=3, base_delay=0.01)
+
+    # 503 → 429(Retry-After) → 200
+    FlakyHandler.scripts['/flaky'] = [(503, {}), (429, {'Retry-After': '0'}), (200, {})]
+    res = http_get(base + '/flaky', retry=fast)
+    print(f"flaky: status={res.status_code}, hits={FlakyHandler.hits['/flaky']}")
+    assert res.status_code == 200 and FlakyHandler.hits['/flaky'] == 3
+
+    # 401은 재시도하지 않음
+    FlakyHandler.scripts['/auth'] = [(401, {})] * 5
+    res = http_get(base + '/auth', retry=fast)
+    print(f"auth: status={res.status_code}, hits={FlakyHandler.hits['/auth']}")
+    assert res.status_code == 401 and FlakyHandler.hits['/auth'] == 1
+
+def test_retry_after_parsing():
+    assert parse_retry_after('3') == 3.0
+    assert parse_retry_after(None) is None
+    assert RetryPolicy(max_retries=1, max_retry_after=5).delay(0, type('R', (), {'headers': {'Retry-After': '120'}})()) == 5
+    print("Retry-After parsing OK")
+
+def test_circuit_breaker():
+    breaker = CircuitBreaker('test', failure_threshold=3, reset_timeout=0.2)
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == 'open' and not breaker.allow()
+
+    time.sleep(0.25)
+    assert breaker.allow()          # half-open 시험 요청 1건
+    assert not breaker.allow()      # 시험 중에는 나머지 차단
+    breaker.record_success()
+    assert breaker.state == 'closed' and breaker.allow()
+    print("Circuit breaker transitions OK")
+
+def test_lost_probe_expires():
+    breaker = CircuitBreaker('lost-probe', failure_threshold=1, reset_timeout=0.2)
+    breaker.record_failure()
+    time.sleep(0.25)
+    assert breaker.allow()          # 시험 요청이 결과를 알리지 못하고 사라짐 (취소/스레드 중단)
+    assert not breaker.allow() and breaker.probe_in_flight
+    time.sleep(0.25)
+    assert breaker.allow()          # reset_timeout이 지난 시험은 잃어버린 것으로 보고 새 시험 허용
+    breaker.release_probe()         # 결과 없이 끝난 요청이 자리를 돌려줌
+    assert breaker.state == 'half_open' and not breaker.probe_in_flight
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    print("Lost half-open probe expires OK")
+
+def test_fail_fast_when_open():
+    url = "http://upstream.invalid/unreachable"
+    breaker = get_breaker(url)
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    start = time.monotonic()
+    try:
+        http_get(url)
+        assert False, "expected CircuitOpenError"
+    except CircuitOpenError as e:
+        print(f"Failed fast in {time.monotonic() - start:.3f}s: {e}")
+
+if __name__ == "__main__":
+    test_retry_and_auth()
+    test_retry_after_parsing()
+    test_circuit_breaker()
+    test_lost_probe_expires()
+    test_fail_fast_when_open()
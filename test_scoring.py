@@ -0,0 +1,108 @@
+import os
+import sys
+import time
+import random
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'api'))
+
+from scoring import (
+    gold_scores, gold_tiers, comp_labels, competition_rates, shopping_insights,
+    score_keywords, score_frame
+)
+
+# 기존 행 단위 if/else 구현 (동일성 비교용)
+def legacy_tier(doc_count, score):
+    if doc_count < 1000 and score >= 5.0:
+        return "💎 종결", "ultra"
+    elif doc_count < 5000 and score >= 1.0:
+        return "🏆 황금", "golden"
+    elif doc_count < 20000 and score >= 0.3:
+        return "✅ 추천", "good"
+    return "평범", "normal"
+
+def legacy_comp(comp_idx):
+    if isinstance(comp_idx, (int, float)):
+        if comp_idx < 30: return "낮음"
+        elif comp_idx < 70: return "중간"
+        else: return "높음"
+    return str(comp_idx)
+
+def legacy_insight(doc_count, total_vol):
+    return "💎 블루오션" if doc_count < 1000 and total_vol > 10000 else \
+           "✨ 해볼만함" if doc_count < 5000 and total_vol > 5000 else "🔥 레드오션"
+
+def random_metrics(n, rng):
+    volumes = [rng.choice([0, rng.randint(10, 200000)]) for _ in range(n)]
+    docs = [rng.randint(0, 100000) for _ in range(n)]
+    comps = [rng.choice(["높음", "중간", "낮음", rng.randint(0, 100), rng.random() * 100]) for _ in range(n)]
+    return volumes, docs, comps
+
+def test_parity_with_row_logic():
+    rng = random.Random(7)
+    volumes, docs, comps = random_metrics(5000, rng)
+    result = score_keywords(volumes, docs, comps)
+    insights = shopping_insights(volumes, docs)
+    for i in range(len(volumes)):
+        score = volumes[i] / (docs[i] + 1)
+        assert abs(result['score'][i] - score) < 1e-9
+        assert (result['label'][i], result['tier'][i]) == legacy_tier(docs[i], score)
+        assert result['comp'][i] == legacy_comp(comps[i])
+        expected_rate = (docs[i] / volumes[i]) if volumes[i] > 0 else 999
+        assert abs(result['competition_rate'][i] - expected_rate) < 1e-9
+        assert insights[i] == legacy_insight(docs[i], volumes[i])
+
+def test_custom_thresholds():
+    scores = gold_scores([5000, 5000], [100, 4000])
+    labels, tiers = gold_tiers([100, 4000], scores, tiers=((5000, 1.0, "A", "a"),), default=("Z", "z"))
+    assert list(tiers) == ["a", "a"] and list(labels) == ["A", "A"]
+    assert list(comp_labels([10, 50, "높음"], bands=((20, "L"),), default="H")) == ["L", "H", "높음"]
+    assert list(competition_rates([0, 10], [5, 5], empty=0)) == [0, 0.5]
+
+def test_numpy_scalar_comp_idx():
+    comps = np.array([np.int64(10), "높음", np.float32(80.0), 50.5, None], dtype=object)
+    assert list(comp_labels(comps)) == ["낮음", "높음", "높음", "중간", "None"]
+    assert list(comp_labels(np.array(["중간"]))) == ["중간"]
+    assert list(comp_labels(["30", "기타", 5])) == ["중간", "기타", "낮음"]
+
+def best_ms(func, repeat=3):
+    # 부하에 따른 흔들림을 줄이려고 여러 번 재서 가장 빠른 값
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times)
+
+def legacy_rank(volumes, docs, comps):
+    rows = []
+    for i in range(len(volumes)):
+        score = volumes[i] / (docs[i] + 1)
+        rows.append((score, *legacy_tier(docs[i], score), legacy_comp(comps[i])))
+    rows.sort(key=lambda row: row[0], reverse=True)
+    return rows
+
+def test_rerank_100k_keywords():
+    import pandas as pd
+    rng = random.Random(11)
+    volumes, docs, comps = random_metrics(100000, rng)
+    frame = pd.DataFrame({'keyword': [f"k{i}" for i in range(100000)], 'volume': volumes, 'docs': docs, 'comp_idx': comps})
+    ranked = score_frame(frame)
+    assert len(ranked) == 100000
+    assert ranked['score'].is_monotonic_decreasing
+    assert set(ranked['tier']) <= {'ultra', 'golden', 'good', 'normal'}
+
+    columns = (frame['volume'].to_numpy(), frame['docs'].to_numpy(), frame['comp_idx'].to_numpy())
+    engine_ms = best_ms(lambda: score_keywords(*columns))
+    rerank_ms = best_ms(lambda: score_frame(frame))
+    legacy_ms = best_ms(lambda: legacy_rank(volumes, docs, comps))
+    print(f"100k: score {engine_ms:.0f}ms, re-rank {rerank_ms:.0f}ms, row-by-row {legacy_ms:.0f}ms")
+    # 절대 시간 대신 같은 조건의 행 단위 구현과 비교 (측정값은 3~5배 차이)
+    assert engine_ms < legacy_ms
+
+if __name__ == "__main__":
+    test_parity_with_row_logic()
+    test_custom_thresholds()
+    test_numpy_scalar_comp_idx()
+    test_rerank_100k_keywords()
@@ -0,0 +1,152 @@
+import os
+import sys
+import time
+import random
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'api'))
+
+from bs4 import BeautifulSoup
+from serp import extract_sections, KNOWN_SECTIONS, SECTION_NOISE
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'serp')
+FIXTURE_KEYWORDS = {'camping': '캠핑', 'iphone_case': '아이폰 케이스'}
+
+def legacy_extract_sections(soup, keyword, device='pc'):
+    """
+    단일 순회 추출기 이전의 3단계 스캔 구현 (비교 기준용 사본).
+    """
+    sections = []
+    seen_titles = set()
+
+    # 방법 1: 섹션 컨테이너에서 직접 추출 (section.sc_new, div.api_subject_bx 등)
+    section_containers = soup.select('section.sc_new, div.api_subject_bx, section[class*="sc_new"]')
+
+    for container in section_containers:
+        # 각 컨테이너 내에서 헤더 찾기
+        headers = container.select('.api_title, h2, .tit_main, .title_link, h3.title, .area_title')
+
+        for h in headers:
+            text = h.get_text(strip=True)
+            if not text or text in seen_titles or text == keyword:
+                continue
+
+            # 노이즈 필터링
+            if text in SECTION_NOISE or len(text) > 30:
+                continue
+
+            # 알려진 섹션이거나 짧은 텍스트면 추가
+            if text in KNOWN_SECTIONS or (len(text) < 20 and text not in SECTION_NOISE):
+                sections.append(text)
+                seen_titles.add(text)
+
+    # 방법 2: 모든 헤더 후보를 다시 검사 (더 포괄적)
+    all_headers = soup.select('.api_title, h2, .tit_main, .title_link, h3.title, .area_title')
+
+    for h in all_headers:
+        text = h.get_text(strip=True)
+        if not text or text in seen_titles:
+            continue
+
+        if text in SECTION_NOISE or len(text) > 30:
+            continue
+
+        # 부모 태그 확인하여 유효한 섹션인지 검증
+        curr = h
+        valid = False
+        for _ in range(5):
+            curr = curr.parent
+            if not curr:
+                break
+            classes = curr.get('class', [])
+            if (curr.name == 'section' and 'sc_new' in ' '.join(classes)) or \
+               (curr.get('class') and 'api_subject_bx' in classes):
+                valid = True
+                break
+
+        if valid:
+            if text in KNOWN_SECTIONS or (len(text) < 20 and text not in SECTION_NOISE):
+                if text not in seen_titles:
+                    sections.append(text)
+                    seen_titles.add(text)
+
+    # 방법 3: 알려진 섹션 이름이 HTML에 있으면 직접 검색 (뉴스 등 빠진 경우 대비)
+    for known_sec in KNOWN_SECTIONS:
+        if known_sec not in seen_titles:
+            # HTML에서 해당 텍스트를 포함하는 요소 찾기
+            elements = soup.find_all(string=lambda s: s and known_sec in s.strip())
+            for el in elements[:10]:  # 최대 10개만 확인
+                parent = el.parent
+                # 섹션 컨테이너 내부인지 확인
+                for _ in range(5):
+                    if not parent:
+                        break
+                    classes = parent.get('class', [])
+                    if (parent.name == 'section' and 'sc_new' in ' '.join(classes)) or \
+                       'api_subject_bx' in classes:
+                        sections.append(known_sec)
+                        seen_titles.add(known_sec)
+                        break
+                    parent = parent.parent
+                if known_sec in seen_titles:
+                    break
+
+    return sections
+
+def load_fixtures():
+    for name in sorted(os.listdir(FIXTURE_DIR)):
+        stem, device = name.rsplit('.', 1)[0].rsplit('_', 1)
+        with open(os.path.join(FIXTURE_DIR, name), encoding='utf-8') as f:
+            yield name, FIXTURE_KEYWORDS[stem], device, f.read()
+
+def test_parity_on_fixtures():
+    for name, keyword, device, html in load_fixtures():
+        soup = BeautifulSoup(html, 'html.parser')
+        expected = legacy_extract_sections(soup, keyword, device)
+        actual = extract_sections(soup, keyword, device)
+        print(f"{name}: {actual}")
+        assert actual == expected, f"{name}: {actual} != {expected}"
+
+def random_tree(rng, depth=0):
+    tags = ['div', 'section', 'ul', 'li', 'span', 'h2', 'h3', 'a', 'strong']
+    classes = ['sc_new', 'sc_new_x', 'api_subject_bx', 'api_title', 'tit_main', 'title_link',
+               'title', 'area_title', 'bx', '']
+    texts = KNOWN_SECTIONS + SECTION_NOISE + ['검색어', '짧은 제목', '스무 글자가 넘는 아주 긴 섹션 제목 텍스트입니다', '블로그 · 뉴스']
+    parts = []
+    for _ in range(rng.randint(1, 4)):
+        if depth > 8 or rng.random() < 0.3:
+            parts.append(rng.choice(texts))
+            continue
+        tag = rng.choice(tags)
+        cls = ' '.join(rng.sample(classes, rng.randint(0, 2)))
+        parts.append(f'<{tag} class="{cls}">{random_tree(rng, depth + 1)}</{tag}>')
+    return ''.join(parts)
+
+def test_parity_on_random_trees():
+    rng = random.Random(2024)
+    for i in range(300):
+        soup = BeautifulSoup(random_tree(rng), 'html.parser')
+        expected = legacy_extract_sections(soup, '검색어')
+        actual = extract_sections(soup, '검색어')
+        assert actual == expected, f"tree {i}: {actual} != {expected}\n{soup}"
+    print("300 random trees match the legacy extractor")
+
+def test_faster_on_large_serp():
+    html = next(load_fixtures())[3]
+    # 큰 SERP를 흉내내기 위해 본문을 여러 번 반복
+    body = html.split('<body>', 1)[1]
+    soup = BeautifulSoup(html.replace('</body>', body * 8), 'html.parser')
+
+    def timed(func):
+        start = time.perf_counter()
+        for _ in range(3):
+            func(soup, '캠핑', 'pc')
+        return (time.perf_counter() - start) / 3
+
+    legacy, single = timed(legacy_extract_sections), timed(extract_sections)
+    print(f"legacy {legacy * 1000:.1f}ms, single pass {single * 1000:.1f}ms ({legacy / single:.1f}x)")
+    assert single < legacy
+
+if __name__ == "__main__":
+    test_parity_on_fixtures()
+    test_parity_on_random_trees()
+    test_faster_on_large_serp()
@@ -0,0 +1,138 @@
+import os
+import sys
+import threading
+import http.server
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'api'))
+
+import serp
+from serp import extract_serp, fetch_serp, SerpStream
+from html_parser import available_parsers
+from naver_service import get_naver_section_order, get_blog_rank
+
+SAMPLE_HTML = """
+<html><body>
+<section class="sc_new sp_nreview"><div class="api_subject_bx">
+  <h2 class="api_title">블로그</h2>
+  <div class="view_wrap"><ul>
+    <li class="bx">블로그 글 1</li><li class="bx">카페 글</li><li class="bx">블로그 글 2</li>
+  </ul></div>
+</div></section>
+<section class="sc_new sp_nnews"><h2 class="api_title">뉴스</h2></section>
+<div class="related_srch"><a class="tit">캠핑 의자 추천</a><a class="tit">캠핑장</a></div>
+<script>var data = {"subjectTitle":"캠핑 용품 인기 브랜드"};</script>
+</body></html>
+"""
+
+# 메인 컬럼 뒤로 큰 사이드바/스크립트가 이어지는 페이지
+LONG_TAIL = '<div id="footer"></div>' + '<script>var pad = "' + 'x' * 1024 + '";</script>' * 2000
+
+class SerpHandler(http.server.BaseHTTPRequestHandler):
+    hits = 0
+
+    def do_GET(self):
+        SerpHandler.hits += 1
+        if '/long' in self.path:
+            body = SAMPLE_HTML.replace('</body>', LONG_TAIL + '</body>')
+        elif '/footer' in self.path:
+            body = SAMPLE_HTML.replace('</body>', '<div id="footer"></div></body>')
+        else:
+            body = SAMPLE_HTML
+        body = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def test_extract_serp():
+    extracted = extract_serp(SAMPLE_HTML, "캠핑", "pc")
+    print(f"Extracted: {extracted}")
+    assert extracted['sections'][:2] == ['블로그', '뉴스']
+    assert extracted['blog_ranks'] == ['B', 'C', 'B']
+    assert {'캠핑 의자 추천', '캠핑장', '캠핑 용품 인기 브랜드'} <= set(extracted['related'])
+
+def test_parsers_agree():
+    # 설치된 모든 백엔드가 같은 추출 결과를 내야 함
+    fixture_dir = os.path.join(os.path.dirname(__file__), 'fixtures', 'serp')
+    for name in sorted(os.listdir(fixture_dir)):
+        with open(os.path.join(fixture_dir, name), encoding='utf-8') as f:
+            html = f.read()
+        results = [extract_serp(html, "캠핑", "pc", parser) for parser in available_parsers()]
+        assert all(r == results[0] for r in results), name
+    print(f"Parsers agree: {available_parsers()}")
+
+def test_stream_finds_markers_across_chunks():
+    stream = SerpStream()
+    data = SAMPLE_HTML.encode('utf-8') + b'<div id="footer"></div>'
+    # 한글(3바이트)과 JSON이 청크 경계에 걸리도록 7바이트씩 공급
+    for i in range(0, len(data), 7):
+        if stream.feed(data[i:i + 7]):
+            break
+    assert stream.subject_titles == ['캠핑 용품 인기 브랜드']
+    assert stream.related_block_seen and stream.main_column_done
+    assert data.decode('utf-8').startswith(stream.html) and stream.bytes_read <= len(data)
+    print("Stream markers across chunk boundaries OK")
+
+def test_stream_waits_for_related_after_footer():
+    # 연관검색어 블록이 메인 컬럼 끝 표지 뒤에 있으면 그 블록까지 읽어야 함
+    stream = SerpStream()
+    assert not stream.feed('<div id="footer"></div>'.encode('utf-8'))
+    assert stream.main_column_done and not stream.related_block_seen
+    assert stream.feed('<div class="related_srch"><a class="tit">캠핑장</a></div>'.encode('utf-8'))
+    print("Stream keeps reading until the related block")
+
+def test_stream_stops_without_related_block():
+    # 연관검색어 블록이 없는 페이지는 메인 컬럼 끝 뒤 고정된 창만큼만 더 읽음
+    stream = SerpStream()
+    assert not stream.feed('<section class="sc_new"></section><div id="footer"></div>'.encode('utf-8'))
+    pad = b'x' * serp.STREAM_CHUNK_SIZE
+    chunks = 0
+    while not stream.feed(pad):
+        chunks += 1
+    assert not stream.related_block_seen
+    assert stream.bytes_read - stream.main_column_end_at >= serp.RELATED_AFTER_MAIN_BYTES
+    assert stream.bytes_read < serp.STREAM_BYTE_BUDGET
+    print(f"Stopped {chunks + 1} chunks after the main column")
+
+def test_one_fetch_serves_sections_and_ranks():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), SerpHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    original = dict(serp.SERP_DEVICES)
+    serp.SERP_DEVICES['pc'] = (base + "/pc?query={keyword}", "pc-agent")
+    serp.SERP_DEVICES['mobile'] = (base + "/m?query={keyword}", "mobile-agent")
+    try:
+        SerpHandler.hits = 0
+        sections = get_naver_section_order("공유테스트")
+        ranks = get_blog_rank("공유테스트")
+        again = fetch_serp("공유테스트", "mobile")
+        print(f"sections={sections}, ranks={ranks}, page downloads={SerpHandler.hits}")
+        assert SerpHandler.hits == 2
+        assert ranks == ['B', 'C', 'B'] and again.ok
+        assert not again.truncated
+
+        # 표지는 찾았지만 본문을 이미 다 받았으면 잘린 것이 아님
+        serp.SERP_DEVICES['pc'] = (base + "/footer?query={keyword}", "pc-agent")
+        assert not fetch_serp("짧은페이지", "pc").truncated
+
+        # 메인 컬럼 끝 표지 이후 ~4MB는 받지 않음
+        serp.SERP_DEVICES['pc'] = (base + "/long?query={keyword}", "pc-agent")
+        long_doc = fetch_serp("긴페이지", "pc")
+        print(f"streamed {long_doc.bytes_read} bytes, truncated={long_doc.truncated}")
+        assert long_doc.truncated and long_doc.bytes_read < 512 * 1024
+        assert long_doc.blog_ranks == ['B', 'C', 'B'] and '캠핑 용품 인기 브랜드' in long_doc.related
+    finally:
+        serp.SERP_DEVICES.update(original)
+        server.shutdown()
+
+if __name__ == "__main__":
+    test_extract_serp()
+    test_parsers_agree()
+    test_stream_finds_markers_across_chunks()
+    test_stream_waits_for_related_after_footer()
+    test_stream_stops_without_related_block()
+    test_one_fetch_serves_sections_and_ranks()
@@ -0,0 +1,177 @@
+import os
+import sys
+import time
+import asyncio
+import threading
+import http.server
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'api'))
+
+import async_service
+import naver_service
+from credentials import Credential, CredentialPool
+from http_client import http_get, open_async_client, async_http_get
+from single_flight import SingleFlight, AsyncSingleFlight, request_key
+from fakes import patch, isolated
+
+class SlowHandler(http.server.BaseHTTPRequestHandler):
+    hits = 0
+
+    def do_GET(self):
+        SlowHandler.hits += 1
+        time.sleep(0.3)
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    def log_message(self, *args):
+        pass
+
+def start_server():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+def test_request_key_normalization():
+    a = request_key("get", "https://api.naver.com/keywordstool?showDetail=1", {"hintKeywords": "캠핑"}, "k")
+    b = request_key("GET", "https://API.naver.com/keywordstool", {"hintKeywords": "캠핑", "showDetail": "1"}, "k")
+    assert a == b
+    assert a != request_key("GET", "https://api.naver.com/keywordstool", {"hintKeywords": "캠핑", "showDetail": "1"}, "other")
+    print("Request key normalization OK")
+
+def test_concurrent_identical_calls():
+    base = start_server()
+    SlowHandler.hits = 0
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        results = list(executor.map(lambda _: http_get(base + "/v1/search/blog", params={"query": "캠핑"}).status_code, range(10)))
+    print(f"10 threads -> {SlowHandler.hits} upstream call(s), statuses={set(results)}")
+    assert SlowHandler.hits == 1 and results == [200] * 10
+
+    SlowHandler.hits = 0
+
+    async def run():
+        client = open_async_client()
+        try:
+            return await asyncio.gather(*(async_http_get(client, base + "/x", params={"q": "a"}) for _ in range(10)))
+        finally:
+            if client is not None:
+                await client.aclose()
+
+    asyncio.run(run())
+    print(f"10 coroutines -> {SlowHandler.hits} upstream call(s)")
+    assert SlowHandler.hits == 1
+
+def test_different_credentials_not_merged():
+    base = start_server()
+    SlowHandler.hits = 0
+    keys = ["key-a", "key-b", "key-a", "key-b"]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda key: http_get(base + "/keywordstool", params={"hintKeywords": "캠핑"},
+                                               headers={"X-API-KEY": key}), keys))
+    print(f"2 keys x 2 calls -> {SlowHandler.hits} upstream call(s)")
+    assert SlowHandler.hits == 2
+
+@isolated()
+def test_pooled_calls_coalesce_across_keys():
+    # 키 풀은 호출마다 다른 키를 고르지만, 병합은 키를 고르기 전에 일어남
+    base = start_server()
+    pool = CredentialPool("test", [Credential("key-a", "s", "1"), Credential("key-b", "s", "2")])
+    patch(naver_service, 'AD_API_BASE_URL', base)
+    patch(naver_service, 'get_ad_api_pool', lambda: pool)
+    patch(async_service, 'AD_API_BASE_URL', base)
+    patch(async_service, 'get_ad_api_pool', lambda: pool)
+
+    SlowHandler.hits = 0
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        responses = list(executor.map(lambda _: naver_service.call_keywordstool("캠핑"), range(4)))
+    print(f"4 pooled calls -> {SlowHandler.hits} upstream call(s)")
+    assert SlowHandler.hits == 1 and [r.status_code for r in responses] == [200] * 4
+    # 기다린 호출은 키를 잡지 않으므로 사용량은 한 번만 올라감
+    assert sum(c.used_today for c in pool.credentials) == 1
+    assert all(c.in_flight == 0 for c in pool.credentials)
+
+    SlowHandler.hits = 0
+
+    async def run():
+        client = open_async_client()
+        try:
+            return await asyncio.gather(*(async_service._async_keywordstool("캠핑", client) for _ in range(4)))
+        finally:
+            if client is not None:
+                await client.aclose()
+
+    asyncio.run(run())
+    assert SlowHandler.hits == 1
+
+def test_waiters_get_own_response():
+    base = start_server()
+    SlowHandler.hits = 0
+
+    def fetch(i):
+        res = http_get(base + "/v1/search/blog", params={"query": "쇼핑"})
+        if i == 0:
+            res.encoding = 'euc-kr'
+        return res
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        responses = list(executor.map(fetch, range(5)))
+    assert SlowHandler.hits == 1
+    assert len({id(res) for res in responses}) == 5
+    assert all(res.encoding != 'euc-kr' for res in responses[1:])
+    assert all(res.content == b'{}' for res in responses)
+    print("Each waiter got its own response copy")
+
+def test_errors_are_shared():
+    flight = SingleFlight()
+    calls = []
+
+    def boom():
+        calls.append(1)
+        time.sleep(0.1)
+        raise ValueError("upstream failed")
+
+    def run(_):
+        try:
+            flight.do("k", boom)
+        except ValueError as e:
+            return str(e)
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        errors = list(executor.map(run, range(5)))
+    assert len(calls) == 1 and errors == ["upstream failed"] * 5
+    print("Errors shared with waiters OK")
+
+def test_async_leader_cancel_hands_off():
+    flight = AsyncSingleFlight()
+    started = []
+
+    async def fetch():
+        started.append(1)
+        await asyncio.sleep(0.05)
+        return len(started)
+
+    async def run():
+        leader = asyncio.ensure_future(flight.do("k", fetch))
+        await asyncio.sleep(0)
+        followers = [asyncio.ensure_future(flight.do("k", fetch)) for _ in range(3)]
+        await asyncio.sleep(0)
+        # 실행하던 쪽만 취소: 기다리던 쪽은 취소되지 않고 한 번 더 실행한 결과를 공유
+        leader.cancel()
+        results = await asyncio.gather(*followers)
+        return leader.cancelled(), results
+
+    leader_cancelled, results = asyncio.run(run())
+    assert leader_cancelled and results == [2, 2, 2]
+    assert len(started) == 2 and flight.stats()['in_flight'] == 0
+    print("Followers survived leader cancellation")
+
+if __name__ == "__main__":
+    test_request_key_normalization()
+    test_concurrent_identical_calls()
+    test_different_credentials_not_merged()
+    test_pooled_calls_coalesce_across_keys()
+    test_waiters_get_own_response()
+    test_errors_are_shared()
+    test_async_leader_cancel_hands_off()
@@ -0,0 +1,119 @@
+import os
+import sys
+import json
+import time
+import threading
+import http.server
+from urllib.parse import urlsplit, parse_qs
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'api'))
+
+import naver_service
+from keyword_cache import volume_cache, normalize_keyword
+from credentials import reset_pools
+from naver_service import parse_volume_rows, get_search_volumes_for_keywords
+from volume_planner import VolumePlan, order_hints, MAX_KEYWORD_RETRIES
+
+# 가짜 keywordstool: 힌트 키워드로 시작하는 카탈로그 항목을 모두 관련 키워드로 돌려줌
+CATALOG = ['계획캠핑', '계획캠핑의자', '계획캠핑테이블', '계획캠핑 랜턴', '계획낚시', '계획낚시대',
+           '계획등산', '계획등산화', '계획등산 스틱', '계획요리']
+
+def fake_keywordstool(hint_str):
+    hints = hint_str.split(',')
+    return [{'relKeyword': k, 'monthlyPcQcCnt': 10, 'monthlyMobileQcCnt': 90, 'compIdx': '낮음'}
+            for k in CATALOG if any(k.replace(" ", "").startswith(h) for h in hints)]
+
+def cleanup(keywords):
+    for k in keywords:
+        volume_cache.delete(normalize_keyword(k))
+
+def test_order_hints():
+    ordered = order_hints(['캠핑의자', '낚시', '캠핑', '캠핑테이블'])
+    assert ordered[:2] == ['낚시', '캠핑'] and set(ordered[2:]) == {'캠핑의자', '캠핑테이블'}
+    print(f"Order: {ordered}")
+
+def test_plan_skips_covered_keywords():
+    keywords = CATALOG + ['계획없는키워드']
+    cleanup(keywords)
+    plan = VolumePlan(keywords)
+    while plan.pending:
+        for hint_str, keys in plan.next_wave():
+            plan.record(keys, parse_volume_rows(fake_keywordstool(hint_str)))
+
+    print(f"Plan: {plan.summary()}")
+    assert plan.stats['calls'] == 1 and plan.stats['naive_calls'] == 3
+    assert plan.result['계획캠핑랜턴']['total'] == 100
+    assert plan.stats['newly_absent'] == 1
+
+    # 두 번째 계획: 방금 기록된 없음(absent) 키워드는 다시 묻지 않음
+    again = VolumePlan(['계획없는키워드'])
+    assert not again.pending and again.stats['known_absent'] == 1
+    cleanup(keywords)
+
+def test_failed_keywords_are_retried():
+    keywords = ['계획낚시', '계획등산', '계획요리']
+    cleanup(keywords)
+    plan = VolumePlan(keywords, chunk_size=1)
+    calls = []
+    while plan.pending:
+        for hint_str, keys in plan.next_wave(3):
+            calls.append(hint_str)
+            # 낚시는 한 번 실패 후 성공, 요리는 계속 실패
+            if hint_str == '계획요리' or (hint_str == '계획낚시' and calls.count(hint_str) == 1):
+                plan.record_failure(keys)
+            else:
+                plan.record(keys, parse_volume_rows(fake_keywordstool(hint_str)))
+
+    print(f"Plan: {plan.summary()}")
+    assert plan.result['계획낚시']['total'] == 100 and plan.result['계획등산']['total'] == 100
+    assert calls.count('계획낚시') == 2 and calls.count('계획요리') == MAX_KEYWORD_RETRIES + 1
+    assert plan.failed == ['계획요리'] and '계획요리' not in plan.result
+    assert plan.stats['failed_calls'] == MAX_KEYWORD_RETRIES + 2
+    # 실패한 키워드는 없음(absent)으로 기록하지 않으므로 다음 계획에서 다시 물음
+    assert VolumePlan(['계획요리']).pending
+    cleanup(keywords)
+
+class SlowKeywordstool(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        hint = parse_qs(urlsplit(self.path).query)['hintKeywords'][0]
+        time.sleep(0.3)
+        rows = [{'relKeyword': h, 'monthlyPcQcCnt': 1, 'monthlyMobileQcCnt': 2, 'compIdx': '낮음'} for h in hint.split(',')]
+        body = json.dumps({'keywordList': rows}).encode()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def test_chunks_run_concurrently():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), SlowKeywordstool)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    original_base = naver_service.AD_API_BASE_URL
+    naver_service.AD_API_BASE_URL = f"http://127.0.0.1:{server.server_port}"
+    os.environ.update({"NAVER_AD_ACCESS_LICENSE": "lic", "NAVER_AD_SECRET_KEY": "sec", "NAVER_AD_CUSTOMER_ID": "1"})
+    reset_pools()
+    # 서로 포함 관계가 없는 15개 → 3개 청크
+    keywords = [f"병렬{chr(0xAC00 + i * 97)}" for i in range(15)]
+    cleanup(keywords)
+    try:
+        start = time.monotonic()
+        result = get_search_volumes_for_keywords(keywords)
+        elapsed = time.monotonic() - start
+        print(f"15 keywords / 3 chunks in {elapsed:.2f}s")
+        assert len(result) == 15 and all(v['total'] == 3 for v in result.values())
+        assert elapsed < 0.8
+    finally:
+        naver_service.AD_API_BASE_URL = original_base
+        for k in ("NAVER_AD_ACCESS_LICENSE", "NAVER_AD_SECRET_KEY", "NAVER_AD_CUSTOMER_ID"):
+            os.environ.pop(k, None)
+        reset_pools()
+        cleanup(keywords)
+        server.shutdown()
+
+if __name__ == "__main__":
+    test_order_hints()
+    test_plan_skips_covered_keywords()
+    test_failed_keywords_are_retried()
+    test_chunks_run_concurrently()